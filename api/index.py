@@ -1,18 +1,48 @@
+import time
+
+# Soğuk başlangıç süresi modül yüklenmeye başladığı andan itibaren ölçülür
+_BASLANGIC = time.perf_counter()
+
+import os
+import resource
+import sys
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-import requests
-import json
-import re
 from typing import List, Dict, Any, Optional
-import os
-import uvicorn
+
+# Ortak modüller repo kök dizininde
+KOK_DIZIN = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, KOK_DIZIN)
+
+# torch/sentence_transformers yerine yalnızca NumPy kullanan sözcüksel indeks
+from kanun_lexical_index import KanunLexicalIndex
 
 app = FastAPI(title="Kanun Sorgulama API", version="1.0.0")
 
-# Basit test için
+# kanun_lexical_index.py ile repodaki kanun .txt dosyalarından üretilip repoya eklenen indeks dosyası
+INDEX_PATH = os.getenv("KANUN_LEXICAL_INDEX", os.path.join(KOK_DIZIN, "kanun_lexical.idx"))
+
+kanun_index = None
+index_hatasi = None
+try:
+    kanun_index = KanunLexicalIndex(INDEX_PATH)
+except (OSError, ValueError) as e:
+    index_hatasi = str(e)
+    print(f"Sözcüksel indeks yüklenemedi: {e}")
+
+soguk_baslangic_ms = round((time.perf_counter() - _BASLANGIC) * 1000, 1)
+print(f"Soğuk başlangıç: {soguk_baslangic_ms} ms")
+
+
+def bellek_mb() -> float:
+    """Sürecin en yüksek bellek kullanımı (Linux'ta ru_maxrss KB cinsindendir)"""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
 class QuestionRequest(BaseModel):
     question: str
     max_results: Optional[int] = 5
+    kanun_no: Optional[List[str]] = None
 
 class QuestionResponse(BaseModel):
     question: str
@@ -24,9 +54,9 @@ class QuestionResponse(BaseModel):
 async def root():
     """Ana sayfa"""
     return {
-        "message": "Kanun Sorgulama API - Railway",
+        "message": "Kanun Sorgulama API - Serverless",
         "version": "1.0.0",
-        "status": "ready",
+        "status": "ready" if kanun_index else "index_missing",
         "endpoints": {
             "ask": "/ask",
             "health": "/health"
@@ -35,39 +65,43 @@ async def root():
 
 @app.post("/ask")
 async def ask_question(request: QuestionRequest):
-    """Kanun sorusu sorar - Basit test versiyonu"""
+    """Kanun sorusu sorar (önceden üretilmiş sözcüksel indeks üzerinde BM25)"""
+    if kanun_index is None:
+        raise HTTPException(status_code=503, detail=f"Sözcüksel indeks yüklenemedi: {index_hatasi}")
     try:
-        # Basit test cevabı
-        test_answers = [
-            {
-                "kanun_no": "test_001",
-                "baslik": "Test Kanunu",
-                "madde_no": 1,
-                "yayim_tarihi": "2024-01-01",
-                "gist_url": "https://example.com",
-                "text": f"Test cevabı: {request.question}",
-                "similarity_score": 0.95
-            }
-        ]
-        
+        results = kanun_index.search(request.question, max(1, min(request.max_results or 5, 50)),
+                                     kanun_no=request.kanun_no)
         return QuestionResponse(
             question=request.question,
-            answers=test_answers,
-            total_found=len(test_answers),
+            answers=results,
+            total_found=len(results),
             status="success"
         )
-        
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Soru işlenirken hata: {str(e)}")
 
 @app.get("/health")
 async def health_check():
     """Sistem durumu kontrolü"""
-    return {
-        "status": "healthy",
-        "message": "API çalışıyor"
+    durum = {
+        "status": "healthy" if kanun_index else "degraded",
+        "soguk_baslangic_ms": soguk_baslangic_ms,
+        "bellek_mb": bellek_mb()
     }
+    if kanun_index:
+        durum.update({
+            "kanun_sayisi": kanun_index.kanun_sayisi,
+            "madde_sayisi": kanun_index.doc_sayisi,
+            "terim_sayisi": kanun_index.terim_sayisi,
+            "index_boyutu_mb": round(kanun_index.dosya_boyutu / 1024 / 1024, 1),
+            "index_olusturulma": kanun_index.olusturulma
+        })
+    else:
+        durum["hata"] = index_hatasi
+    return durum
 
 if __name__ == "__main__":
+    import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=port)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+int8 Vektör Benchmark Scripti
+int8 kodlarla ilk aşama skorlama ve en iyi R adayın float32 vektörlerle yeniden skorlanmasını
+tam hassasiyetli (float32) aramayla karşılaştırır; her R için recall@k, gecikme ve vektör
+belleğindeki azalmayı raporlar.
+"""
+
+import argparse
+import json
+import time
+from typing import List, Dict, Any
+import numpy as np
+from benchmark_two_stage import MODEL_NAME, VARSAYILAN_SORULAR, load_index, _percentile
+from kanun_index import KanunIndex
+
+
+def run_benchmark(index: KanunIndex, questions: List[str], r_values: List[int], k: int = 10,
+                  tekrar: int = 5) -> Dict[str, Any]:
+    """float32 arama ile her R değeri için int8 + yeniden skorlama aramasını karşılaştırır"""
+    question_embeddings = [index.encode_question(question) for question in questions]
+
+    def measure():
+        latencies = []
+        ranked = []
+        for question_embedding in question_embeddings:
+            for _ in range(tekrar):
+                start = time.perf_counter()
+                vektorler, _, _ = index.rank(question_embedding, k)
+                latencies.append((time.perf_counter() - start) * 1000)
+            ranked.append(set(int(vektor_id) for vektor_id in vektorler))
+        return ranked, latencies
+
+    index.nicemle(False)
+    exact, exact_latencies = measure()
+    exact_mean = float(np.mean(exact_latencies))
+    float_bellek = index.vektor_bellegi()
+
+    index.nicemle(True)
+    int8_bellek = index.vektor_bellegi()
+
+    report = {
+        'kanun_sayisi': index.kanun_sayisi,
+        'madde_sayisi': index.madde_sayisi,
+        'vektor_sayisi': index.vektor_sayisi,
+        'soru_sayisi': len(questions),
+        'k': k,
+        'float32': {
+            'mean_ms': exact_mean,
+            'p50_ms': _percentile(exact_latencies, 50),
+            'p95_ms': _percentile(exact_latencies, 95),
+            'bellek_mb': float_bellek / 1024 / 1024
+        },
+        'int8': {
+            'bellek_mb': int8_bellek / 1024 / 1024,
+            'bellek_azalmasi': float_bellek / int8_bellek if int8_bellek else 0.0
+        },
+        'yeniden_skorlama': []
+    }
+
+    for r in r_values:
+        index.yeniden_skorlama_sayisi = r
+        ranked, latencies = measure()
+        recalls = [
+            len(found & expected) / len(expected)
+            for found, expected in zip(ranked, exact)
+            if expected
+        ]
+        mean_ms = float(np.mean(latencies))
+        report['yeniden_skorlama'].append({
+            'R': r,
+            f'recall@{k}': float(np.mean(recalls)) if recalls else 1.0,
+            'mean_ms': mean_ms,
+            'p50_ms': _percentile(latencies, 50),
+            'p95_ms': _percentile(latencies, 95),
+            'speedup': exact_mean / mean_ms if mean_ms else 0.0
+        })
+
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    """Sonuçları tablo halinde yazdırır"""
+    k = report['k']
+    print(f"\n{report['kanun_sayisi']} kanun, {report['vektor_sayisi']} vektör, {report['soru_sayisi']} soru")
+    print(f"float32: {report['float32']['bellek_mb']:.1f} MB, ortalama {report['float32']['mean_ms']:.3f} ms, "
+          f"p95 {report['float32']['p95_ms']:.3f} ms")
+    print(f"int8: {report['int8']['bellek_mb']:.1f} MB ({report['int8']['bellek_azalmasi']:.1f}x daha az bellek)")
+    print(f"{'R':>6} {'recall@' + str(k):>10} {'ort. ms':>10} {'p95 ms':>10} {'hızlanma':>10}")
+    for row in report['yeniden_skorlama']:
+        print(f"{row['R']:>6} {row[f'recall@{k}']:>10.3f} {row['mean_ms']:>10.3f} {row['p95_ms']:>10.3f} {row['speedup']:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="int8 vektör ve yeniden skorlama benchmark'ı")
+    parser.add_argument("--folder", default=".", help="Kanun .txt dosyalarının bulunduğu klasör")
+    parser.add_argument("--limit", type=int, default=None, help="Yüklenecek en fazla kanun sayısı")
+    parser.add_argument("--k", type=int, default=10, help="recall@k için k")
+    parser.add_argument("--r", default="0,50,100,200,400", help="Virgülle ayrılmış yeniden skorlama aday sayıları")
+    parser.add_argument("--sorular", default=None, help="Her satırda bir soru bulunan dosya")
+    parser.add_argument("--tekrar", type=int, default=5, help="Her soru için ölçüm tekrarı")
+    parser.add_argument("--json", default=None, help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    questions = VARSAYILAN_SORULAR
+    if args.sorular:
+        with open(args.sorular, 'r', encoding='utf-8') as f:
+            questions = [line.strip() for line in f if line.strip()]
+
+    from sentence_transformers import SentenceTransformer
+
+    print("Kanunlar yükleniyor...")
+    index = load_index(args.folder, args.limit)
+
+    print("Embedding modeli yükleniyor...")
+    model = SentenceTransformer(MODEL_NAME)
+    index.build(model)
+
+    r_values = [int(r) for r in args.r.split(',') if r.strip()]
+    report = run_benchmark(index, questions, r_values, args.k, args.tekrar)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar {args.json} dosyasına kaydedildi.")
+
+
+if __name__ == "__main__":
+    main()
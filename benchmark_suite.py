@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Çevrimdışı Performans Benchmark Scripti
+Repodaki .txt kanun dosyaları ve kanun_chunks_gist.json örneği üzerinde parse, chunk üretimi,
+embedding, indeks kurulumu ve sorgu gecikmesini ölçer. Sonuçlar JSON olarak yazılır ve kayıtlı
+bir baseline ile karşılaştırılarak belirlenen eşiği aşan gerilemeler raporlanır.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from kanun_processor import KanunProcessor
+from kanun_index import KanunIndex
+from benchmark_two_stage import VARSAYILAN_SORULAR, MODEL_NAME
+
+STAGES = ('parse', 'chunks', 'embed', 'index', 'query')
+
+
+def current_rss_mb() -> float:
+    """Sürecin anlık RSS değerini MB olarak döndürür"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except (OSError, ValueError):
+        # /proc olmayan sistemlerde süreç boyunca görülen en yüksek değer
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / 1e6 if sys.platform == 'darwin' else maxrss / 1e3
+
+
+class RssOrnekleyici:
+    """Bir aşama boyunca RSS'i örnekleyerek en yüksek değeri bulur"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak_mb = current_rss_mb()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+
+def latency_stats(latencies_ms: List[float]) -> Dict[str, float]:
+    """Gecikme listesinden p50/p95/p99 değerlerini hesaplar"""
+    return {
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'mean_ms': float(np.mean(latencies_ms))
+    }
+
+
+def bench_parse(folder: str, limit: Optional[int]) -> Tuple[Dict[str, Any], KanunProcessor]:
+    """Kanun dosyalarının parse hızını ölçer"""
+    processor = KanunProcessor(folder)
+    txt_files = sorted(Path(folder).glob("*.txt"))
+    if limit:
+        txt_files = txt_files[:limit]
+
+    # Dosyaları önceden oku ki ölçüm disk yerine parse'ı yansıtsın
+    contents = [(file_path, file_path.read_text(encoding='utf-8')) for file_path in txt_files]
+    total_bytes = sum(len(content.encode('utf-8')) for _, content in contents)
+
+    start = time.perf_counter()
+    for file_path, content in contents:
+        kanun = processor.parse_kanun_content(content, file_path.stem)
+        processor.processed_kanunlar.append(kanun)
+    elapsed = time.perf_counter() - start
+
+    madde_sayisi = sum(len(kanun['maddeler']) + len(kanun['gecici_maddeler']) for kanun in processor.processed_kanunlar)
+    return {
+        'dosya_sayisi': len(contents),
+        'bytes': total_bytes,
+        'madde_sayisi': madde_sayisi,
+        'sure_s': elapsed,
+        'mb_per_s': total_bytes / 1e6 / elapsed,
+        'maddeler_per_s': madde_sayisi / elapsed
+    }, processor
+
+
+def bench_chunks(processor: KanunProcessor, sample_file: str) -> Dict[str, Any]:
+    """Arama chunk'larının üretim hızını ve örnek chunk dosyasının okunma süresini ölçer"""
+    start = time.perf_counter()
+    chunks = processor.create_searchable_chunks()
+    elapsed = time.perf_counter() - start
+
+    result = {
+        'chunk_sayisi': len(chunks),
+        'sure_s': elapsed,
+        'chunks_per_s': len(chunks) / elapsed if elapsed else 0.0
+    }
+
+    if os.path.exists(sample_file):
+        start = time.perf_counter()
+        with open(sample_file, 'r', encoding='utf-8') as f:
+            sample = json.load(f)
+        result['ornek_chunk_sayisi'] = len(sample)
+        result['ornek_yukleme_ms'] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def bench_embed(model, sample_file: str, batch_size: int) -> Dict[str, Any]:
+    """kanun_chunks_gist.json örneğindeki metinler üzerinde embedding hızını ölçer"""
+    with open(sample_file, 'r', encoding='utf-8') as f:
+        texts = [chunk['text'] for chunk in json.load(f)]
+
+    # İlk çağrının tembel başlatma maliyetini ölçüme katma
+    model.encode(texts[:batch_size])
+
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        model.encode(texts[i:i + batch_size])
+    elapsed = time.perf_counter() - start
+
+    return {
+        'metin_sayisi': len(texts),
+        'batch_size': batch_size,
+        'sure_s': elapsed,
+        'texts_per_s': len(texts) / elapsed
+    }
+
+
+def index_size_bytes(index: KanunIndex) -> Dict[str, int]:
+    """İndeksin bellekteki ve diskteki boyutlarını hesaplar
+
+    Vektörler etkin moda göre sayılır: int8 modunda bellekteki kodlar ve ölçekler, diskteki float32
+    vektörler ayrıca vektor_diski_bytes olarak raporlanır.
+    """
+    arrays = [index.kanun_centroids, index.baslik_embeddings,
+              index._satir_vektor_ids, index._vektor_satirlari, index._vektor_satir_ptr,
+              index._satir_kanun_ids, index._kanun_tarihleri,
+              index._atif_ptr, index._atif_hedef_kanun_ids, index._atif_hedef_kanun_nolari,
+              index._atif_hedef_turleri, index._atif_hedef_maddeler, index._atif_hedef_satirlar,
+              index._atif_ters_ptr, index._atif_ters_kaynaklar, index._kanun_atif_ptr, index._kanun_atif_kaynaklar,
+              index._degisiklik_ptr, index._degisiklik_satirlari, index._degisiklik_tarihleri,
+              index._degisiklik_turleri, index._degisiklik_kapsamlari, index._degisiklik_rg_sayilari,
+              index._degisiklik_kanun_nolari, index._degisiklik_kanun_maddeleri,
+              index._degisiklik_tarih_sirasi, index._sirali_degisiklik_tarihleri,
+              index._mulga_mask, index._mulga_satirlari]
+    vektor_bytes = index.vektor_bellegi() + sum(a.nbytes for a in arrays if a is not None)
+    nicem = index._nicem_kodlari is not None
+    sutun_bytes = sum(
+        column.itemsize * len(column)
+        for column in (index.madde_kanun_ids, index.madde_nolari, index.madde_turleri,
+                       index.metin_baslangic, index.metin_bitis, index.madde_vektor_ids,
+                       index.madde_bolum_ids, index.madde_baslik_ids, index.bolum_kanun_ids,
+                       index.bolum_ust_ids, index.bolum_ad_ids, index.bolum_baslik_ids,
+                       index.bolum_satir_baslangic, index.bolum_satir_bitis)
+    )
+    return {
+        'vektor_bytes': vektor_bytes,
+        'sutun_bytes': sutun_bytes,
+        'snippet_bytes': index.kelime_ofsetleri.nbytes,
+        'metin_deposu_bytes': index.text_store.compressed_bytes,
+        'vektor_diski_bytes': index.embeddings.nbytes if nicem else 0
+    }
+
+
+def bench_index(processor: KanunProcessor, model, limit: Optional[int],
+                nicem_vektorler: bool = False) -> Tuple[Dict[str, Any], KanunIndex]:
+    """İndeks kurulum süresini ve boyutunu ölçer"""
+    kanunlar = processor.processed_kanunlar[:limit] if limit else processor.processed_kanunlar
+
+    start = time.perf_counter()
+    index = KanunIndex(nicem_vektorler=nicem_vektorler)
+    for kanun in kanunlar:
+        index.add_kanun(kanun)
+    add_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index.build(model)
+    build_elapsed = time.perf_counter() - start
+
+    result = {
+        'kanun_sayisi': index.kanun_sayisi,
+        'madde_sayisi': index.madde_sayisi,
+        'vektor_sayisi': index.vektor_sayisi,
+        'ekleme_s': add_elapsed,
+        'build_s': build_elapsed
+    }
+    result.update(index_size_bytes(index))
+    return result, index
+
+
+def bench_query(index: KanunIndex, questions: List[str], max_results: int, tekrar: int) -> Dict[str, Any]:
+    """Tekil ve toplu sorgu gecikmelerini ölçer"""
+    # Isınma
+    index.search(questions[0], max_results)
+
+    single = []
+    for _ in range(tekrar):
+        for question in questions:
+            start = time.perf_counter()
+            index.search(question, max_results)
+            single.append((time.perf_counter() - start) * 1000)
+
+    # Toplu sorgu: sorular tek seferde encode edilir, sonra her biri skorlanır
+    batch = []
+    for _ in range(tekrar):
+        start = time.perf_counter()
+        index.search_batch(questions, max_results)
+        batch.append((time.perf_counter() - start) * 1000)
+
+    result = {'soru_sayisi': len(questions), 'max_results': max_results}
+    result['single'] = latency_stats(single)
+    result['batch'] = latency_stats(batch)
+    result['batch']['qps'] = len(questions) / (float(np.mean(batch)) / 1000)
+    return result
+
+
+def flatten(report: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    """İç içe sonuçları "aşama.metrik" anahtarlarına düzleştirir"""
+    flat = {}
+    for key, value in report.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + '.'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def metric_direction(name: str) -> Optional[str]:
+    """Metrik için iyi yönü döndürür: 'yuksek', 'dusuk' veya None (karşılaştırılmaz)"""
+    metric = name.rsplit('.', 1)[-1]
+    if metric.endswith('_per_s') or metric == 'qps':
+        return 'yuksek'
+    if metric.endswith(('_ms', '_s', '_mb', '_bytes')):
+        return 'dusuk'
+    return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Baseline'a göre eşiği aşan gerilemeleri döndürür"""
+    now = flatten(current['stages'])
+    before = flatten(baseline['stages'])
+    regressions = []
+
+    for name, old in sorted(before.items()):
+        direction = metric_direction(name)
+        if direction is None or name not in now or old == 0:
+            continue
+        change = (now[name] - old) / abs(old)
+        kotulesme = -change if direction == 'yuksek' else change
+        if kotulesme > threshold:
+            regressions.append({'metrik': name, 'baseline': old, 'simdi': now[name], 'degisim': change})
+    return regressions
+
+
+def environment() -> Dict[str, Any]:
+    """Sonuçların karşılaştırılabilmesi için ortam bilgisini döndürür"""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_sayisi': os.cpu_count(),
+        'zaman': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+
+
+def load_model(model_name: str):
+    """Embedding modelini yükler"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+def run_suite(args) -> Dict[str, Any]:
+    """Seçilen aşamaları sırayla çalıştırır"""
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    for stage in stages:
+        if stage not in STAGES:
+            raise ValueError(f"Bilinmeyen aşama: {stage} (geçerli aşamalar: {', '.join(STAGES)})")
+
+    report = {'meta': environment(), 'ayarlar': vars(args), 'stages': {}}
+    report['meta']['baslangic_rss_mb'] = current_rss_mb()
+
+    questions = VARSAYILAN_SORULAR
+    if args.sorular:
+        with open(args.sorular, 'r', encoding='utf-8') as f:
+            questions = [line.strip() for line in f if line.strip()]
+
+    def run(stage, func, *func_args):
+        print(f"[{stage}] çalışıyor...")
+        with RssOrnekleyici() as rss:
+            result = func(*func_args)
+        metrics, extra = (result if isinstance(result, tuple) else (result, None))
+        metrics['peak_rss_mb'] = rss.peak_mb
+        report['stages'][stage] = metrics
+        return extra
+
+    processor = run('parse', bench_parse, args.folder, args.limit)
+    if 'chunks' in stages:
+        run('chunks', bench_chunks, processor, args.sample)
+
+    model = None
+    if {'embed', 'index', 'query'} & set(stages):
+        with RssOrnekleyici() as rss:
+            start = time.perf_counter()
+            model = load_model(args.model)
+            report['meta']['model_yukleme_s'] = time.perf_counter() - start
+        report['meta']['model_peak_rss_mb'] = rss.peak_mb
+
+    if 'embed' in stages:
+        run('embed', bench_embed, model, args.sample, args.batch_size)
+
+    index = None
+    if 'index' in stages or 'query' in stages:
+        index = run('index', bench_index, processor, model, args.index_limit, args.int8)
+    if 'query' in stages:
+        run('query', bench_query, index, questions, args.max_results, args.tekrar)
+
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    """Özet sonuçları yazdırır"""
+    for stage, metrics in report['stages'].items():
+        print(f"\n[{stage}]")
+        for name, value in flatten(metrics).items():
+            print(f"  {name}: {value:,.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çevrimdışı kanun arama benchmark'ı")
+    parser.add_argument("--folder", default=".", help="Kanun .txt dosyalarının bulunduğu klasör")
+    parser.add_argument("--sample", default="kanun_chunks_gist.json", help="Embedding ölçümü için chunk örneği")
+    parser.add_argument("--limit", type=int, default=None, help="Parse edilecek en fazla kanun sayısı")
+    parser.add_argument("--index-limit", type=int, default=100, help="İndekse eklenecek en fazla kanun sayısı")
+    parser.add_argument("--stages", default=','.join(STAGES), help="Virgülle ayrılmış aşamalar")
+    parser.add_argument("--model", default=MODEL_NAME, help="Embedding modeli adı veya yerel yolu")
+    parser.add_argument("--batch-size", type=int, default=64, help="Embedding batch boyutu")
+    parser.add_argument("--int8", action="store_true", help="İndeksi int8 vektörlerle kur")
+    parser.add_argument("--max-results", type=int, default=5, help="Sorgu başına sonuç sayısı")
+    parser.add_argument("--sorular", default=None, help="Her satırda bir soru bulunan dosya")
+    parser.add_argument("--tekrar", type=int, default=5, help="Sorgu ölçümü tekrar sayısı")
+    parser.add_argument("--output", default="benchmark_results.json", help="Sonuç JSON dosyası")
+    parser.add_argument("--baseline", default=None, help="Karşılaştırılacak baseline JSON dosyası")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Gerileme eşiği (0.10 = %%10)")
+    args = parser.parse_args()
+
+    report = run_suite(args)
+    print_report(report)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar {args.output} dosyasına kaydedildi.")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n%{args.threshold * 100:.0f} eşiğini aşan {len(regressions)} gerileme:")
+            for item in regressions:
+                print(f"  {item['metrik']}: {item['baseline']:,.3f} -> {item['simdi']:,.3f} ({item['degisim']:+.1%})")
+            sys.exit(1)
+        print(f"\nBaseline'a göre %{args.threshold * 100:.0f} eşiğini aşan gerileme yok.")
+
+
+if __name__ == "__main__":
+    main()
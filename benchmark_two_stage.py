@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İki Aşamalı Arama Benchmark Scripti
+Kanun düzeyinde budamalı aramayı (en uygun M kanunun maddeleri) tüm maddelerin skorlandığı
+aramayla karşılaştırır; her M için recall@k ve gecikme azalmasını raporlar.
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import List, Dict, Any
+import numpy as np
+from kanun_processor import KanunProcessor
+from kanun_index import KanunIndex
+
+MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+VARSAYILAN_SORULAR = [
+    "vergi muafiyeti nedir?",
+    "işçi hakları nelerdir?",
+    "yıllık izin süresi kaç gündür?",
+    "kıdem tazminatı nasıl hesaplanır?",
+    "gümrük vergisi hangi durumlarda alınmaz?",
+    "belediye başkanının görevleri nelerdir?",
+    "vergi cezalarında uzlaşma nasıl yapılır?",
+    "memurların disiplin cezaları nelerdir?",
+    "kira sözleşmesinin feshi",
+    "trafik cezasına itiraz süresi",
+    "savunma sekreterliği kadroları",
+    "defter tutma yükümlülüğü kimlere aittir?",
+    "emeklilik yaşı kaçtır?",
+    "yabancıların taşınmaz edinmesi",
+    "seçimlerde oy kullanma yaşı",
+    "askerlik yükümlülüğü ne zaman başlar?",
+    "kamu ihalesinde teminat oranı",
+    "orman alanlarında yapılaşma yasağı",
+    "sağlık sigortası primleri",
+    "ticaret siciline tescil zorunluluğu",
+]
+
+
+def load_index(folder: str, limit: int = None) -> KanunIndex:
+    """Klasördeki .txt dosyalarından indeksi oluşturur (embedding'ler hariç)"""
+    processor = KanunProcessor(folder)
+    index = KanunIndex()
+
+    txt_files = sorted(Path(folder).glob("*.txt"))
+    if limit:
+        txt_files = txt_files[:limit]
+
+    for file_path in txt_files:
+        kanun = processor.parse_kanun_file(file_path)
+        if kanun:
+            index.add_kanun(kanun)
+    return index
+
+
+def _percentile(values: List[float], p: float) -> float:
+    return float(np.percentile(values, p)) if values else 0.0
+
+
+def run_benchmark(index: KanunIndex, questions: List[str], m_values: List[int], k: int = 10,
+                  tekrar: int = 5) -> Dict[str, Any]:
+    """Her M değeri için recall@k ve skorlama gecikmesini ölçer"""
+    question_embeddings = [index.encode_question(question) for question in questions]
+
+    def measure(aday_kanun_sayisi: int):
+        latencies = []
+        ranked = []
+        for question_embedding in question_embeddings:
+            for _ in range(tekrar):
+                start = time.perf_counter()
+                vektorler, _, _ = index.rank(question_embedding, k, aday_kanun_sayisi=aday_kanun_sayisi)
+                latencies.append((time.perf_counter() - start) * 1000)
+            ranked.append(set(int(vektor_id) for vektor_id in vektorler))
+        return ranked, latencies
+
+    exhaustive, exhaustive_latencies = measure(0)
+    exhaustive_mean = float(np.mean(exhaustive_latencies))
+
+    report = {
+        'kanun_sayisi': index.kanun_sayisi,
+        'madde_sayisi': index.madde_sayisi,
+        'soru_sayisi': len(questions),
+        'k': k,
+        'exhaustive': {
+            'mean_ms': exhaustive_mean,
+            'p50_ms': _percentile(exhaustive_latencies, 50),
+            'p95_ms': _percentile(exhaustive_latencies, 95)
+        },
+        'two_stage': []
+    }
+
+    for m in m_values:
+        ranked, latencies = measure(m)
+        recalls = [
+            len(found & expected) / len(expected)
+            for found, expected in zip(ranked, exhaustive)
+            if expected
+        ]
+        mean_ms = float(np.mean(latencies))
+        report['two_stage'].append({
+            'M': m,
+            f'recall@{k}': float(np.mean(recalls)) if recalls else 1.0,
+            'mean_ms': mean_ms,
+            'p50_ms': _percentile(latencies, 50),
+            'p95_ms': _percentile(latencies, 95),
+            'speedup': exhaustive_mean / mean_ms if mean_ms else 0.0
+        })
+
+    return report
+
+
+def print_report(report: Dict[str, Any]):
+    """Sonuçları tablo halinde yazdırır"""
+    k = report['k']
+    print(f"\n{report['kanun_sayisi']} kanun, {report['madde_sayisi']} madde, {report['soru_sayisi']} soru")
+    print(f"Tüm maddeler: ortalama {report['exhaustive']['mean_ms']:.3f} ms, p95 {report['exhaustive']['p95_ms']:.3f} ms")
+    print(f"{'M':>6} {'recall@' + str(k):>10} {'ort. ms':>10} {'p95 ms':>10} {'hızlanma':>10}")
+    for row in report['two_stage']:
+        print(f"{row['M']:>6} {row[f'recall@{k}']:>10.3f} {row['mean_ms']:>10.3f} {row['p95_ms']:>10.3f} {row['speedup']:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İki aşamalı arama benchmark'ı")
+    parser.add_argument("--folder", default=".", help="Kanun .txt dosyalarının bulunduğu klasör")
+    parser.add_argument("--limit", type=int, default=None, help="Yüklenecek en fazla kanun sayısı")
+    parser.add_argument("--k", type=int, default=10, help="recall@k için k")
+    parser.add_argument("--m", default="10,25,50,100,200", help="Virgülle ayrılmış M değerleri")
+    parser.add_argument("--sorular", default=None, help="Her satırda bir soru bulunan dosya")
+    parser.add_argument("--tekrar", type=int, default=5, help="Her soru için ölçüm tekrarı")
+    parser.add_argument("--json", default=None, help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    questions = VARSAYILAN_SORULAR
+    if args.sorular:
+        with open(args.sorular, 'r', encoding='utf-8') as f:
+            questions = [line.strip() for line in f if line.strip()]
+
+    from sentence_transformers import SentenceTransformer
+
+    print("Kanunlar yükleniyor...")
+    index = load_index(args.folder, args.limit)
+
+    print("Embedding modeli yükleniyor...")
+    model = SentenceTransformer(MODEL_NAME)
+    index.build(model)
+
+    m_values = [int(m) for m in args.m.split(',') if m.strip()]
+    report = run_benchmark(index, questions, m_values, args.k, args.tekrar)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Sonuçlar {args.json} dosyasına kaydedildi.")
+
+
+if __name__ == "__main__":
+    main()
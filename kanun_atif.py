@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kanunlar Arası Atıf Çıkarıcı
+Madde metinlerindeki "4458 sayılı Gümrük Kanununun 242 nci maddesi", "2365 sayılı Kanunun 1 inci
+maddesiyle" ve "bu Kanunun 5 ve 6 ncı maddeleri" gibi atıfları (kanun no, madde türü, madde no)
+hedeflerine çevirir. Desenler sabit bir metinle ("ayılı", "Kanun") başladığı için regex motoru
+metni hızlıca tarar; kanun numarası ve "bu Kanun" öneki eşleşmenin hemen öncesinden okunur.
+"""
+
+import re
+from typing import List, Tuple, Optional
+
+# "242 nci", "1 inci", "12." gibi sıra sayısı ekleri
+_SIRA_EKI = r"(?:\.|\s*['’]?\s*(?:inci|ıncı|uncu|üncü|nci|ncı|ncu|ncü|ci|cı|cu|cü))?"
+
+# "ek 3", "geçici 1", "5 ve 6", "116, 117 ve 118" gibi madde numarası listeleri
+_MADDE_NOLARI = r"(?P<tur>[Ee]k\s+|[Gg]eçici\s+)?(?P<nolar>\d{1,4}(?:\s*(?:,|ve|ile|veya)\s*\d{1,4})*)"
+
+# "... sayılı <ad> Kanun(un) [N inci madde]" ("Kanun Hükmünde Kararname" hariç)
+SAYILI_PATTERN = re.compile(
+    r"ayılı\s+(?P<ad>(?:[^\s.,;:()]+\s+){0,8}?)Kanun(?!\s+Hükmünde)\w*"
+    r"(?:\s+" + _MADDE_NOLARI + _SIRA_EKI + r"\s+[Mm]adde)?"
+)
+# "sayılı" öncesindeki kanun numarası (Resmî Gazete sayıları gibi 5 haneli sayılar hariç)
+KANUN_NO_PATTERN = re.compile(r"(?<![\d.])(\d{1,4})\s+[Ss]$")
+
+# "bu Kanunun N inci maddesi" (aynı kanuna atıf)
+BU_KANUN_PATTERN = re.compile(r"Kanun\w*\s+" + _MADDE_NOLARI + _SIRA_EKI + r"\s+[Mm]adde")
+BU_PATTERN = re.compile(r"(?:^|\W)(?:[Bb]u|[İi]şbu)\s+$")
+
+# (kanun no (None = aynı kanun), madde türü, madde no (0 = kanunun tamamı))
+Atif = Tuple[Optional[int], str, int]
+
+
+def _madde_turu(tur: Optional[str]) -> str:
+    if not tur:
+        return 'normal'
+    return 'ek' if tur.strip().lower() == 'ek' else 'gecici'
+
+
+def _madde_nolari(match) -> List[int]:
+    return [int(no) for no in re.findall(r'\d+', match.group('nolar'))]
+
+
+def extract_atiflar(metin: str) -> List[Atif]:
+    """Metindeki kanun ve madde atıflarını ilk görülme sırasıyla, tekrarsız döndürür"""
+    atiflar = {}
+
+    for match in SAYILI_PATTERN.finditer(metin):
+        if 'Gazete' in match.group('ad'):
+            continue
+        kanun_match = KANUN_NO_PATTERN.search(metin, max(0, match.start() - 8), match.start())
+        if not kanun_match:
+            continue
+
+        kanun_no = int(kanun_match.group(1))
+        if match.group('nolar'):
+            tur = _madde_turu(match.group('tur'))
+            for madde_no in _madde_nolari(match):
+                atiflar.setdefault((kanun_no, tur, madde_no), None)
+        else:
+            atiflar.setdefault((kanun_no, 'normal', 0), None)
+
+    for match in BU_KANUN_PATTERN.finditer(metin):
+        if not BU_PATTERN.search(metin, max(0, match.start() - 7), match.start()):
+            continue
+        tur = _madde_turu(match.group('tur'))
+        for madde_no in _madde_nolari(match):
+            atiflar.setdefault((None, tur, madde_no), None)
+
+    return list(atiflar)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sunucu Başlangıcı
+Başlangıç aşamalarının (import'lar, model import'u ve yüklenmesi, kanunların yüklenmesi, indeks
+kurulumu, ısınma) sürelerini toplar ve hazır olunduğunda raporlar. Isınma için sorgu kaydındaki en
+sık N sorgu okunur; sunucu bunları hazır olmadan önce çalıştırarak encoder'ı, metin bloğu önbelleğini
+ve sıralanmış aday listesi önbelleğini ısıtır.
+"""
+
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, List, Optional
+
+# Sorgu kaydı parametrelerinden arama filtresi olmayanlar
+FILTRE_DISI_PARAMETRELER = ('question', 'max_results', 'offset', 'kanun_adi')
+
+
+class BaslangicRaporu:
+    """Başlangıç aşamalarının sürelerini toplar (aşamalar farklı thread'lerde paralel çalışabilir)"""
+
+    def __init__(self, baslangic: Optional[float] = None):
+        # Süreler modülün yüklenmeye başladığı andan itibaren ölçülür
+        self.baslangic = time.perf_counter() if baslangic is None else baslangic
+        self.asamalar: Dict[str, float] = {}
+        self.hazir_ms: Optional[float] = None
+        # Isınma özeti (ısınma yapıldıysa)
+        self.isinma: Optional[Dict[str, Any]] = None
+
+    def ekle(self, asama: str, sure: float):
+        self.asamalar[asama] = self.asamalar.get(asama, 0.0) + sure
+
+    @contextmanager
+    def asama(self, ad: str):
+        """with bloğunun süresini aşamaya ekler"""
+        baslangic = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ekle(ad, time.perf_counter() - baslangic)
+
+    def hazir(self):
+        """Başlangıcın bittiğini işaretler ve raporu yazdırır"""
+        self.hazir_ms = (time.perf_counter() - self.baslangic) * 1000
+        print("Başlangıç süreleri:")
+        for asama, sure in self.asamalar.items():
+            print(f"  {asama:<14} {sure * 1000:>10.1f} ms")
+        print(f"  {'toplam':<14} {self.hazir_ms:>10.1f} ms")
+
+    def rapor(self) -> Dict[str, Any]:
+        return {
+            'asamalar_ms': {asama: round(sure * 1000, 1) for asama, sure in self.asamalar.items()},
+            'toplam_ms': None if self.hazir_ms is None else round(self.hazir_ms, 1),
+            'isinma': self.isinma
+        }
+
+
+def _kayit_dosyalari(log_path: str) -> List[str]:
+    """Sorgu kaydını ve RotatingFileHandler'ın yedeklerini (log.1, log.2, ...) döndürür"""
+    dosyalar = [log_path] if os.path.exists(log_path) else []
+    sira = 1
+    while os.path.exists(f"{log_path}.{sira}"):
+        dosyalar.append(f"{log_path}.{sira}")
+        sira += 1
+    return dosyalar
+
+
+def isinma_sorgulari(log_path: str, n: int) -> List[Dict[str, Any]]:
+    """Sorgu kaydındaki en sık N sorguyu (soru ve filtreleriyle) döndürür
+
+    Satırlar sorgu kaydının (QUERY_LOG) veya yavaş sorgu kaydının JSON kayıtları ya da düz metin
+    sorular olabilir; düz metin soruların filtreleri None döner (isteğin varsayılan filtreleri kullanılır).
+    """
+    sayac: Counter = Counter()
+    sorgular: Dict[str, Dict[str, Any]] = {}
+    for dosya in _kayit_dosyalari(log_path):
+        with open(dosya, 'r', encoding='utf-8') as f:
+            for satir in f:
+                satir = satir.strip()
+                if not satir:
+                    continue
+                try:
+                    parametreler = json.loads(satir)['parametreler']
+                    sorgu = {
+                        'question': parametreler['question'],
+                        'max_results': parametreler.get('max_results') or 5,
+                        'filtreler': {ad: deger for ad, deger in parametreler.items()
+                                      if ad not in FILTRE_DISI_PARAMETRELER}
+                    }
+                except (ValueError, KeyError, TypeError):
+                    sorgu = {'question': satir, 'max_results': 5, 'filtreler': None}
+                if not sorgu['question']:
+                    continue
+                # Aynı soru ve filtreler aynı önbellek kaydını kullanır (sayfa ve max_results farkı önemsiz)
+                anahtar = json.dumps([sorgu['question'], sorgu['filtreler']], sort_keys=True, ensure_ascii=False)
+                sayac[anahtar] += 1
+                sorgular.setdefault(anahtar, sorgu)
+    return [sorgular[anahtar] for anahtar, _ in sayac.most_common(n)]
+
+
+def isit(arama: Callable[[Dict[str, Any]], Any], sorgular: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sorguları sırayla çalıştırır; ilk sorgunun ve kalanların süresini raporlar"""
+    sureler = []
+    hatalar = 0
+    for sorgu in sorgular:
+        baslangic = time.perf_counter()
+        try:
+            arama(sorgu)
+        except Exception as e:
+            hatalar += 1
+            print(f"Isınma sorgusu başarısız ({sorgu['question']!r}): {e}")
+        sureler.append((time.perf_counter() - baslangic) * 1000)
+
+    ozet = {
+        'sorgu_sayisi': len(sorgular),
+        'hata_sayisi': hatalar,
+        'ilk_sorgu_ms': round(sureler[0], 1) if sureler else None,
+        'ortalama_ms': round(sum(sureler[1:]) / (len(sureler) - 1), 1) if len(sureler) > 1 else None
+    }
+    print(f"Isınma: {len(sorgular)} sorgu, ilk {ozet['ilk_sorgu_ms']} ms, sonrakiler ortalama {ozet['ortalama_ms']} ms")
+    return ozet
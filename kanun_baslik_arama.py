@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kanun Başlığı Arama
+Kanun seçici (typeahead) için başlıklardaki kelimeler, kanun numaraları ve "(VUK.)" gibi kısaltmalar
+üzerinde sıralı dizi önek indeksi. Kelimeler Türkçe küçük harfe çevrilerek sıralı bir listede tutulur;
+bir önekin eşleştiği kelimeler ikili arama ile bulunan tek bir aralıktır.
+Yazım hatalı kanun adları ("vergi usül", "gumruk kanunu") için Türkçe karakterlerden arındırılmış
+başlıklar üzerinde bir trigram indeksi de tutulur: adaylar ortak trigram sayısıyla seçilir ve
+kelime düzeyinde sınırlı edit mesafesiyle yeniden sıralanır.
+İki indeks de kanun id'leriyle çalışır; canlı güncellemelerde tek bir kanunun girdileri eklenip
+çıkarılır (silinen kanunun id'si boş kalır).
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Tuple, Optional
+import numpy as np
+
+# Başlık sonundaki yayım tarihi ("06.01.1961", "09/10/1984")
+TARIH_PATTERN = re.compile(r'\d{1,2}[./]\d{1,2}[./]\d{4}')
+
+# Parantez içindeki büyük harfli kısaltmalar ("(GVK.)", "(İİK.)")
+KISALTMA_PATTERN = re.compile(r'\(([A-ZÇĞİÖŞÜ.]{2,12})\)')
+
+# Başlık başındaki kanun numarası ("213 sayılı ")
+SAYILI_PATTERN = re.compile(r'^\s*\d+\s+sayılı\s+', re.IGNORECASE)
+
+# Türkçe karakterlerin ASCII karşılıkları
+_ASCII_TABLOSU = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+# Eşleşmeyen kelimeler için konum değeri
+_ESLESMEDI = np.iinfo(np.int32).max
+
+
+def turkce_kucuk(metin: str) -> str:
+    """Türkçe kurallarıyla küçük harfe çevirir ("I" -> "ı", "İ" -> "i")"""
+    return metin.replace('I', 'ı').replace('İ', 'i').lower().replace('i̇', 'i')
+
+
+def kelimeler(metin: str) -> List[str]:
+    """Metni Türkçe küçük harfli kelimelere ayırır"""
+    return re.findall(r'\w+', turkce_kucuk(metin))
+
+
+def ascii_katla(metin: str) -> str:
+    """Türkçe küçük harfe çevirir ve Türkçe karakterleri ASCII karşılıklarıyla değiştirir"""
+    return turkce_kucuk(metin).translate(_ASCII_TABLOSU)
+
+
+def kanun_adi(baslik: str) -> str:
+    """Başlıktan kanun numarasını, kısaltmayı ve yayım tarihini çıkarır ("Vergi Usul Kanunu")"""
+    return SAYILI_PATTERN.sub('', TARIH_PATTERN.sub(' ', KISALTMA_PATTERN.sub(' ', baslik))).strip()
+
+
+def trigramlar(kelime: str) -> List[str]:
+    """Kelimenin başı ve sonu boşlukla işaretlenmiş trigramlarını döndürür"""
+    kelime = f" {kelime} "
+    return [kelime[i:i + 3] for i in range(len(kelime) - 2)]
+
+
+def sinirli_edit_mesafesi(a: str, b: str, sinir: int, onek: bool = False) -> int:
+    """Levenshtein mesafesini yalnızca köşegen etrafındaki ±sinir bandında hesaplar
+
+    Mesafe sınırı aşarsa sinir + 1 döner. onek=True ise a'nın b'nin herhangi bir önekine olan en küçük
+    mesafesi döner ("mahkemesi" ile "mahkemesinin" gibi ek almış kelimeler için).
+    """
+    if a == b:
+        return 0
+    asildi = sinir + 1
+    if onek:
+        b = b[:len(a) + sinir]
+    elif abs(len(a) - len(b)) > sinir:
+        return asildi
+
+    m = len(b)
+    onceki = [j if j <= sinir else asildi for j in range(m + 1)]
+    for i, ca in enumerate(a, 1):
+        sol, sag = max(1, i - sinir), min(m, i + sinir)
+        satir = [asildi] * (m + 1)
+        satir[0] = i if i <= sinir else asildi
+        en_kucuk = satir[sol - 1]
+        for j in range(sol, sag + 1):
+            deger = onceki[j - 1] + (ca != b[j - 1])
+            if onceki[j] + 1 < deger:
+                deger = onceki[j] + 1
+            if satir[j - 1] + 1 < deger:
+                deger = satir[j - 1] + 1
+            satir[j] = deger
+            if deger < en_kucuk:
+                en_kucuk = deger
+        # Banttaki en küçük değer sınırı aştıysa sonuç da aşar
+        if en_kucuk > sinir:
+            return asildi
+        onceki = satir
+    return min(min(onceki) if onek else onceki[m], asildi)
+
+
+def kelime_mesafesi(kelime: str, ad_kelimesi: str, sinir: int) -> int:
+    """Sorgu kelimesinin addaki kelimeye mesafesi; ek almış kelimeye önek eşleşmesi 1 mesafe sayılır"""
+    mesafe = sinirli_edit_mesafesi(kelime, ad_kelimesi, sinir)
+    if mesafe > 1 and len(kelime) >= 4 and len(ad_kelimesi) > len(kelime):
+        mesafe = min(mesafe, sinirli_edit_mesafesi(kelime, ad_kelimesi, sinir, onek=True) + 1)
+    return mesafe
+
+
+def kelime_siniri(kelime: str) -> int:
+    """Kelime uzunluğuna göre izin verilen en fazla yazım hatası"""
+    return 0 if len(kelime) <= 2 else 1 if len(kelime) <= 5 else 2
+
+
+def kisaltma_cikar(baslik: str) -> Optional[str]:
+    """Başlıktaki kısaltmayı döndürür ("Vergi Usul Kanunu (VUK.)" -> "VUK")"""
+    match = KISALTMA_PATTERN.search(baslik)
+    return match.group(1).replace('.', '') if match else None
+
+
+class BaslikOnekIndeksi:
+    """Başlık kelimeleri, kanun numaraları ve kısaltmalar üzerinde önek indeksi"""
+
+    def __init__(self):
+        # Sıralı kelimeler ve her kelimenin kanun id'si ile başlıktaki konumu
+        # Kanun numarası ve kısaltma 0. konumdadır
+        self.tokenler: List[str] = []
+        self.kanun_ids = np.zeros(0, dtype=np.int32)
+        self.konumlar = np.zeros(0, dtype=np.int32)
+        self.baslik_uzunluklari = np.zeros(0, dtype=np.int32)
+
+    @property
+    def kanun_sayisi(self) -> int:
+        return len(self.baslik_uzunluklari)
+
+    @staticmethod
+    def _girdiler(kanun_id: int, baslik: str, kanun_no: str) -> List[Tuple[str, int, int]]:
+        girdiler = [(kanun_no, kanun_id, 0)]
+        kisaltma = kisaltma_cikar(baslik)
+        if kisaltma:
+            girdiler.append((turkce_kucuk(kisaltma), kanun_id, 0))
+        for konum, kelime in enumerate(kelimeler(TARIH_PATTERN.sub(' ', baslik))):
+            girdiler.append((kelime, kanun_id, konum))
+        return girdiler
+
+    def build(self, basliklar: List[Optional[str]], kanun_nolari: List[str]):
+        """Kanun id sırasındaki başlık ve numaralardan indeksi oluşturur (başlığı None olan kanun indekslenmez)"""
+        girdiler = []
+        for kanun_id, (baslik, kanun_no) in enumerate(zip(basliklar, kanun_nolari)):
+            if baslik is not None:
+                girdiler.extend(self._girdiler(kanun_id, baslik, kanun_no))
+
+        girdiler.sort()
+        self.tokenler = [token for token, _, _ in girdiler]
+        self.kanun_ids = np.array([kanun_id for _, kanun_id, _ in girdiler], dtype=np.int32)
+        self.konumlar = np.array([konum for _, _, konum in girdiler], dtype=np.int32)
+        self.baslik_uzunluklari = np.array([0 if baslik is None else len(baslik) for baslik in basliklar],
+                                           dtype=np.int32)
+
+    def kopya(self) -> 'BaslikOnekIndeksi':
+        """ekle/sil ile değiştirilebilecek bir kopya (diziler değiştirilmeden yenileriyle değiştirilir)"""
+        kopya = BaslikOnekIndeksi()
+        kopya.tokenler = list(self.tokenler)
+        kopya.kanun_ids, kopya.konumlar, kopya.baslik_uzunluklari = self.kanun_ids, self.konumlar, self.baslik_uzunluklari
+        return kopya
+
+    def ekle(self, baslik: str, kanun_no: str) -> int:
+        """Yeni bir kanunu sonraki kanun id'siyle ekler ve id'yi döndürür"""
+        kanun_id = self.kanun_sayisi
+        girdiler = sorted(self._girdiler(kanun_id, baslik, kanun_no))
+        # Kanun id en büyük olduğundan eşit kelimelerin sonuna girer (build'deki sıralamayla aynı)
+        konumlar = [bisect_right(self.tokenler, token) for token, _, _ in girdiler]
+        for eklenen, (konum, (token, _, _)) in enumerate(zip(konumlar, girdiler)):
+            self.tokenler.insert(konum + eklenen, token)
+        self.kanun_ids = np.insert(self.kanun_ids, konumlar, kanun_id).astype(np.int32)
+        self.konumlar = np.insert(self.konumlar, konumlar, [konum for _, _, konum in girdiler]).astype(np.int32)
+        self.baslik_uzunluklari = np.append(self.baslik_uzunluklari, np.int32(len(baslik)))
+        return kanun_id
+
+    def sil(self, kanun_id: int):
+        """Kanunun girdilerini kaldırır (id boş kalır)"""
+        konumlar = np.flatnonzero(self.kanun_ids == kanun_id)
+        for konum in reversed(konumlar.tolist()):
+            del self.tokenler[konum]
+        self.kanun_ids = np.delete(self.kanun_ids, konumlar)
+        self.konumlar = np.delete(self.konumlar, konumlar)
+        self.baslik_uzunluklari = self.baslik_uzunluklari.copy()
+        self.baslik_uzunluklari[kanun_id] = 0
+
+    def ara(self, sorgu: str, limit: int = 10) -> List[int]:
+        """Sorgudaki her kelimenin başlıktaki bir kelimenin öneki olduğu kanunları sıralı döndürür
+
+        Sıralama: tam eşleşen kelime sayısı, eşleşmelerin başlıktaki konumu, başlık uzunluğu.
+        """
+        sorgu_kelimeleri = list(dict.fromkeys(kelimeler(sorgu)))
+        if not sorgu_kelimeleri or not self.kanun_sayisi or limit <= 0:
+            return []
+
+        konum_toplami = np.zeros(self.kanun_sayisi, dtype=np.int64)
+        tam_eslesme = np.zeros(self.kanun_sayisi, dtype=np.int32)
+        for kelime in sorgu_kelimeleri:
+            # Öneki paylaşan kelimeler sıralı listede tek bir aralıktır
+            sol = bisect_left(self.tokenler, kelime)
+            sag = bisect_left(self.tokenler, kelime + '\U0010ffff', sol)
+            if sol == sag:
+                return []
+
+            # Kanun başına en öndeki eşleşme (dtype'lar aynı olmalı; aksi halde ufunc.at yavaş yola düşer)
+            en_iyi = np.full(self.kanun_sayisi, _ESLESMEDI, dtype=np.int32)
+            np.minimum.at(en_iyi, self.kanun_ids[sol:sag], self.konumlar[sol:sag])
+            konum_toplami += en_iyi
+
+            tam_sag = bisect_right(self.tokenler, kelime, sol, sag)
+            tam = np.zeros(self.kanun_sayisi, dtype=bool)
+            tam[self.kanun_ids[sol:tam_sag]] = True
+            tam_eslesme += tam
+
+        adaylar = np.flatnonzero(konum_toplami < _ESLESMEDI)
+        sira = np.lexsort((adaylar, self.baslik_uzunluklari[adaylar], konum_toplami[adaylar], -tam_eslesme[adaylar]))
+        return adaylar[sira[:limit]].tolist()
+
+
+class BaslikTrigramIndeksi:
+    """Türkçe karakterlerden arındırılmış kanun adları üzerinde yazım hatasına dayanıklı trigram indeksi"""
+
+    def __init__(self, max_aday: int = 50, max_kelime_adayi: int = 32):
+        # İlk aşamada edit mesafesiyle sıralanacak en fazla kanun adayı
+        self.max_aday = max_aday
+        # Bir sorgu kelimesi için edit mesafesi hesaplanacak en fazla sözlük kelimesi
+        self.max_kelime_adayi = max_kelime_adayi
+
+        # Kanun adı trigramı -> kanun id'leri (her kanun bir trigram için bir kez)
+        self.trigram_kanunlari: Dict[str, np.ndarray] = {}
+        # Adlarda geçen kelimelerin sözlüğü ve kelime trigramı -> kelime id'leri
+        self.kelimeler: List[str] = []
+        self.trigram_kelimeleri: Dict[str, np.ndarray] = {}
+        # Kanun id sırasında adın kelime id'leri (silinen kanunlarda boş)
+        self.kanun_kelime_ids: List[Tuple[int, ...]] = []
+        self.ad_uzunluklari = np.zeros(0, dtype=np.int32)
+        # Kelime -> kelime id ve her kelimeyi kullanan kanun sayısı; sayısı 0'a inen kelime aday olmaz
+        self._kelime_ids: Dict[str, int] = {}
+        self._kelime_kanun_sayilari: List[int] = []
+
+    @property
+    def kanun_sayisi(self) -> int:
+        return len(self.kanun_kelime_ids)
+
+    @staticmethod
+    def _ad_kelimeleri(baslik: str) -> Tuple[str, List[str]]:
+        ad = ascii_katla(kanun_adi(baslik))
+        return ad, re.findall(r'\w+', ad)
+
+    @staticmethod
+    def _kelime_trigramlari(kelimeler_: List[str]) -> set:
+        return {trigram for kelime in kelimeler_ for trigram in trigramlar(kelime)}
+
+    def build(self, basliklar: List[Optional[str]]):
+        """Kanun id sırasındaki başlıklardan indeksi oluşturur (başlığı None olan kanun indekslenmez)"""
+        kelime_ids: Dict[str, int] = {}
+        kelime_kanun_sayilari: List[int] = []
+        kanun_postalari: Dict[str, List[int]] = {}
+        self.kanun_kelime_ids = []
+        ad_uzunluklari = []
+        for kanun_id, baslik in enumerate(basliklar):
+            if baslik is None:
+                self.kanun_kelime_ids.append(())
+                ad_uzunluklari.append(0)
+                continue
+            ad, ad_kelimeleri = self._ad_kelimeleri(baslik)
+            self.kanun_kelime_ids.append(tuple(kelime_ids.setdefault(kelime, len(kelime_ids)) for kelime in ad_kelimeleri))
+            kelime_kanun_sayilari.extend([0] * (len(kelime_ids) - len(kelime_kanun_sayilari)))
+            for kelime_id in set(self.kanun_kelime_ids[-1]):
+                kelime_kanun_sayilari[kelime_id] += 1
+            ad_uzunluklari.append(len(ad))
+            for trigram in self._kelime_trigramlari(ad_kelimeleri):
+                kanun_postalari.setdefault(trigram, []).append(kanun_id)
+
+        kelime_postalari: Dict[str, List[int]] = {}
+        self.kelimeler = list(kelime_ids)
+        for kelime_id, kelime in enumerate(self.kelimeler):
+            for trigram in set(trigramlar(kelime)):
+                kelime_postalari.setdefault(trigram, []).append(kelime_id)
+
+        self.trigram_kanunlari = {trigram: np.array(ids, dtype=np.int32) for trigram, ids in kanun_postalari.items()}
+        self.trigram_kelimeleri = {trigram: np.array(ids, dtype=np.int32) for trigram, ids in kelime_postalari.items()}
+        self.ad_uzunluklari = np.array(ad_uzunluklari, dtype=np.int32)
+        self._kelime_ids = kelime_ids
+        self._kelime_kanun_sayilari = kelime_kanun_sayilari
+
+    def kopya(self) -> 'BaslikTrigramIndeksi':
+        """ekle/sil ile değiştirilebilecek bir kopya (posting dizileri değiştirilmeden yenileriyle değiştirilir)"""
+        kopya = BaslikTrigramIndeksi(self.max_aday, self.max_kelime_adayi)
+        kopya.trigram_kanunlari = dict(self.trigram_kanunlari)
+        kopya.kelimeler = list(self.kelimeler)
+        kopya.trigram_kelimeleri = dict(self.trigram_kelimeleri)
+        kopya.kanun_kelime_ids = list(self.kanun_kelime_ids)
+        kopya.ad_uzunluklari = self.ad_uzunluklari
+        kopya._kelime_ids = dict(self._kelime_ids)
+        kopya._kelime_kanun_sayilari = list(self._kelime_kanun_sayilari)
+        return kopya
+
+    def _posting_ekle(self, postalar: Dict[str, np.ndarray], trigram_kumesi, deger: int):
+        for trigram in trigram_kumesi:
+            mevcut = postalar.get(trigram)
+            postalar[trigram] = np.array([deger], dtype=np.int32) if mevcut is None else \
+                np.insert(mevcut, np.searchsorted(mevcut, deger), deger)
+
+    def _posting_sil(self, postalar: Dict[str, np.ndarray], trigram_kumesi, deger: int):
+        for trigram in trigram_kumesi:
+            kalan = postalar[trigram][postalar[trigram] != deger]
+            if len(kalan):
+                postalar[trigram] = kalan
+            else:
+                del postalar[trigram]
+
+    def ekle(self, baslik: str) -> int:
+        """Yeni bir kanunu sonraki kanun id'siyle ekler ve id'yi döndürür"""
+        kanun_id = self.kanun_sayisi
+        ad, ad_kelimeleri = self._ad_kelimeleri(baslik)
+        kelime_ids = []
+        for kelime in ad_kelimeleri:
+            kelime_id = self._kelime_ids.get(kelime)
+            if kelime_id is None:
+                kelime_id = self._kelime_ids[kelime] = len(self.kelimeler)
+                self.kelimeler.append(kelime)
+                self._kelime_kanun_sayilari.append(0)
+            kelime_ids.append(kelime_id)
+        for kelime_id in set(kelime_ids):
+            # Kullanılmayan (veya yeni) kelime sözlük aramalarına geri girer
+            if self._kelime_kanun_sayilari[kelime_id] == 0:
+                self._posting_ekle(self.trigram_kelimeleri, set(trigramlar(self.kelimeler[kelime_id])), kelime_id)
+            self._kelime_kanun_sayilari[kelime_id] += 1
+
+        self.kanun_kelime_ids.append(tuple(kelime_ids))
+        self.ad_uzunluklari = np.append(self.ad_uzunluklari, np.int32(len(ad)))
+        self._posting_ekle(self.trigram_kanunlari, self._kelime_trigramlari(ad_kelimeleri), kanun_id)
+        return kanun_id
+
+    def sil(self, kanun_id: int):
+        """Kanunun trigramlarını kaldırır; başka kanunda geçmeyen kelimeler sözlük aramalarından çıkar"""
+        kelime_ids = set(self.kanun_kelime_ids[kanun_id])
+        ad_kelimeleri = [self.kelimeler[kelime_id] for kelime_id in kelime_ids]
+        self._posting_sil(self.trigram_kanunlari, self._kelime_trigramlari(ad_kelimeleri), kanun_id)
+        for kelime_id in kelime_ids:
+            self._kelime_kanun_sayilari[kelime_id] -= 1
+            if self._kelime_kanun_sayilari[kelime_id] == 0:
+                self._posting_sil(self.trigram_kelimeleri, set(trigramlar(self.kelimeler[kelime_id])), kelime_id)
+        self.kanun_kelime_ids[kanun_id] = ()
+        self.ad_uzunluklari = self.ad_uzunluklari.copy()
+        self.ad_uzunluklari[kanun_id] = 0
+
+    def _ortak_trigramlar(self, trigram_kumesi, postalar: Dict[str, np.ndarray], boyut: int) -> Optional[np.ndarray]:
+        """Her id'nin trigram kümesiyle paylaştığı trigram sayısını döndürür (ortak trigram yoksa None)"""
+        eslesen = [postalar[trigram] for trigram in trigram_kumesi if trigram in postalar]
+        if not eslesen:
+            return None
+        return np.bincount(np.concatenate(eslesen), minlength=boyut)
+
+    def _yakin_kelimeler(self, kelime: str) -> Dict[int, int]:
+        """Sorgu kelimesine sınır içinde kalan sözlük kelimelerini (kelime id -> mesafe) döndürür"""
+        sinir = kelime_siniri(kelime)
+        kelime_trigramlari = set(trigramlar(kelime))
+        ortak = self._ortak_trigramlar(kelime_trigramlari, self.trigram_kelimeleri, len(self.kelimeler))
+        if ortak is None:
+            return {}
+
+        # q-gram sınırı: her düzenleme en fazla 3 trigramı bozar (önek eşleşmesi için bir trigram pay)
+        adaylar = np.flatnonzero(ortak >= max(1, len(kelime_trigramlari) - 3 * sinir - 1))
+        if len(adaylar) > self.max_kelime_adayi:
+            adaylar = adaylar[np.argpartition(-ortak[adaylar], self.max_kelime_adayi - 1)[:self.max_kelime_adayi]]
+
+        yakinlar = {}
+        for kelime_id in adaylar.tolist():
+            mesafe = kelime_mesafesi(kelime, self.kelimeler[kelime_id], sinir)
+            if mesafe <= sinir:
+                yakinlar[kelime_id] = mesafe
+        return yakinlar
+
+    def ara(self, sorgu: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """Kanun adına en yakın kanunları (kanun id, benzerlik) olarak sıralı döndürür
+
+        Adaylar kanun adıyla ortak trigram sayısına göre seçilir. Her sorgu kelimesi, addaki en yakın
+        kelimeyle sınırlı edit mesafesiyle eşlenir. Sıralama: eşlenemeyen kelime sayısı, toplam mesafe,
+        adda eşlenmeyen kelime sayısı, ad uzunluğu.
+        """
+        sorgu_kelimeleri = list(dict.fromkeys(re.findall(r'\w+', ascii_katla(sorgu))))
+        if not sorgu_kelimeleri or not self.kanun_sayisi or limit <= 0:
+            return []
+
+        sorgu_trigramlari = {trigram for kelime in sorgu_kelimeleri for trigram in trigramlar(kelime)}
+        ortak = self._ortak_trigramlar(sorgu_trigramlari, self.trigram_kanunlari, self.kanun_sayisi)
+        if ortak is None:
+            return []
+        # Trigramlarının en az üçte birini paylaşmayan kanunlar aday olmaz
+        adaylar = np.flatnonzero(ortak >= max(1, len(sorgu_trigramlari) // 3))
+        if len(adaylar) > self.max_aday:
+            adaylar = adaylar[np.argpartition(-ortak[adaylar], self.max_aday - 1)[:self.max_aday]]
+
+        yakin_kelimeler = [(len(kelime), self._yakin_kelimeler(kelime)) for kelime in sorgu_kelimeleri]
+        sorgu_uzunlugu = sum(len(kelime) for kelime in sorgu_kelimeleri)
+
+        sonuclar = []
+        for kanun_id in adaylar.tolist():
+            ad_kelime_ids = self.kanun_kelime_ids[kanun_id]
+            eksik, toplam, eslenen = 0, 0, set()
+            for uzunluk, yakinlar in yakin_kelimeler:
+                eslesmeler = [(yakinlar[kelime_id], kelime_id) for kelime_id in ad_kelime_ids if kelime_id in yakinlar]
+                if eslesmeler:
+                    mesafe, kelime_id = min(eslesmeler)
+                    toplam += mesafe
+                    eslenen.add(kelime_id)
+                else:
+                    eksik += 1
+                    toplam += uzunluk
+
+            benzerlik = max(0.0, 1.0 - toplam / sorgu_uzunlugu)
+            anahtar = (eksik, toplam, len(set(ad_kelime_ids)) - len(eslenen), int(self.ad_uzunluklari[kanun_id]), kanun_id)
+            sonuclar.append((anahtar, benzerlik))
+
+        sonuclar.sort()
+        return [(anahtar[-1], round(benzerlik, 4)) for anahtar, benzerlik in sonuclar[:limit] if benzerlik > 0]
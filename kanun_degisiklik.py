@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Madde Değişiklik Notları Çıkarıcı
+Madde metinlerindeki "(Madde 08.02.2008 tarih ve 26781 sayılı Resmi Gazetede yayımlanan Kanun ile
+Değişmiştir.)", "(2365 sayılı Kanunun 1 inci maddesiyle değişen şekli.)" ve "(Mülga: 2/7/2018 -
+KHK/703/18 md.)" gibi notları tarih, Resmî Gazete sayısı, değiştiren kanun/madde, değişiklik türü
+ve kapsam (madde, fıkra, bent ...) alanlarına ayırır.
+"""
+
+import re
+from typing import List, Dict, Any, Optional
+
+# Sütunlarda indeks olarak tutulan değerler
+DEGISIKLIK_TURLERI = ('degisiklik', 'ekleme', 'mulga', 'iptal')
+KAPSAMLAR = ('bilinmiyor', 'madde', 'baslik', 'fikra', 'bent', 'cumle', 'ibare')
+
+# Değişiklik notu olabilecek parantez içleri
+NOT_PATTERN = re.compile(r'\(([^()]{8,600})\)')
+TARIH_PATTERN = re.compile(r'(?<!\d)(\d{1,2})[./](\d{1,2})[./](\d{4})(?!\d)')
+RESMI_GAZETE_PATTERN = re.compile(r'(\d+)\s+[Ss]ayılı\s+Resm[iî]\s*Gazete')
+KANUN_PATTERN = re.compile(r'(?<![\d.])(\d{1,4})\s+[Ss]ayılı\s+Kanun')
+KANUN_MADDE_PATTERN = re.compile(
+    r"(?<![\d.])(\d{1,4})\s*(?:/\d+)?\s*(?:\.|['’]?\s*(?:inci|ıncı|uncu|üncü|nci|ncı|ncu|ncü))\s+[Mm]ad"
+)
+# "12/7/2013-6495/24 md." ve "2/7/2018 - KHK/703/18 md." kısa biçimi
+KISA_PATTERN = re.compile(r'\d{4}\s*-\s*(KHK\s*[-/.]?\s*)?(\d{1,4})\s*/\s*(\d+)\s*md')
+
+# Tür anahtar kelimeleri (notta en son geçen kelime türü belirler)
+TUR_PATTERNLERI = (
+    ('iptal', re.compile(r'iptal edil|^\s*İptal', re.IGNORECASE)),
+    ('mulga', re.compile(r'[Yy]ürürlükten\s+[Kk]aldırıl|Mülga|mülga')),
+    ('ekleme', re.compile(r'[Ee]klen|^\s*Ek\b')),
+    ('degisiklik', re.compile(r'[Dd]eğiş|[Dd]üzenlen')),
+)
+
+# Tarihten önce gelen kapsam kelimeleri ("Fıkra", "3. Fıkra", "Madde Başlığı ve Madde" ...)
+KAPSAM_PATTERNLERI = (
+    ('madde', re.compile(r'\bMadde\b(?!\s+Başlığı\s*$)')),
+    ('fikra', re.compile(r'[Ff]ıkra|[Pp]aragraf')),
+    ('bent', re.compile(r'\b[Bb]ent')),
+    ('cumle', re.compile(r'[Cc]ümle')),
+    ('ibare', re.compile(r'[İi]bare')),
+    ('baslik', re.compile(r'[Bb]aşlı[kğ]')),
+)
+
+
+def tarih_to_int(gun: str, ay: str, yil: str) -> int:
+    return int(yil) * 10000 + int(ay) * 100 + int(gun)
+
+
+def _kapsam(onek: str, madde_basinda: bool) -> str:
+    """Not öncesindeki kelimelerden kapsamı belirler; belirtilmemişse maddenin başındaki notlar maddeyi kapsar"""
+    for kapsam, pattern in KAPSAM_PATTERNLERI:
+        if pattern.search(onek):
+            return kapsam
+    return 'madde' if madde_basinda else 'bilinmiyor'
+
+
+def _parse_olay(metin: str, madde_basinda: bool) -> Optional[Dict[str, Any]]:
+    """Tek bir değişiklik olayını ayrıştırır (tarih veya tür bulunamazsa None)"""
+    tarihler = list(TARIH_PATTERN.finditer(metin))
+    if not tarihler:
+        return None
+
+    # "... ile eklenen, ... iptal edilen, ... yeniden düzenlenen şekli" notlarında son fiil geçerlidir
+    tur, tur_konumu = None, -1
+    for aday, pattern in TUR_PATTERNLERI:
+        for match in pattern.finditer(metin):
+            if match.start() > tur_konumu:
+                tur, tur_konumu = aday, match.start()
+    if tur is None:
+        return None
+
+    # Son fiilden önceki son tarih; "(Mülga: 2/7/2018 - ...)" gibi fiilin önde olduğu notlarda ilk tarih
+    onceki_tarihler = [match for match in tarihler if match.start() < tur_konumu]
+    tarih = onceki_tarihler[-1] if onceki_tarihler else tarihler[0]
+
+    olay = {
+        'tarih': tarih_to_int(*tarih.groups()),
+        'tur': tur,
+        'kapsam': _kapsam(metin[:tarihler[0].start()], madde_basinda),
+        'resmi_gazete_sayisi': None,
+        'kanun_no': None,
+        'kanun_madde_no': None,
+        'madde_basinda': madde_basinda
+    }
+
+    rg = RESMI_GAZETE_PATTERN.search(metin)
+    if rg:
+        olay['resmi_gazete_sayisi'] = int(rg.group(1))
+
+    kisa = KISA_PATTERN.search(metin)
+    kanun = KANUN_PATTERN.search(metin, rg.end() if rg else 0)
+    if kanun:
+        olay['kanun_no'] = int(kanun.group(1))
+        madde = KANUN_MADDE_PATTERN.search(metin, kanun.end())
+        if madde:
+            olay['kanun_madde_no'] = int(madde.group(1))
+    elif kisa and not kisa.group(1):
+        olay['kanun_no'] = int(kisa.group(2))
+        olay['kanun_madde_no'] = int(kisa.group(3))
+    return olay
+
+
+def extract_degisiklikler(metin: str, madde_basligi: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Madde metnindeki değişiklik notlarını metindeki sırasıyla döndürür"""
+    # Madde başlığından sonraki ilk not maddenin tamamına ilişkindir
+    govde_baslangic = 0
+    if madde_basligi and metin.startswith(madde_basligi):
+        govde_baslangic = len(madde_basligi)
+
+    olaylar = []
+    onceki_bitis = govde_baslangic
+    madde_basinda = True
+    for match in NOT_PATTERN.finditer(metin):
+        icerik = match.group(1)
+        if not TARIH_PATTERN.search(icerik):
+            continue
+        # Gövdenin başındaki art arda notlar maddenin tamamına ilişkindir
+        madde_basinda = madde_basinda and not metin[onceki_bitis:match.start()].strip()
+        onceki_bitis = match.end()
+
+        # "... ile eklenmiş; ... ile yürürlükten kaldırılmıştır." gibi birden fazla olay
+        for parca in icerik.split(';'):
+            olay = _parse_olay(parca, madde_basinda)
+            if olay:
+                olaylar.append(olay)
+    return olaylar
+
+
+def is_mulga(olaylar: List[Dict[str, Any]]) -> bool:
+    """Gövdenin başındaki, maddenin tamamına ilişkin son olay yürürlükten kaldırma veya iptal ise True döner"""
+    madde_olaylari = [olay for olay in olaylar if olay['kapsam'] == 'madde' and olay['madde_basinda']]
+    return bool(madde_olaylari) and madde_olaylari[-1]['tur'] in ('mulga', 'iptal')
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Canlı Kanun Güncellemeleri
+Çalışan indekse tek bir kanunun eklenmesi, güncellenmesi veya silinmesi. Güncellemede yalnızca
+indekste olmayan madde metinleri encode edilir ve vektörler büyüyebilen embedding tamponunun sonuna
+eklenir; eski kanunun satırları tombstone olarak işaretlenip aramadan çıkarılır. Tombstone'lu
+satırların oranı eşiği aşınca compaction arka planda çalışır ve boşalan yeri geri kazanır.
+
+Aramalar indeksin okuma kilidiyle çalışır; güncellemeler pahalı kısmı (parse ve encode) kilit
+dışında yapar ve yalnızca dizileri değiştirdikleri kısa süre için yazma kilidini alır.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+
+
+class OkumaYazmaKilidi:
+    """Çok okuyuculu, tek yazıcılı kilit; bekleyen yazıcı yeni okuyuculardan önce alır
+
+    Okuma kilidi aynı thread'de iç içe alınabilir; yazma kilidini tutan thread okuma kilidini de
+    tutuyor sayılır (build metotları okuyan metotları çağırabilir).
+    """
+
+    def __init__(self):
+        self._kosul = threading.Condition(threading.Lock())
+        self._okuyucular = 0
+        self._bekleyen_yazicilar = 0
+        self._yazici: Optional[int] = None
+        self._yerel = threading.local()
+
+    @contextmanager
+    def okuma(self):
+        derinlik = getattr(self._yerel, 'derinlik', 0)
+        if derinlik or self._yazici == threading.get_ident():
+            self._yerel.derinlik = derinlik + 1
+            try:
+                yield
+            finally:
+                self._yerel.derinlik = derinlik
+            return
+
+        with self._kosul:
+            while self._yazici is not None or self._bekleyen_yazicilar:
+                self._kosul.wait()
+            self._okuyucular += 1
+        self._yerel.derinlik = 1
+        try:
+            yield
+        finally:
+            self._yerel.derinlik = 0
+            with self._kosul:
+                self._okuyucular -= 1
+                if not self._okuyucular:
+                    self._kosul.notify_all()
+
+    @contextmanager
+    def yazma(self):
+        with self._kosul:
+            self._bekleyen_yazicilar += 1
+            while self._yazici is not None or self._okuyucular:
+                self._kosul.wait()
+            self._bekleyen_yazicilar -= 1
+            self._yazici = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self._kosul:
+                self._yazici = None
+                self._kosul.notify_all()
+
+
+class KanunGuncelleyici:
+    """Tek kanunluk canlı güncellemeleri uygular ve gerektiğinde arka planda compaction başlatır"""
+
+    def __init__(self, kanun_index, processor, dosya_dizini: str = '.', compaction_orani: float = 0.2):
+        self.kanun_index = kanun_index
+        self.processor = processor
+        # Dosya yolu ile yüklemelerde yalnızca bu dizindeki .txt dosyaları okunur
+        self.dosya_dizini = os.path.realpath(dosya_dizini)
+        # Tombstone'lu madde oranı bu eşiği aşınca compaction başlar (0: otomatik compaction yok)
+        self.compaction_orani = compaction_orani
+        self.son_compaction: Optional[Dict[str, Any]] = None
+        self._compaction_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls, kanun_index, processor) -> 'KanunGuncelleyici':
+        return cls(kanun_index, processor,
+                   dosya_dizini=os.getenv("KANUN_DOSYA_DIZINI", "."),
+                   compaction_orani=float(os.getenv("COMPACTION_ORANI", 0.2)))
+
+    def _dosya_oku(self, dosya_yolu: str) -> str:
+        """Dosya dizini içindeki bir .txt kanun dosyasını okur"""
+        yol = os.path.realpath(os.path.join(self.dosya_dizini, dosya_yolu))
+        if os.path.commonpath([yol, self.dosya_dizini]) != self.dosya_dizini or not yol.endswith('.txt'):
+            raise ValueError(f"Dosya kanun dizininde bir .txt dosyası olmalı: {dosya_yolu}")
+        if not os.path.isfile(yol):
+            raise ValueError(f"Dosya bulunamadı: {dosya_yolu}")
+        with open(yol, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def kanun_yukle(self, kanun_no: str, icerik: Optional[str] = None, dosya_yolu: Optional[str] = None,
+                    gist_url: Optional[str] = None) -> Dict[str, Any]:
+        """Ham metni veya dosyayı parse eder ve kanunu indekse ekler ya da günceller"""
+        if (icerik is None) == (dosya_yolu is None):
+            raise ValueError("content veya path alanlarından yalnızca biri verilmeli")
+        if dosya_yolu is not None:
+            icerik = self._dosya_oku(dosya_yolu)
+
+        kanun = self.processor.parse_kanun_content(icerik, kanun_no)
+        if not kanun['maddeler']:
+            raise ValueError(f"Metinde madde bulunamadı: {kanun_no}")
+        kanun['gist_url'] = gist_url
+
+        ozet = self.kanun_index.upsert_kanun(kanun)
+        ozet['compaction_basladi'] = self._compaction_gerekirse()
+        return ozet
+
+    def kanun_sil(self, kanun_no: str) -> Optional[Dict[str, Any]]:
+        """Kanunu indeksten çıkarır (kanun yoksa None)"""
+        ozet = self.kanun_index.remove_kanun(kanun_no)
+        if ozet is not None:
+            ozet['compaction_basladi'] = self._compaction_gerekirse()
+        return ozet
+
+    def _compaction_gerekirse(self) -> bool:
+        if self.compaction_orani and self.kanun_index.tombstone_orani() >= self.compaction_orani:
+            return self.compaction_baslat()
+        return False
+
+    def compaction_calisiyor(self) -> bool:
+        return self._compaction_thread is not None and self._compaction_thread.is_alive()
+
+    def compaction_baslat(self) -> bool:
+        """Compaction'ı arka planda başlatır (zaten çalışıyorsa False)"""
+        if self.compaction_calisiyor():
+            return False
+        self._compaction_thread = threading.Thread(target=self._compaction, name='kanun-compaction', daemon=True)
+        self._compaction_thread.start()
+        return True
+
+    def _compaction(self):
+        baslangic = time.perf_counter()
+        try:
+            ozet = self.kanun_index.compact()
+            ozet['sure_ms'] = round((time.perf_counter() - baslangic) * 1000, 1)
+            print(f"Compaction tamamlandı: {ozet}")
+        except Exception as e:
+            ozet = {'hata': str(e)}
+            print(f"Compaction hatası: {e}")
+        ozet['tarih'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.son_compaction = ozet
+
+    def durum(self) -> Dict[str, Any]:
+        return {
+            **self.kanun_index.tombstone_durumu(),
+            'compaction_calisiyor': self.compaction_calisiyor(),
+            'compaction_orani': self.compaction_orani,
+            'son_compaction': self.son_compaction
+        }
@@ -0,0 +1,1907 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kanun Arama İndeksi
+Yüklenen kanunları sütunlu (columnar) bir yapıda tutar ve soruları bu yapı üzerinde arar.
+Başlık ve URL'ler tekilleştirilmiş tablolarda tutulur; ham kanun metinleri sıkıştırılmış
+depoda saklanır ve madde metinleri ofsetlerle yalnızca gerektiğinde kesilir. Sonuç sözlükleri
+yalnızca en iyi sonuçlar için oluşturulur. Aynı metne sahip maddeler (mülga notları, standart
+yürürlük/yürütme maddeleri) tek bir vektörle temsil edilir ve sonuçta tüm konumlarına açılır.
+Madde vektörleri kanun başlığını içermez; sorgunun kanun başlığıyla benzerliği skorlamada madde
+benzerliğine baslik_agirligi oranında karıştırılır.
+Kitap/kısım/bölüm başlıkları kanun başına bir bölüm ağacı olarak sütunlarda tutulur. Maddeler
+arasındaki atıflar build() sırasında çıkarılır ve CSR komşuluk dizileri olarak saklanır.
+Madde metinlerindeki değişiklik notları (değişik/ek/mülga/iptal) madde başına CSR dizilerinde,
+tarih aralığı sorguları için tarihe göre sıralı bir dizide ve mülga maddeler bir bitmap'te tutulur.
+Kanun seçici için başlık kelimeleri üzerinde bir önek indeksi, yazım hatalı kanun adları için de
+bir trigram indeksi build() sırasında hazırlanır. Sayfalı aramalarda sıralanmış aday listesi sorgu ve
+indeks sürümüyle önbelleğe alınır; sonraki sayfalar yeniden skorlanmadan bu listeden kesilir.
+Tek bir kanun çalışan indekse eklenebilir, güncellenebilir veya silinebilir: güncelleme indeksin gölge
+bir kopyasında yapılır ve okuma/yazma kilidi altında yerine konur; eski satırlar compaction'a kadar
+tombstone olarak kalır.
+İsteğe bağlı int8 modunda madde vektörleri vektör başına ölçekle int8 kodlara indirilir: ilk aşama
+skorlama kodlar üzerinde yapılır, en iyi adaylar diskteki float32 vektörlerle yeniden skorlanır.
+Cevaplar istenen alanlara daraltılabilir; snippet modunda tam metin yerine maddenin sorguyla en çok
+eşleşen penceresi, benzersiz metin başına tutulan kelime ofsetlerinden vurgularıyla birlikte döner.
+"""
+
+import copy
+import datetime
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from functools import wraps
+from typing import List, Dict, Any, Optional, Callable, Tuple
+import numpy as np
+from kanun_text_store import KanunTextStore
+from kanun_atif import extract_atiflar
+from kanun_degisiklik import extract_degisiklikler, is_mulga, DEGISIKLIK_TURLERI, KAPSAMLAR
+from kanun_baslik_arama import BaslikOnekIndeksi, BaslikTrigramIndeksi, kisaltma_cikar
+from kanun_sayfalama import SiralamaOnbellegi
+from kanun_guncelleme import OkumaYazmaKilidi
+from kanun_snippet import KelimeOfsetleri
+
+# Madde türleri (sütunlarda indeks olarak tutulur)
+MADDE_TURLERI = ('normal', 'gecici', 'ek')
+
+# int8 skorlamada kodların float32'ye açıldığı blok (384 boyutta ~768 KB, L2 önbelleğe sığar)
+NICEM_BLOK_SATIRI = 512
+
+# Cevaplarda seçilebilen alanlar (fields); diger_konumlar tekrar_sayisi'ni de kapsar
+SONUC_ALANLARI = ('kanun_no', 'baslik', 'madde_no', 'madde_turu', 'madde_basligi', 'bolum_yolu', 'mulga',
+                  'yayim_tarihi', 'gist_url', 'text', 'snippet', 'similarity_score', 'diger_konumlar')
+
+# Maddeyi /kanunlar/{kanun_no}/maddeler/{madde_no} ile getirmek için her zaman dönen alanlar
+KIMLIK_ALANLARI = ('kanun_no', 'madde_no', 'madde_turu')
+
+
+def _okur(metod):
+    """Metodu indeksin okuma kilidi altında çalıştırır (canlı güncellemelerle tutarlı okuma)"""
+    @wraps(metod)
+    def sarici(self, *args, **kwargs):
+        with self._kilit.okuma():
+            return metod(self, *args, **kwargs)
+    return sarici
+
+
+def _suz(sutun: array, indeksler: np.ndarray, degerler: Optional[np.ndarray] = None) -> array:
+    """Sütunun verilen satırlarından (veya verilen değerlerden) aynı türde yeni bir sütun oluşturur"""
+    if degerler is None:
+        degerler = np.array(sutun, dtype=np.dtype(sutun.typecode))[indeksler]
+    yeni = array(sutun.typecode)
+    yeni.frombytes(np.ascontiguousarray(degerler, dtype=np.dtype(sutun.typecode)).tobytes())
+    return yeni
+
+
+def _tampona_ekle(tampon: Optional[np.ndarray], dolu: Optional[np.ndarray], yeni: np.ndarray):
+    """Satırları kapasitesi ikiye katlanarak büyüyen tamponun sonuna ekler; (tampon, dolu kısım) döndürür
+
+    Dolu kısmın ötesine yazıldığı için eski görünümü okuyanlar etkilenmez.
+    """
+    if dolu is None or not len(dolu):
+        return yeni, yeni
+    n = len(dolu)
+    gereken = n + len(yeni)
+    if tampon is None or len(tampon) < gereken:
+        buyuk = np.empty((max(gereken, 2 * n),) + yeni.shape[1:], dtype=yeni.dtype)
+        buyuk[:n] = dolu
+        tampon = buyuk
+    tampon[n:gereken] = yeni
+    return tampon, tampon[:gereken]
+
+
+def parse_tarih(tarih: str, dogrula: bool = True) -> int:
+    """"dd.mm.yyyy" veya "yyyy-mm-dd" tarihini yyyymmdd tamsayısına çevirir
+
+    dogrula=False yalnızca biçime bakar; kanun metinlerindeki "00.00.2002" gibi eksik tarihler için.
+    """
+    match = re.fullmatch(r'(\d{2})\.(\d{2})\.(\d{4})', tarih.strip())
+    if match:
+        gun, ay, yil = match.groups()
+    else:
+        match = re.fullmatch(r'(\d{4})-(\d{2})-(\d{2})', tarih.strip())
+        if not match:
+            raise ValueError(f"Geçersiz tarih: {tarih} (beklenen biçim: gg.aa.yyyy)")
+        yil, ay, gun = match.groups()
+    if dogrula:
+        try:
+            datetime.date(int(yil), int(ay), int(gun))
+        except ValueError:
+            raise ValueError(f"Geçersiz tarih: {tarih}")
+    return int(yil) * 10000 + int(ay) * 100 + int(gun)
+
+
+def format_tarih(tarih: int) -> str:
+    """yyyymmdd tamsayısını "dd.mm.yyyy" biçimine çevirir"""
+    return f"{tarih % 100:02d}.{tarih // 100 % 100:02d}.{tarih // 10000}"
+
+
+def normalize_metin(metin: str) -> str:
+    """Tekilleştirme için metni küçük harfe çevirir ve boşlukları sadeleştirir"""
+    return re.sub(r'\s+', ' ', metin.casefold()).strip()
+
+
+def metin_hash(metin: str) -> bytes:
+    """Normalize edilmiş metnin içerik hash'ini döndürür"""
+    return hashlib.blake2b(normalize_metin(metin).encode('utf-8'), digest_size=16).digest()
+
+
+class KanunKaydi:
+    """Tek bir kanunun indeksteki özet kaydı"""
+    __slots__ = ('kanun_no', 'baslik_id', 'yayim_tarihi', 'url_id', 'satir_baslangic', 'satir_bitis',
+                 'bolum_baslangic', 'bolum_bitis', 'icerik_ozeti', 'metin_blok_id')
+
+    def __init__(self, kanun_no: str, baslik_id: int, yayim_tarihi: Optional[str], url_id: int,
+                 satir_baslangic: int, satir_bitis: int, bolum_baslangic: int = 0, bolum_bitis: int = 0,
+                 icerik_ozeti: bytes = b'', metin_blok_id: int = -1):
+        self.kanun_no = kanun_no
+        self.baslik_id = baslik_id
+        self.yayim_tarihi = yayim_tarihi
+        self.url_id = url_id
+        self.satir_baslangic = satir_baslangic
+        self.satir_bitis = satir_bitis
+        # Kanunun bölümleri [bolum_baslangic, bolum_bitis) aralığındaki bölüm id'leridir
+        self.bolum_baslangic = bolum_baslangic
+        self.bolum_bitis = bolum_bitis
+        # Ham metnin hash'i (indeks etiketi için)
+        self.icerik_ozeti = icerik_ozeti
+        # Ham metnin metin deposundaki blok id'si
+        self.metin_blok_id = metin_blok_id
+
+
+class KanunIndex:
+    def __init__(self, min_similarity: float = 0.1, text_store: Optional[KanunTextStore] = None,
+                 aday_kanun_sayisi: int = 0, nicem_vektorler: bool = False, yeniden_skorlama_sayisi: int = 200,
+                 baslik_agirligi: float = 0.2):
+        self.min_similarity = min_similarity
+        self.model = None
+
+        # Her build'de artan indeks sürümü ve yüklenen içerikten türetilen etiket (HTTP ETag'leri için);
+        # etiket aynı içerikle yeniden başlatılan veya çoğaltılan sunucularda aynıdır
+        self.surum = 0
+        self.etiket = ''
+
+        # Arama aşamalarının sürelerini alan opsiyonel geri çağırma: (aşama, saniye)
+        self.asama_gozlemci: Optional[Callable[[str, float], None]] = None
+
+        # İki aşamalı arama için aday kanun sayısı (M); 0 ise tüm maddeler skorlanır
+        self.aday_kanun_sayisi = aday_kanun_sayisi
+
+        # Skor = (1 - w) * madde benzerliği + w * kanun başlığı benzerliği (0 ise yalnızca madde)
+        self.baslik_agirligi = baslik_agirligi
+
+        # Aynı metni paylaşan maddelerden cevapta listelenecek en fazla konum sayısı
+        self.max_diger_konum = 20
+
+        # Atıf genişletmesinde bir sonuca eklenecek en fazla madde sayısı
+        self.max_atif = 10
+
+        # Snippet penceresinin kelime sayısı
+        self.snippet_kelime_sayisi = 40
+
+        # Sayfalı aramada önbelleğe alınan en az aday sayısı ve sıralanmış aday listeleri önbelleği
+        self.sayfa_derinligi = 100
+        self.siralama_onbellegi = SiralamaOnbellegi()
+
+        # Ham kanun metinleri (kanunun blok id'si KanunKaydi.metin_blok_id'de)
+        self.text_store = text_store if text_store is not None else KanunTextStore()
+
+        # Tekilleştirilmiş tablolar
+        self.basliklar: List[str] = []
+        self.urls: List[str] = []
+        self._baslik_ids: Dict[str, int] = {}
+        self._url_ids: Dict[str, int] = {}
+
+        # Bölüm adları, bölüm başlıkları ve madde başlıkları için tekilleştirilmiş tablo
+        self.bolum_metinleri: List[str] = []
+        self._bolum_metin_ids: Dict[str, int] = {}
+
+        # Kanun kayıtları (kanun id = listedeki sıra)
+        self.kanunlar: List[KanunKaydi] = []
+
+        # Bölüm ağacı sütunları (bölüm id = satır numarası; ebeveynler çocuklardan önce gelir)
+        # Her bölüm, maddelerinin [satir_baslangic, satir_bitis) aralığını kapsar
+        self.bolum_kanun_ids = array('i')
+        self.bolum_ust_ids = array('i')
+        self.bolum_ad_ids = array('i')
+        self.bolum_baslik_ids = array('i')
+        self.bolum_satir_baslangic = array('i')
+        self.bolum_satir_bitis = array('i')
+
+        # Madde sütunları (madde id = satır numarası)
+        # Metin ofsetleri kanunun ham metni içindeki karakter konumlarıdır
+        self.madde_kanun_ids = array('i')
+        self.madde_nolari = array('i')
+        self.madde_turleri = array('b')
+        self.metin_baslangic = array('q')
+        self.metin_bitis = array('q')
+        self.madde_bolum_ids = array('i')
+        self.madde_baslik_ids = array('i')
+
+        # İçerik tekilleştirme: her satırın vektör id'si, her vektörün ilk satırı ve metin hash'i
+        self.madde_vektor_ids = array('i')
+        self.vektor_ilk_satir = array('i')
+        self.vektor_hashleri: List[bytes] = []
+        self._metin_hash_ids: Dict[bytes, int] = {}
+        # Snippet'ler için benzersiz metin başına kelime ofsetleri (metin id = vektör id; metin vektörün ilk satırı)
+        self.kelime_ofsetleri = KelimeOfsetleri()
+
+        # Benzersiz metin başına bir satır (vektör id = satır numarası). Canlı güncellemelerde yeni
+        # vektörler kapasitesi ikiye katlanarak büyüyen tampona eklenir; embeddings dolu kısmın görünümüdür
+        self.embeddings: Optional[np.ndarray] = None
+        self._embedding_tamponu: Optional[np.ndarray] = None
+        self.dedup_raporu: Dict[str, Any] = {}
+
+        # int8 nicemleme: ilk aşama vektör başına simetrik int8 kodlarla skorlanır, en iyi
+        # yeniden_skorlama_sayisi aday float32 vektörlerle tam skorlanır. Bu modda float32 vektörler
+        # diskteki geçici dosyadan mmap ile okunur; bellekte yalnızca kodlar ve ölçekler tutulur
+        self.nicem_vektorler = nicem_vektorler
+        self.yeniden_skorlama_sayisi = yeniden_skorlama_sayisi
+        self._nicem_kodlari: Optional[np.ndarray] = None
+        self._nicem_olcekleri: Optional[np.ndarray] = None
+        self._nicem_tamponu: Optional[np.ndarray] = None
+        self._olcek_tamponu: Optional[np.ndarray] = None
+        self._embedding_dosyasi = None
+
+        # Metin hash'i -> ham atıflar / (değişiklik olayları, mülga); türetilmiş yapılar canlı
+        # güncellemelerde metinler yeniden ayrıştırılmadan kurulur
+        self._atif_onbellegi: Dict[bytes, list] = {}
+        self._degisiklik_onbellegi: Dict[bytes, tuple] = {}
+
+        # Canlı güncellemeler: silinen veya yenisiyle değiştirilen kanunlar tombstone olarak işaretlenir;
+        # satırları compaction'a kadar dizilerde kalır ama aramalardan ve listelerden çıkarılır
+        self._silinen_kanunlar: set = set()
+        self._silinmis_kanun_mask = np.zeros(0, dtype=bool)
+        self._canli_satir_mask: Optional[np.ndarray] = None
+        self.tombstone_satir_sayisi = 0
+        # Aramalar okuma kilidiyle, güncellemelerin dizileri değiştiren kısmı yazma kilidiyle çalışır;
+        # güncellemeler kendi aralarında sıralıdır
+        self._kilit = OkumaYazmaKilidi()
+        self._guncelleme_kilidi = threading.Lock()
+
+        # Filtreler için build() sırasında hazırlanan sütunlar
+        self._kanun_ids: Dict[str, int] = {}
+        # Kanun listesinin keyset sayfalaması için kanun_no sırası
+        self._sirali_kanun_nolari: List[str] = []
+        self._kanun_no_sirasi: List[int] = []
+        self._kanun_tarihleri = np.zeros(0, dtype=np.int32)
+        self._kanun_satir_baslangic = np.zeros(0, dtype=np.int64)
+        self._kanun_satir_bitis = np.zeros(0, dtype=np.int64)
+        self._satir_kanun_ids = np.zeros(0, dtype=np.int32)
+        self._tur_bitmaps: Dict[int, np.ndarray] = {}
+        self._satir_vektor_ids = np.zeros(0, dtype=np.int32)
+        self._vektor_satir_ptr = np.zeros(1, dtype=np.int32)
+        self._vektor_satirlari = np.zeros(0, dtype=np.int32)
+
+        # Atıf grafiği (CSR): satır r'nin atıfları _atif_*[_atif_ptr[r]:_atif_ptr[r + 1]]
+        # Hedef kanun yüklü değilse kanun id -1, madde bulunamadıysa veya atıf kanunun tamamınaysa satır -1
+        self._atif_ptr = np.zeros(1, dtype=np.int32)
+        self._atif_hedef_kanun_ids = np.zeros(0, dtype=np.int32)
+        self._atif_hedef_kanun_nolari = np.zeros(0, dtype=np.int32)
+        self._atif_hedef_turleri = np.zeros(0, dtype=np.int8)
+        self._atif_hedef_maddeler = np.zeros(0, dtype=np.int32)
+        self._atif_hedef_satirlar = np.zeros(0, dtype=np.int32)
+        # Ters yön: bir maddeye ve bir kanuna atıf yapan satırlar
+        self._atif_ters_ptr = np.zeros(1, dtype=np.int32)
+        self._atif_ters_kaynaklar = np.zeros(0, dtype=np.int32)
+        self._kanun_atif_ptr = np.zeros(1, dtype=np.int32)
+        self._kanun_atif_kaynaklar = np.zeros(0, dtype=np.int32)
+
+        # Değişiklik geçmişi (CSR): satır r'nin olayları _degisiklik_*[_degisiklik_ptr[r]:_degisiklik_ptr[r + 1]]
+        # Resmî Gazete sayısı, değiştiren kanun ve madde bilinmiyorsa 0
+        self._degisiklik_ptr = np.zeros(1, dtype=np.int32)
+        self._degisiklik_satirlari = np.zeros(0, dtype=np.int32)
+        self._degisiklik_tarihleri = np.zeros(0, dtype=np.int32)
+        self._degisiklik_turleri = np.zeros(0, dtype=np.int8)
+        self._degisiklik_kapsamlari = np.zeros(0, dtype=np.int8)
+        self._degisiklik_rg_sayilari = np.zeros(0, dtype=np.int32)
+        self._degisiklik_kanun_nolari = np.zeros(0, dtype=np.int32)
+        self._degisiklik_kanun_maddeleri = np.zeros(0, dtype=np.int32)
+        # Tarih aralığı sorguları için tarihe göre sıralı olay id'leri ve tarihleri
+        self._degisiklik_tarih_sirasi = np.zeros(0, dtype=np.int32)
+        self._sirali_degisiklik_tarihleri = np.zeros(0, dtype=np.int32)
+        # Tamamı yürürlükten kaldırılmış veya iptal edilmiş maddeler
+        self._mulga_mask = np.zeros(0, dtype=bool)
+        self._mulga_satirlari = np.zeros(0, dtype=np.int32)
+
+        # Kanun başlıkları, numaraları ve kısaltmaları üzerinde önek indeksi (typeahead)
+        self.baslik_onek_indeksi = BaslikOnekIndeksi()
+        # Yazım hatalı kanun adları için trigram indeksi
+        self.baslik_trigram_indeksi = BaslikTrigramIndeksi()
+        # Bir kanun adının kanun_no'ya çözülmesi için gereken en düşük benzerlik
+        self.min_ad_benzerligi = 0.75
+
+        # Kaba arama için kanun düzeyinde embedding'ler
+        self.kanun_centroids: Optional[np.ndarray] = None
+        self.baslik_embeddings: Optional[np.ndarray] = None
+        self._kanun_baslik_ids = np.zeros(0, dtype=np.int32)
+
+    @property
+    def kanun_sayisi(self) -> int:
+        return len(self.kanunlar)
+
+    @property
+    def canli_kanun_sayisi(self) -> int:
+        return len(self.kanunlar) - len(self._silinen_kanunlar)
+
+    @property
+    def madde_sayisi(self) -> int:
+        return len(self.madde_nolari)
+
+    @property
+    def vektor_sayisi(self) -> int:
+        return len(self.vektor_ilk_satir)
+
+    @property
+    def bolum_sayisi(self) -> int:
+        return len(self.bolum_kanun_ids)
+
+    def _intern(self, value: str, table: List[str], ids: Dict[str, int]) -> int:
+        """Değeri tabloya bir kez ekler ve id'sini döndürür"""
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = len(table)
+            table.append(value)
+            ids[value] = value_id
+        return value_id
+
+    def _intern_bolum_metni(self, value: Optional[str]) -> int:
+        """Bölüm/madde başlığını tabloya ekler (None için -1)"""
+        return -1 if value is None else self._intern(value, self.bolum_metinleri, self._bolum_metin_ids)
+
+    def _add_bolumler(self, kanun_id: int, acik_bolumler: List, bolum_yolu: List[Dict[str, str]]) -> int:
+        """Maddenin bölüm yoluna göre açık bölümleri kapatır/yenilerini açar ve en alt bölüm id'sini döndürür"""
+        satir = len(self.madde_nolari)
+        anahtarlar = [(bolum['ad'], bolum['baslik']) for bolum in bolum_yolu]
+
+        # Ortak önekten sonraki açık bölümleri kapat
+        ortak = 0
+        while ortak < min(len(acik_bolumler), len(anahtarlar)) and acik_bolumler[ortak][0] == anahtarlar[ortak]:
+            ortak += 1
+        for _, bolum_id in acik_bolumler[ortak:]:
+            self.bolum_satir_bitis[bolum_id] = satir
+        del acik_bolumler[ortak:]
+
+        # Yeni bölümleri aç
+        for ad, baslik in anahtarlar[ortak:]:
+            bolum_id = len(self.bolum_kanun_ids)
+            self.bolum_kanun_ids.append(kanun_id)
+            self.bolum_ust_ids.append(acik_bolumler[-1][1] if acik_bolumler else -1)
+            self.bolum_ad_ids.append(self._intern_bolum_metni(ad))
+            self.bolum_baslik_ids.append(self._intern_bolum_metni(baslik))
+            self.bolum_satir_baslangic.append(satir)
+            self.bolum_satir_bitis.append(satir)
+            acik_bolumler.append(((ad, baslik), bolum_id))
+
+        return acik_bolumler[-1][1] if acik_bolumler else -1
+
+    def add_kanun(self, kanun: Dict[str, Any]):
+        """Parse edilmiş bir kanunu indekse ekler (full_content sıkıştırılmış depoya yazılır)"""
+        kanun_id = len(self.kanunlar)
+        satir_baslangic = len(self.madde_nolari)
+        bolum_baslangic = self.bolum_sayisi
+        acik_bolumler = []
+        metin_blok_id = self.text_store.add(kanun['full_content'])
+
+        for madde in kanun['maddeler']:
+            self.madde_bolum_ids.append(self._add_bolumler(kanun_id, acik_bolumler, madde.get('bolum_yolu') or []))
+            self.madde_baslik_ids.append(self._intern_bolum_metni(madde.get('madde_basligi')))
+
+            # Aynı normalize metin daha önce görüldüyse vektörünü paylaş
+            metin_id = metin_hash(madde['icerik'])
+            vektor_id = self._metin_hash_ids.get(metin_id)
+            if vektor_id is None:
+                vektor_id = len(self.vektor_ilk_satir)
+                self._metin_hash_ids[metin_id] = vektor_id
+                self.vektor_ilk_satir.append(len(self.madde_nolari))
+                self.vektor_hashleri.append(metin_id)
+                self.kelime_ofsetleri.ekle(madde['icerik'])
+            self.madde_vektor_ids.append(vektor_id)
+
+            self.madde_kanun_ids.append(kanun_id)
+            self.madde_nolari.append(madde['madde_no'])
+            self.madde_turleri.append(MADDE_TURLERI.index(madde.get('madde_turu', 'normal')))
+            self.metin_baslangic.append(madde['baslangic'])
+            self.metin_bitis.append(madde['bitis'])
+
+        # Kanunun sonunda açık kalan bölümleri kapat
+        for _, bolum_id in acik_bolumler:
+            self.bolum_satir_bitis[bolum_id] = len(self.madde_nolari)
+
+        self.kanunlar.append(KanunKaydi(
+            kanun_no=kanun['kanun_no'],
+            baslik_id=self._intern(kanun['baslik'], self.basliklar, self._baslik_ids),
+            yayim_tarihi=kanun['yayim_tarihi'],
+            url_id=self._intern(kanun.get('gist_url') or '', self.urls, self._url_ids),
+            satir_baslangic=satir_baslangic,
+            satir_bitis=len(self.madde_nolari),
+            bolum_baslangic=bolum_baslangic,
+            bolum_bitis=self.bolum_sayisi,
+            icerik_ozeti=hashlib.blake2b(kanun['full_content'].encode('utf-8'), digest_size=16).digest(),
+            metin_blok_id=metin_blok_id
+        ))
+
+    def get_madde_icerik(self, row: int) -> str:
+        """Madde metnini kanunun sıkıştırılmış ham metninden keserek döndürür"""
+        return self.text_store.get_text(self._metin_blok_id(row), self.metin_baslangic[row], self.metin_bitis[row])
+
+    def _metin_blok_id(self, row: int) -> int:
+        """Satırın kanununun metin deposundaki blok id'si"""
+        return self.kanunlar[self.madde_kanun_ids[row]].metin_blok_id
+
+    @_okur
+    def get_madde_text(self, row: int) -> str:
+        """Cevaplarda kullanılan madde metnini oluşturur"""
+        kanun = self.kanunlar[self.madde_kanun_ids[row]]
+        return f"Kanun: {self.basliklar[kanun.baslik_id]}\nMadde {self.madde_nolari[row]}: {self.get_madde_icerik(row)}"
+
+    def _build_filter_columns(self):
+        """Filtreleme için kanun satır aralıklarını, tamsayı tarihleri ve tür bitmap'lerini hazırlar"""
+        canli_kanunlar = [kanun_id for kanun_id in range(self.kanun_sayisi) if kanun_id not in self._silinen_kanunlar]
+        self._kanun_ids = {self.kanunlar[kanun_id].kanun_no: kanun_id for kanun_id in canli_kanunlar}
+        self._kanun_no_sirasi = sorted(canli_kanunlar, key=lambda kanun_id: self.kanunlar[kanun_id].kanun_no)
+        self._sirali_kanun_nolari = [self.kanunlar[kanun_id].kanun_no for kanun_id in self._kanun_no_sirasi]
+        self._kanun_tarihleri = np.array(
+            [parse_tarih(kanun.yayim_tarihi, dogrula=False) if kanun.yayim_tarihi else 0 for kanun in self.kanunlar],
+            dtype=np.int32
+        )
+        self._kanun_satir_baslangic = np.array([kanun.satir_baslangic for kanun in self.kanunlar], dtype=np.int64)
+        self._kanun_satir_bitis = np.array([kanun.satir_bitis for kanun in self.kanunlar], dtype=np.int64)
+        self._satir_kanun_ids = np.array(self.madde_kanun_ids, dtype=np.int32)
+
+        # Tombstone'lar: silinen kanunların satırları
+        self._silinmis_kanun_mask = np.zeros(self.kanun_sayisi, dtype=bool)
+        self._silinmis_kanun_mask[list(self._silinen_kanunlar)] = True
+        self._canli_satirlari_kur()
+
+        turler = np.array(self.madde_turleri, dtype=np.int8)
+        self._tur_bitmaps = {tur: turler == tur for tur in range(len(MADDE_TURLERI))}
+
+        self._satir_vektor_ids = np.array(self.madde_vektor_ids, dtype=np.int32)
+        self._vektor_csr_kur()
+
+    def _canli_satirlari_kur(self):
+        """Silinmiş kanun maskesinden canlı satır maskesini kurar (tombstone yoksa None)"""
+        self._canli_satir_mask = None
+        self.tombstone_satir_sayisi = 0
+        if self._silinen_kanunlar:
+            self._canli_satir_mask = ~self._silinmis_kanun_mask[self._satir_kanun_ids]
+            self.tombstone_satir_sayisi = int(self.madde_sayisi - self._canli_satir_mask.sum())
+
+    def _vektor_csr_kur(self):
+        """Vektör -> canlı satırlar eşlemesi (CSR): bir vektörün satırları _vektor_satirlari[ptr[v]:ptr[v + 1]]"""
+        if self._canli_satir_mask is None:
+            canli_satirlar = np.arange(self.madde_sayisi, dtype=np.int32)
+        else:
+            canli_satirlar = np.flatnonzero(self._canli_satir_mask).astype(np.int32)
+        canli_vektor_ids = self._satir_vektor_ids[canli_satirlar]
+        self._vektor_satirlari = canli_satirlar[np.argsort(canli_vektor_ids, kind='stable')]
+        self._vektor_satir_ptr = np.zeros(self.vektor_sayisi + 1, dtype=np.int32)
+        np.cumsum(np.bincount(canli_vektor_ids, minlength=self.vektor_sayisi), out=self._vektor_satir_ptr[1:])
+
+    def _filtre_guncelle(self, eski_id: Optional[int], onceki_satir: int, onceki_kanun: int):
+        """Filtre sütunlarını tombstone'lanan kanun ve sona eklenen kanunun satırları için günceller
+
+        Numpy dizileri gölgeyle paylaşıldığından yerinde değiştirilmez, yenileriyle değiştirilir.
+        """
+        if eski_id is not None:
+            eski_no = self.kanunlar[eski_id].kanun_no
+            if self._kanun_ids.get(eski_no) == eski_id:
+                del self._kanun_ids[eski_no]
+            sira = self._kanun_no_sirasi.index(eski_id)
+            del self._kanun_no_sirasi[sira]
+            del self._sirali_kanun_nolari[sira]
+
+        yeni_kanunlar = self.kanunlar[onceki_kanun:]
+        for kanun_id, kanun in enumerate(yeni_kanunlar, onceki_kanun):
+            self._kanun_ids[kanun.kanun_no] = kanun_id
+            # Aynı numaralılar arasında en büyük id sona (build'deki kararlı sıralamayla aynı)
+            sira = bisect_right(self._sirali_kanun_nolari, kanun.kanun_no)
+            self._kanun_no_sirasi.insert(sira, kanun_id)
+            self._sirali_kanun_nolari.insert(sira, kanun.kanun_no)
+        self._kanun_tarihleri = np.concatenate([self._kanun_tarihleri, np.array(
+            [parse_tarih(kanun.yayim_tarihi, dogrula=False) if kanun.yayim_tarihi else 0 for kanun in yeni_kanunlar],
+            dtype=np.int32)])
+        self._kanun_satir_baslangic = np.concatenate([
+            self._kanun_satir_baslangic, np.array([kanun.satir_baslangic for kanun in yeni_kanunlar], dtype=np.int64)])
+        self._kanun_satir_bitis = np.concatenate([
+            self._kanun_satir_bitis, np.array([kanun.satir_bitis for kanun in yeni_kanunlar], dtype=np.int64)])
+        self._satir_kanun_ids = np.concatenate([
+            self._satir_kanun_ids, np.array(self.madde_kanun_ids[onceki_satir:], dtype=np.int32)])
+
+        self._silinmis_kanun_mask = np.concatenate([self._silinmis_kanun_mask, np.zeros(len(yeni_kanunlar), dtype=bool)])
+        if eski_id is not None:
+            self._silinmis_kanun_mask[eski_id] = True
+        self._canli_satirlari_kur()
+
+        turler = np.array(self.madde_turleri[onceki_satir:], dtype=np.int8)
+        self._tur_bitmaps = {tur: np.concatenate([bitmap, turler == tur]) for tur, bitmap in self._tur_bitmaps.items()}
+
+        self._satir_vektor_ids = np.concatenate([
+            self._satir_vektor_ids, np.array(self.madde_vektor_ids[onceki_satir:], dtype=np.int32)])
+        self._vektor_csr_kur()
+
+    def _canli_satir_listesi(self) -> List[bool]:
+        """Satırların tombstone'lu olup olmadığını Python döngüleri için liste olarak döndürür"""
+        if self._canli_satir_mask is None:
+            return [True] * self.madde_sayisi
+        return self._canli_satir_mask.tolist()
+
+    def _madde_satirlari(self) -> Dict[tuple, int]:
+        """(kanun id, madde türü, madde no) -> ilk satır eşlemesini oluşturur"""
+        satirlar = {}
+        for row, canli in enumerate(self._canli_satir_listesi()):
+            if not canli:
+                continue
+            satirlar.setdefault((self.madde_kanun_ids[row], self.madde_turleri[row], self.madde_nolari[row]), row)
+        return satirlar
+
+    def _kanun_madde_satirlari(self, kanun_id: int) -> Dict[tuple, int]:
+        """Tek bir kanun için (madde türü, madde no) -> ilk satır eşlemesi"""
+        satirlar = {}
+        kanun = self.kanunlar[kanun_id]
+        for row in range(kanun.satir_baslangic, kanun.satir_bitis):
+            satirlar.setdefault((self.madde_turleri[row], self.madde_nolari[row]), row)
+        return satirlar
+
+    def _satir_atiflari(self, row: int, madde_bul: Callable[[int, int, int], int]):
+        """Satırın çözülmüş atıflarını (kanun id, kanun no, tür id, madde no, hedef satır) olarak üretir"""
+        # Aynı metni paylaşan satırlar için atıflar bir kez çıkarılır (önbellek güncellemeler arasında kalır)
+        metin_id = self.vektor_hashleri[self.madde_vektor_ids[row]]
+        atiflar = self._atif_onbellegi.get(metin_id)
+        if atiflar is None:
+            atiflar = self._atif_onbellegi[metin_id] = extract_atiflar(self.get_madde_icerik(row))
+
+        kaynak_kanun_id = self.madde_kanun_ids[row]
+        for kanun_no, tur, madde_no in atiflar:
+            kanun_id = kaynak_kanun_id if kanun_no is None else self._resolve_kanun_id(str(kanun_no))
+            tur_id = MADDE_TURLERI.index(tur)
+            hedef = -1
+            if kanun_id is not None and madde_no:
+                hedef = madde_bul(kanun_id, tur_id, madde_no)
+            if hedef == row:
+                continue
+            yield -1 if kanun_id is None else kanun_id, kanun_no or 0, tur_id, madde_no, hedef
+
+    def _build_atif_grafi(self):
+        """Madde metinlerindeki atıfları çözer ve ileri/ters CSR komşuluk dizilerini oluşturur"""
+        madde_satirlari = self._madde_satirlari()
+
+        def madde_bul(kanun_id, tur_id, madde_no):
+            return madde_satirlari.get((kanun_id, tur_id, madde_no), -1)
+
+        ptr = np.zeros(self.madde_sayisi + 1, dtype=np.int32)
+        hedefler = []
+        canli = self._canli_satir_listesi()
+        for row in range(self.madde_sayisi):
+            if canli[row]:
+                hedefler.extend(self._satir_atiflari(row, madde_bul))
+            ptr[row + 1] = len(hedefler)
+
+        self._atif_ptr = ptr
+        self._atif_dizilerini_ata(self._atif_dizileri(hedefler))
+        self._atif_tersleri_kur()
+
+        cozulen = int((self._atif_hedef_satirlar >= 0).sum())
+        print(f"Atıf grafiği: {len(hedefler)} atıf, {cozulen} tanesi yüklü bir maddeye çözüldü.")
+
+    @staticmethod
+    def _atif_dizileri(hedefler: List[tuple]) -> List[np.ndarray]:
+        """(kanun id, kanun no, tür id, madde no, hedef satır) listesini sütun dizilerine çevirir"""
+        sutunlar = list(zip(*hedefler)) if hedefler else [()] * 5
+        return [np.array(sutun, dtype=dtype) for sutun, dtype in
+                zip(sutunlar, (np.int32, np.int32, np.int8, np.int32, np.int32))]
+
+    def _atif_dizilerini_ata(self, diziler: List[np.ndarray]):
+        (self._atif_hedef_kanun_ids, self._atif_hedef_kanun_nolari, self._atif_hedef_turleri,
+         self._atif_hedef_maddeler, self._atif_hedef_satirlar) = diziler
+
+    def _atif_tersleri_kur(self):
+        """İleri atıf dizilerinden madde ve kanun düzeyindeki ters CSR dizilerini kurar"""
+        kaynaklar = np.repeat(np.arange(self.madde_sayisi, dtype=np.int32), np.diff(self._atif_ptr))
+
+        # Ters yön: çözülen madde atıfları hedef satıra göre gruplanır
+        cozulen = self._atif_hedef_satirlar >= 0
+        self._atif_ters_ptr, self._atif_ters_kaynaklar = self._csr(
+            self._atif_hedef_satirlar[cozulen], kaynaklar[cozulen], self.madde_sayisi)
+
+        # Kanun düzeyinde ters yön (kaynak satır başına bir kez)
+        yuklu = self._atif_hedef_kanun_ids >= 0
+        ciftler = np.unique(np.stack([self._atif_hedef_kanun_ids[yuklu], kaynaklar[yuklu]]), axis=1)
+        self._kanun_atif_ptr, self._kanun_atif_kaynaklar = self._csr(ciftler[0], ciftler[1], self.kanun_sayisi)
+
+    def _atif_guncelle(self, eski_id: Optional[int], onceki_satir: int):
+        """Atıf grafiğini tombstone'lanan ve sona eklenen kanun için günceller
+
+        Tombstone'lanan kanunun atıfları çıkarılır, yeni kanunun satırlarının atıfları eklenir. Diğer
+        kanunların atıflarından yalnızca eski kanuna çözülmüş veya hiçbir kanuna çözülememiş olanlar
+        (yeni kanuna çözülebilir) yeniden çözülür.
+        """
+        satir_sozlukleri: Dict[int, Dict[tuple, int]] = {}
+
+        def madde_bul(kanun_id, tur_id, madde_no):
+            sozluk = satir_sozlukleri.get(kanun_id)
+            if sozluk is None:
+                sozluk = satir_sozlukleri[kanun_id] = self._kanun_madde_satirlari(kanun_id)
+            return sozluk.get((tur_id, madde_no), -1)
+
+        ptr = self._atif_ptr.copy()
+        diziler = [self._atif_hedef_kanun_ids, self._atif_hedef_kanun_nolari, self._atif_hedef_turleri,
+                   self._atif_hedef_maddeler, self._atif_hedef_satirlar]
+        if eski_id is not None:
+            eski = self.kanunlar[eski_id]
+            bas, bit = ptr[eski.satir_baslangic], ptr[eski.satir_bitis]
+            diziler = [np.delete(dizi, np.s_[bas:bit]) for dizi in diziler]
+            ptr[eski.satir_baslangic + 1:eski.satir_bitis + 1] = bas
+            ptr[eski.satir_bitis + 1:] -= bit - bas
+        kanun_ids, kanun_nolari, turler, maddeler, satirlar = [dizi.copy() for dizi in diziler]
+
+        # Hedefi değişebilecek atıflar, kanun numarası başına bir kez çözülür
+        adaylar = (kanun_ids < 0) & (kanun_nolari > 0)
+        if eski_id is not None:
+            adaylar |= kanun_ids == eski_id
+        adaylar = np.flatnonzero(adaylar)
+        if len(adaylar):
+            nolar, ters = np.unique(kanun_nolari[adaylar], return_inverse=True)
+            cozumler = np.array([-1 if kanun_id is None else kanun_id
+                                 for kanun_id in (self._resolve_kanun_id(str(no)) for no in nolar.tolist())],
+                                dtype=np.int32)[ters]
+            degisen = cozumler != kanun_ids[adaylar]
+            for i, kanun_id in zip(adaylar[degisen].tolist(), cozumler[degisen].tolist()):
+                kanun_ids[i] = kanun_id
+                madde_no = int(maddeler[i])
+                satirlar[i] = madde_bul(kanun_id, int(turler[i]), madde_no) if kanun_id >= 0 and madde_no else -1
+
+        hedefler = []
+        yeni_ptr = np.empty(self.madde_sayisi - onceki_satir, dtype=np.int32)
+        for sira, row in enumerate(range(onceki_satir, self.madde_sayisi)):
+            hedefler.extend(self._satir_atiflari(row, madde_bul))
+            yeni_ptr[sira] = ptr[-1] + len(hedefler)
+
+        self._atif_ptr = np.concatenate([ptr, yeni_ptr])
+        self._atif_dizilerini_ata([np.concatenate([dizi, yeni]) for dizi, yeni in
+                                   zip((kanun_ids, kanun_nolari, turler, maddeler, satirlar),
+                                       self._atif_dizileri(hedefler))])
+        self._atif_tersleri_kur()
+
+    def _satir_degisiklikleri(self, row: int):
+        """Satırın değişiklik notlarını ve mülga olup olmadığını döndürür"""
+        # Aynı metni paylaşan satırlar için notlar bir kez ayrıştırılır (önbellek güncellemeler arasında kalır)
+        metin_id = self.vektor_hashleri[self.madde_vektor_ids[row]]
+        kayit = self._degisiklik_onbellegi.get(metin_id)
+        if kayit is None:
+            olaylar = extract_degisiklikler(self.get_madde_icerik(row), self.madde_basligi(row))
+            kayit = self._degisiklik_onbellegi[metin_id] = (olaylar, is_mulga(olaylar))
+        return kayit
+
+    def _degisiklik_sutunlari(self, satir_araligi, canli: Optional[List[bool]] = None):
+        """Satır aralığındaki değişiklik notlarını (ptr, sütun dizileri, mülga maskesi) olarak çıkarır"""
+        ptr = np.zeros(len(satir_araligi) + 1, dtype=np.int32)
+        satirlar, tarihler, turler, kapsamlar = array('i'), array('i'), array('b'), array('b')
+        rg_sayilari, kanun_nolari, kanun_maddeleri = array('i'), array('i'), array('i')
+        mulga_mask = np.zeros(len(satir_araligi), dtype=bool)
+
+        for sira, row in enumerate(satir_araligi):
+            if canli is None or canli[row]:
+                olaylar, mulga_mask[sira] = self._satir_degisiklikleri(row)
+                for olay in olaylar:
+                    satirlar.append(row)
+                    tarihler.append(olay['tarih'])
+                    turler.append(DEGISIKLIK_TURLERI.index(olay['tur']))
+                    kapsamlar.append(KAPSAMLAR.index(olay['kapsam']))
+                    rg_sayilari.append(olay['resmi_gazete_sayisi'] or 0)
+                    kanun_nolari.append(olay['kanun_no'] or 0)
+                    kanun_maddeleri.append(olay['kanun_madde_no'] or 0)
+            ptr[sira + 1] = len(satirlar)
+
+        sutunlar = [np.array(dizi, dtype=dtype) for dizi, dtype in zip(
+            (satirlar, tarihler, turler, kapsamlar, rg_sayilari, kanun_nolari, kanun_maddeleri),
+            (np.int32, np.int32, np.int8, np.int8, np.int32, np.int32, np.int32))]
+        return ptr, sutunlar, mulga_mask
+
+    def _degisiklik_dizileri(self) -> List[np.ndarray]:
+        return [self._degisiklik_satirlari, self._degisiklik_tarihleri, self._degisiklik_turleri,
+                self._degisiklik_kapsamlari, self._degisiklik_rg_sayilari, self._degisiklik_kanun_nolari,
+                self._degisiklik_kanun_maddeleri]
+
+    def _degisiklik_dizilerini_ata(self, ptr: np.ndarray, sutunlar: List[np.ndarray], mulga_mask: np.ndarray):
+        """Değişiklik sütunlarını atar; tarih sırasını ve mülga satırlarını yeniden kurar"""
+        self._degisiklik_ptr = ptr
+        (self._degisiklik_satirlari, self._degisiklik_tarihleri, self._degisiklik_turleri,
+         self._degisiklik_kapsamlari, self._degisiklik_rg_sayilari, self._degisiklik_kanun_nolari,
+         self._degisiklik_kanun_maddeleri) = sutunlar
+
+        self._degisiklik_tarih_sirasi = np.argsort(self._degisiklik_tarihleri, kind='stable').astype(np.int32)
+        self._sirali_degisiklik_tarihleri = self._degisiklik_tarihleri[self._degisiklik_tarih_sirasi]
+        self._mulga_mask = mulga_mask
+        self._mulga_satirlari = np.flatnonzero(mulga_mask).astype(np.int32)
+
+    def _build_degisiklik_gecmisi(self):
+        """Madde metinlerindeki değişiklik notlarını sütunlara, tarih sırasına ve mülga bitmap'ine çevirir"""
+        self._degisiklik_dizilerini_ata(
+            *self._degisiklik_sutunlari(range(self.madde_sayisi), self._canli_satir_listesi()))
+        print(f"Değişiklik geçmişi: {len(self._degisiklik_satirlari)} değişiklik notu, "
+              f"{len(self._mulga_satirlari)} mülga madde.")
+
+    def _degisiklik_guncelle(self, eski_id: Optional[int], onceki_satir: int):
+        """Değişiklik geçmişinden tombstone'lanan kanunun notlarını çıkarır, yeni kanunun notlarını ekler"""
+        ptr, sutunlar, mulga_mask = self._degisiklik_ptr.copy(), self._degisiklik_dizileri(), self._mulga_mask.copy()
+        if eski_id is not None:
+            eski = self.kanunlar[eski_id]
+            bas, bit = ptr[eski.satir_baslangic], ptr[eski.satir_bitis]
+            sutunlar = [np.delete(sutun, np.s_[bas:bit]) for sutun in sutunlar]
+            ptr[eski.satir_baslangic + 1:eski.satir_bitis + 1] = bas
+            ptr[eski.satir_bitis + 1:] -= bit - bas
+            mulga_mask[eski.satir_baslangic:eski.satir_bitis] = False
+
+        yeni_ptr, yeni_sutunlar, yeni_mulga = self._degisiklik_sutunlari(range(onceki_satir, self.madde_sayisi))
+        self._degisiklik_dizilerini_ata(
+            np.concatenate([ptr, yeni_ptr[1:] + ptr[-1]]),
+            [np.concatenate([sutun, yeni]) for sutun, yeni in zip(sutunlar, yeni_sutunlar)],
+            np.concatenate([mulga_mask, yeni_mulga]))
+
+    def _build_baslik_indeksleri(self):
+        """Kanun başlıkları üzerindeki arama indekslerini kanun id'leriyle oluşturur (silinen kanunlar boş kalır)"""
+        basliklar = [None if kanun_id in self._silinen_kanunlar else self.basliklar[kanun.baslik_id]
+                     for kanun_id, kanun in enumerate(self.kanunlar)]
+        self.baslik_onek_indeksi.build(basliklar, [kanun.kanun_no for kanun in self.kanunlar])
+        self.baslik_trigram_indeksi.build(basliklar)
+
+    def _baslik_guncelle(self, eski_id: Optional[int], onceki_kanun: int):
+        """Başlık indekslerinden tombstone'lanan kanunu çıkarır, yeni kanunları ekler"""
+        if eski_id is not None:
+            self.baslik_onek_indeksi.sil(eski_id)
+            self.baslik_trigram_indeksi.sil(eski_id)
+        for kanun in self.kanunlar[onceki_kanun:]:
+            baslik = self.basliklar[kanun.baslik_id]
+            self.baslik_onek_indeksi.ekle(baslik, kanun.kanun_no)
+            self.baslik_trigram_indeksi.ekle(baslik)
+
+    def _csr(self, anahtarlar: np.ndarray, degerler: np.ndarray, boyut: int):
+        """Anahtara göre gruplanmış değerleri (ptr, değerler) CSR dizileri olarak döndürür"""
+        sira = np.argsort(anahtarlar, kind='stable')
+        ptr = np.zeros(boyut + 1, dtype=np.int32)
+        np.cumsum(np.bincount(anahtarlar, minlength=boyut), out=ptr[1:])
+        return ptr, degerler[sira].astype(np.int32)
+
+    def _normalize(self, embeddings: np.ndarray) -> np.ndarray:
+        """Cosine similarity için satırları birim uzunluğa getirir"""
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return embeddings / norms
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """Metinleri batch'ler halinde embedding'e dönüştürür"""
+        parts = []
+        for start in range(0, len(texts), batch_size):
+            parts.append(np.asarray(self.model.encode(texts[start:start + batch_size]), dtype=np.float32))
+        return self._normalize(np.vstack(parts))
+
+    def _build_kanun_embeddings(self, batch_size: int):
+        """Kaba arama için kanun başına madde merkezlerini ve başlık embedding'lerini hesaplar
+
+        Başlık embedding'leri varsa yalnızca tabloya sonradan eklenen başlıklar encode edilir.
+        """
+        self.kanun_centroids = self._kanun_merkezleri(self.kanunlar)
+        self._baslik_embeddinglerini_tamamla(batch_size)
+        self._kanun_baslik_ids = np.array([kanun.baslik_id for kanun in self.kanunlar], dtype=np.int32)
+
+    def _kanun_merkezleri(self, kanunlar: List[KanunKaydi]) -> np.ndarray:
+        """Verilen kanunların madde vektörlerinin normalize edilmiş toplamları"""
+        centroids = np.zeros((len(kanunlar), self.embeddings.shape[1]), dtype=np.float32)
+        for sira, kanun in enumerate(kanunlar):
+            if kanun.satir_bitis > kanun.satir_baslangic:
+                vektorler = self._satir_vektor_ids[kanun.satir_baslangic:kanun.satir_bitis]
+                centroids[sira] = self._yaklasik_vektorler(vektorler).sum(axis=0)
+        return self._normalize(centroids)
+
+    def _baslik_embeddinglerini_tamamla(self, batch_size: int):
+        mevcut = 0 if self.baslik_embeddings is None else len(self.baslik_embeddings)
+        if mevcut < len(self.basliklar):
+            yeni = self._encode(self.basliklar[mevcut:], batch_size)
+            self.baslik_embeddings = yeni if self.baslik_embeddings is None else np.vstack([self.baslik_embeddings, yeni])
+
+    def _yeniden_turet(self, batch_size: int = 256):
+        """Sütunlardan türetilen filtre, atıf, değişiklik, başlık ve kanun embedding yapılarını kurar"""
+        self._build_filter_columns()
+        self._build_atif_grafi()
+        self._build_degisiklik_gecmisi()
+        self._build_baslik_indeksleri()
+        if self.embeddings is not None:
+            self._build_kanun_embeddings(batch_size)
+        self._surumu_ilerlet()
+
+    def _artimli_turet(self, eski_id: Optional[int], onceki_satir: int, onceki_kanun: int, batch_size: int = 256):
+        """Türetilmiş yapıları yalnızca değişen kanun için günceller
+
+        eski_id tombstone'lanan kanun, onceki_satir/onceki_kanun güncellemeden önceki satır ve kanun
+        sayılarıdır (sonrakiler sona eklenen kanuna aittir). Diğer kanunlardan yalnızca atıfları
+        değişen kanuna çözülebilenler yeniden ele alınır.
+        """
+        self._filtre_guncelle(eski_id, onceki_satir, onceki_kanun)
+        self._atif_guncelle(eski_id, onceki_satir)
+        self._degisiklik_guncelle(eski_id, onceki_satir)
+        self._baslik_guncelle(eski_id, onceki_kanun)
+        if self.embeddings is not None:
+            yeni_kanunlar = self.kanunlar[onceki_kanun:]
+            self.kanun_centroids = np.vstack([self.kanun_centroids, self._kanun_merkezleri(yeni_kanunlar)])
+            self._baslik_embeddinglerini_tamamla(batch_size)
+            self._kanun_baslik_ids = np.concatenate([
+                self._kanun_baslik_ids, np.array([kanun.baslik_id for kanun in yeni_kanunlar], dtype=np.int32)])
+        self._surumu_ilerlet()
+
+    def _surumu_ilerlet(self):
+        self.surum += 1
+        self.etiket = self._icerik_etiketi()
+        self.siralama_onbellegi.temizle()
+
+    def build(self, model, batch_size: int = 256):
+        """Tüm maddelerin embedding'lerini bir kez hesaplar"""
+        self.model = model
+        self._embedding_sifirla()
+        self.baslik_embeddings = None
+
+        if self.madde_sayisi:
+            # Her benzersiz metin bir kez embedding'e dönüştürülür
+            print(f"{self.madde_sayisi} madde, {self.vektor_sayisi} benzersiz metin embedding'e dönüştürülüyor...")
+            parts = []
+            for start in range(0, self.vektor_sayisi, batch_size):
+                end = min(start + batch_size, self.vektor_sayisi)
+                texts = [self.get_madde_icerik(self.vektor_ilk_satir[vektor_id]) for vektor_id in range(start, end)]
+                parts.append(np.asarray(model.encode(texts), dtype=np.float32))
+            self._embedding_ekle(self._normalize(np.vstack(parts)))
+
+        self._yeniden_turet(batch_size)
+        if self.embeddings is not None:
+            self._report_dedup()
+            print(f"Snippet ofsetleri: {self.kelime_ofsetleri.kelime_sayisi} kelime, "
+                  f"{self.kelime_ofsetleri.terim_sayisi} terim, {self.kelime_ofsetleri.nbytes / 1e6:.1f} MB")
+
+    def okuma(self):
+        """Birden fazla okumanın aynı indeks durumunu görmesi için okuma kilidi (with bloğu)"""
+        return self._kilit.okuma()
+
+    def _embedding_sifirla(self):
+        self.embeddings = self._embedding_tamponu = None
+        self._nicem_kodlari = self._nicem_tamponu = None
+        self._nicem_olcekleri = self._olcek_tamponu = None
+        # Dosyayı map etmiş eski görünümler dosya kapansa da geçerli kalır
+        self._embedding_dosyasi = None
+
+    def _embedding_ekle(self, vektorler: np.ndarray):
+        """Yeni vektörleri büyüyen tamponların sonuna ekler
+
+        int8 modunda kodlar ve ölçekler bellekteki tamponlara, float32 vektörler diskteki dosyanın
+        sonuna yazılır ve dosya yeniden map edilir.
+        """
+        if not self.nicem_vektorler:
+            self._embedding_tamponu, self.embeddings = _tampona_ekle(self._embedding_tamponu, self.embeddings, vektorler)
+            return
+
+        # Vektör başına simetrik nicemleme (kanun_lexical_index ile aynı şema)
+        olcekler = np.abs(vektorler).max(axis=1) / 127.0
+        olcekler[olcekler == 0] = 1.0
+        kodlar = np.rint(vektorler / olcekler[:, None]).astype(np.int8)
+        self._nicem_tamponu, self._nicem_kodlari = _tampona_ekle(self._nicem_tamponu, self._nicem_kodlari, kodlar)
+        self._olcek_tamponu, self._nicem_olcekleri = _tampona_ekle(
+            self._olcek_tamponu, self._nicem_olcekleri, olcekler.astype(np.float32))
+
+        if self._embedding_dosyasi is None:
+            self._embedding_dosyasi = tempfile.TemporaryFile(prefix='kanun_vektorleri_')
+        n = 0 if self.embeddings is None else len(self.embeddings)
+        dim = vektorler.shape[1]
+        self._embedding_dosyasi.seek(n * dim * 4)
+        self._embedding_dosyasi.write(np.ascontiguousarray(vektorler, dtype=np.float32).tobytes())
+        self._embedding_dosyasi.flush()
+        self.embeddings = np.memmap(self._embedding_dosyasi, dtype=np.float32, mode='r', shape=(n + len(vektorler), dim))
+
+    def nicemle(self, acik: bool = True):
+        """Embedding'leri int8 kodlu (acik) veya yalnızca float32 bellek düzenine geçirir"""
+        with self._guncelleme_kilidi, self._kilit.yazma():
+            embeddings = None if self.embeddings is None else np.array(self.embeddings)
+            self.nicem_vektorler = acik
+            self._embedding_sifirla()
+            if embeddings is not None:
+                self._embedding_ekle(embeddings)
+            self.surum += 1
+            self.siralama_onbellegi.temizle()
+
+    def vektor_bellegi(self) -> int:
+        """Bellekte tutulan vektör dizilerinin boyutu (int8 modunda diskteki float32 vektörler hariç)"""
+        if self._nicem_kodlari is not None:
+            return self._nicem_kodlari.nbytes + self._nicem_olcekleri.nbytes
+        return 0 if self.embeddings is None else self.embeddings.nbytes
+
+    def _yaklasik_vektorler(self, vektorler: np.ndarray) -> np.ndarray:
+        """Vektörleri int8 modunda kodlardan, aksi halde float32 matristen döndürür"""
+        if self._nicem_kodlari is None:
+            return self.embeddings[vektorler]
+        return self._nicem_kodlari[vektorler].astype(np.float32) * self._nicem_olcekleri[vektorler, None]
+
+    def _nicem_skorlari(self, question_embedding: np.ndarray, vektorler: Optional[np.ndarray] = None) -> np.ndarray:
+        """int8 kodlarla yaklaşık skorlar; kodlar önbelleğe sığan bloklar halinde float32'ye açılır"""
+        kodlar = self._nicem_kodlari if vektorler is None else self._nicem_kodlari[vektorler]
+        olcekler = self._nicem_olcekleri if vektorler is None else self._nicem_olcekleri[vektorler]
+        question_embedding = np.asarray(question_embedding, dtype=np.float32)
+        skorlar = np.empty(len(kodlar), dtype=np.float32)
+        blok = np.empty((min(NICEM_BLOK_SATIRI, len(kodlar)), kodlar.shape[1]), dtype=np.float32)
+        for bas in range(0, len(kodlar), NICEM_BLOK_SATIRI):
+            son = min(bas + NICEM_BLOK_SATIRI, len(kodlar))
+            np.copyto(blok[:son - bas], kodlar[bas:son], casting='unsafe')
+            np.dot(blok[:son - bas], question_embedding, out=skorlar[bas:son])
+        return skorlar * olcekler
+
+    def _golge(self) -> 'KanunIndex':
+        """Canlı güncellemeler için sütunları ve tabloları kopyalanmış bir gölge indeks oluşturur
+
+        Güncelleme gölgede uygulanır ve türetilmiş yapılar orada kurulur; aramalar bu sırada eski
+        durumu okumaya devam eder. Metin deposu ve embedding tamponu paylaşılır (ikisine de yalnızca
+        okuyucuların görmediği sona ekleme yapılır).
+        """
+        golge = copy.copy(self)
+        for ad, deger in vars(self).items():
+            if isinstance(deger, (array, list, dict, set)):
+                setattr(golge, ad, copy.copy(deger))
+        golge.kelime_ofsetleri = self.kelime_ofsetleri.kopya()
+        golge.baslik_onek_indeksi = self.baslik_onek_indeksi.kopya()
+        golge.baslik_trigram_indeksi = self.baslik_trigram_indeksi.kopya()
+        return golge
+
+    def _yerine_koy(self, golge: 'KanunIndex'):
+        """Gölge indeksin durumunu yazma kilidi altında tek seferde yerine koyar"""
+        golge.text_store.sync()
+        with self._kilit.yazma():
+            vars(self).update(vars(golge))
+
+    def upsert_kanun(self, kanun: Dict[str, Any], batch_size: int = 256) -> Dict[str, Any]:
+        """Parse edilmiş kanunu çalışan indekse ekler; aynı numaralı kanun varsa yenisiyle değiştirir
+
+        Yalnızca indekste olmayan madde metinleri encode edilir. Eski kanunun satırları tombstone
+        olarak kalır ve compact() ile kaldırılır. Aramalar yalnızca yerine koyma anında bekler.
+        """
+        if self.model is None:
+            raise RuntimeError("İndeks henüz build edilmedi")
+
+        with self._guncelleme_kilidi:
+            baslangic = time.perf_counter()
+            # Yeni metinler maddelerdeki ilk görülme sırasıyla; add_kanun vektörleri aynı sırayla açar
+            yeni_metinler: Dict[bytes, str] = {}
+            for madde in kanun['maddeler']:
+                metin_id = metin_hash(madde['icerik'])
+                if metin_id not in self._metin_hash_ids:
+                    yeni_metinler.setdefault(metin_id, madde['icerik'])
+
+            # Encode, paylaşılan metin deposuna ve embedding tamponuna dokunmadan önce yapılır
+            yeni_embeddings = self._encode(list(yeni_metinler.values()), batch_size) if yeni_metinler else None
+
+            golge = self._golge()
+            eski_id = golge._resolve_kanun_id(kanun['kanun_no'])
+            if eski_id is not None:
+                golge._silinen_kanunlar.add(eski_id)
+            golge.add_kanun(kanun)
+            if yeni_embeddings is not None:
+                golge._embedding_ekle(yeni_embeddings)
+            golge._artimli_turet(eski_id, self.madde_sayisi, self.kanun_sayisi, batch_size)
+            self._yerine_koy(golge)
+
+            return {
+                'kanun_no': kanun['kanun_no'],
+                'durum': 'guncellendi' if eski_id is not None else 'eklendi',
+                'madde_sayisi': len(kanun['maddeler']),
+                'yeni_vektor_sayisi': len(yeni_metinler),
+                'sure_ms': round((time.perf_counter() - baslangic) * 1000, 1),
+                'surum': self.surum
+            }
+
+    def remove_kanun(self, kanun_no: str) -> Optional[Dict[str, Any]]:
+        """Kanunu tombstone olarak işaretleyip aramalardan ve listelerden çıkarır (kanun yoksa None)"""
+        with self._guncelleme_kilidi:
+            baslangic = time.perf_counter()
+            kanun_id = self._resolve_kanun_id(kanun_no)
+            if kanun_id is None:
+                return None
+            golge = self._golge()
+            golge._silinen_kanunlar.add(kanun_id)
+            golge._artimli_turet(kanun_id, self.madde_sayisi, self.kanun_sayisi)
+            self._yerine_koy(golge)
+
+            kanun = self.kanunlar[kanun_id]
+            return {
+                'kanun_no': kanun.kanun_no,
+                'durum': 'silindi',
+                'madde_sayisi': kanun.satir_bitis - kanun.satir_baslangic,
+                'sure_ms': round((time.perf_counter() - baslangic) * 1000, 1),
+                'surum': self.surum
+            }
+
+    def tombstone_orani(self) -> float:
+        """Dizilerde kalan silinmiş satırların tüm satırlara oranı"""
+        return self.tombstone_satir_sayisi / self.madde_sayisi if self.madde_sayisi else 0.0
+
+    def tombstone_durumu(self) -> Dict[str, Any]:
+        tampon = self._embedding_tamponu if self._nicem_kodlari is None else self._nicem_tamponu
+        return {
+            'kanun_sayisi': self.canli_kanun_sayisi,
+            'silinen_kanun_sayisi': len(self._silinen_kanunlar),
+            'madde_sayisi': self.madde_sayisi - self.tombstone_satir_sayisi,
+            'tombstone_satir_sayisi': self.tombstone_satir_sayisi,
+            'tombstone_orani': round(self.tombstone_orani(), 4),
+            'vektor_sayisi': self.vektor_sayisi,
+            'embedding_kapasitesi': 0 if tampon is None else len(tampon)
+        }
+
+    def compact(self) -> Dict[str, Any]:
+        """Tombstone'lu kanunların satırlarını, bölümlerini, vektörlerini ve metin bloklarını kaldırır
+
+        Yeni diziler, metin deposu ve türetilmiş yapılar gölge indekste hazırlanır (güncellemeler bu
+        sırada bekler); aramalar yalnızca yerine koyma anında bekler.
+        Başlık, URL ve bölüm metni tabloları tekilleştirilmiş olduğundan olduğu gibi kalır.
+        """
+        with self._guncelleme_kilidi:
+            if not self._silinen_kanunlar:
+                return {'kaldirilan_kanun_sayisi': 0, 'kaldirilan_satir_sayisi': 0, 'kaldirilan_vektor_sayisi': 0}
+
+            canli_kanunlar = np.flatnonzero(~self._silinmis_kanun_mask)
+            canli_satirlar = np.flatnonzero(self._canli_satir_mask)
+            bolum_kanun_ids = np.array(self.bolum_kanun_ids, dtype=np.int32)
+            canli_bolumler = np.flatnonzero(~self._silinmis_kanun_mask[bolum_kanun_ids])
+
+            # Eski id -> yeni id eşlemeleri (kaldırılanlar -1)
+            kanun_yeni_id = np.full(self.kanun_sayisi, -1, dtype=np.int32)
+            kanun_yeni_id[canli_kanunlar] = np.arange(len(canli_kanunlar))
+            bolum_yeni_id = np.full(self.bolum_sayisi + 1, -1, dtype=np.int32)
+            bolum_yeni_id[canli_bolumler] = np.arange(len(canli_bolumler))
+            eski_vektorler = self._satir_vektor_ids[canli_satirlar]
+            canli_vektorler = np.unique(eski_vektorler)
+            vektor_yeni_id = np.full(self.vektor_sayisi, -1, dtype=np.int32)
+            vektor_yeni_id[canli_vektorler] = np.arange(len(canli_vektorler))
+            yeni_satir_vektorleri = vektor_yeni_id[eski_vektorler]
+            # Vektörün ilk satırı artık ilk canlı satırıdır
+            _, vektor_ilk_satir = np.unique(yeni_satir_vektorleri, return_index=True)
+
+            # Kanunların satır ve bölüm aralıkları kanun başına kaydırılır (bölüm satırları kanununun kaymasıyla)
+            satir_kaymasi = np.zeros(self.kanun_sayisi, dtype=np.int64)
+            kanunlar, satir, bolum = [], 0, 0
+            for kanun_id in canli_kanunlar:
+                eski = self.kanunlar[kanun_id]
+                satir_kaymasi[kanun_id] = eski.satir_baslangic - satir
+                madde_sayisi = eski.satir_bitis - eski.satir_baslangic
+                bolum_sayisi = eski.bolum_bitis - eski.bolum_baslangic
+                kanunlar.append(KanunKaydi(eski.kanun_no, eski.baslik_id, eski.yayim_tarihi, eski.url_id,
+                                           satir, satir + madde_sayisi, bolum, bolum + bolum_sayisi,
+                                           eski.icerik_ozeti, eski.metin_blok_id))
+                satir += madde_sayisi
+                bolum += bolum_sayisi
+
+            # Bölüm id'leri -1 (bölümsüz / kök) olabilir; bolum_yeni_id'nin son elemanı -1'i -1'e eşler
+            madde_bolum_ids = bolum_yeni_id[np.array(self.madde_bolum_ids, dtype=np.int32)[canli_satirlar]]
+            bolum_ust_ids = bolum_yeni_id[np.array(self.bolum_ust_ids, dtype=np.int32)[canli_bolumler]]
+            bolum_satir_kaymasi = satir_kaymasi[bolum_kanun_ids[canli_bolumler]]
+            sutunlar = {
+                'madde_kanun_ids': _suz(self.madde_kanun_ids, canli_satirlar,
+                                        kanun_yeni_id[self._satir_kanun_ids[canli_satirlar]]),
+                'madde_nolari': _suz(self.madde_nolari, canli_satirlar),
+                'madde_turleri': _suz(self.madde_turleri, canli_satirlar),
+                'metin_baslangic': _suz(self.metin_baslangic, canli_satirlar),
+                'metin_bitis': _suz(self.metin_bitis, canli_satirlar),
+                'madde_bolum_ids': _suz(self.madde_bolum_ids, canli_satirlar, madde_bolum_ids),
+                'madde_baslik_ids': _suz(self.madde_baslik_ids, canli_satirlar),
+                'madde_vektor_ids': _suz(self.madde_vektor_ids, canli_satirlar, yeni_satir_vektorleri),
+                'vektor_ilk_satir': _suz(self.vektor_ilk_satir, canli_vektorler, vektor_ilk_satir),
+                'bolum_kanun_ids': _suz(self.bolum_kanun_ids, canli_bolumler,
+                                        kanun_yeni_id[bolum_kanun_ids[canli_bolumler]]),
+                'bolum_ust_ids': _suz(self.bolum_ust_ids, canli_bolumler, bolum_ust_ids),
+                'bolum_ad_ids': _suz(self.bolum_ad_ids, canli_bolumler),
+                'bolum_baslik_ids': _suz(self.bolum_baslik_ids, canli_bolumler),
+                'bolum_satir_baslangic': _suz(self.bolum_satir_baslangic, canli_bolumler,
+                                              np.array(self.bolum_satir_baslangic)[canli_bolumler] - bolum_satir_kaymasi),
+                'bolum_satir_bitis': _suz(self.bolum_satir_bitis, canli_bolumler,
+                                          np.array(self.bolum_satir_bitis)[canli_bolumler] - bolum_satir_kaymasi),
+            }
+            vektor_hashleri = [self.vektor_hashleri[vektor_id] for vektor_id in canli_vektorler]
+            # İlk satırı kaldırılan vektörlerin kelime ofsetleri yeni ilk satırın metninden çıkarılır
+            yeni_ilk_satirlar = canli_satirlar[vektor_ilk_satir]
+            degisen = np.flatnonzero(yeni_ilk_satirlar != np.array(self.vektor_ilk_satir)[canli_vektorler])
+            kelime_ofsetleri = self.kelime_ofsetleri.suz(
+                canli_vektorler, {int(sira): self.get_madde_icerik(int(yeni_ilk_satirlar[sira])) for sira in degisen})
+            embeddings = None if self.embeddings is None else self.embeddings[canli_vektorler]
+
+            # Canlı metin blokları açılmadan yeni depoya kopyalanır (sahipsiz bloklar da böylece kalkar)
+            eski_depo = self.text_store
+            yeni_depo = KanunTextStore(eski_depo.path + '.compact' if eski_depo.path else None,
+                                       cache_size=eski_depo.cache_info().maxsize,
+                                       compression_level=eski_depo.compression_level)
+            for kanun in kanunlar:
+                kanun.metin_blok_id = yeni_depo.kopyala(eski_depo, kanun.metin_blok_id)
+            yeni_depo.sync()
+
+            ozet = {
+                'kaldirilan_kanun_sayisi': len(self._silinen_kanunlar),
+                'kaldirilan_satir_sayisi': self.madde_sayisi - len(canli_satirlar),
+                'kaldirilan_vektor_sayisi': self.vektor_sayisi - len(canli_vektorler),
+                'kazanilan_metin_bytes': eski_depo.compressed_bytes - yeni_depo.compressed_bytes
+            }
+
+            golge = self._golge()
+            for ad, sutun in sutunlar.items():
+                setattr(golge, ad, sutun)
+            golge.kanunlar = kanunlar
+            golge.vektor_hashleri = vektor_hashleri
+            golge.kelime_ofsetleri = kelime_ofsetleri
+            golge._metin_hash_ids = {metin_id: vektor_id for vektor_id, metin_id in enumerate(vektor_hashleri)}
+            golge._embedding_sifirla()
+            if embeddings is not None:
+                golge._embedding_ekle(embeddings)
+            golge._atif_onbellegi = {metin_id: self._atif_onbellegi[metin_id]
+                                     for metin_id in vektor_hashleri if metin_id in self._atif_onbellegi}
+            golge._degisiklik_onbellegi = {metin_id: self._degisiklik_onbellegi[metin_id]
+                                           for metin_id in vektor_hashleri if metin_id in self._degisiklik_onbellegi}
+            golge._silinen_kanunlar = set()
+            golge.text_store = yeni_depo
+            golge._yeniden_turet()
+            self._yerine_koy(golge)
+
+            # Yerine koymadan sonra eski depoyu okuyan kalmaz
+            eski_depo.close()
+            if eski_depo.path:
+                os.replace(yeni_depo.path, eski_depo.path)
+                yeni_depo.path = eski_depo.path
+            return ozet
+
+    def _icerik_etiketi(self) -> str:
+        """Kanunların numarası, başlığı, tarihi, URL'si ve ham metin hash'inden indeks etiketi üretir
+
+        Kanunlar kanun_no sırasıyla işlenir; güncellenen kanunun iç id'si değişse de etiket değişmez.
+        """
+        ozet = hashlib.blake2b(digest_size=12)
+        for kanun_id in self._kanun_no_sirasi:
+            kanun = self.kanunlar[kanun_id]
+            for alan in (kanun.kanun_no, self.basliklar[kanun.baslik_id], kanun.yayim_tarihi or '', self.urls[kanun.url_id]):
+                ozet.update(alan.encode('utf-8') + b'\0')
+            ozet.update(kanun.icerik_ozeti)
+        return ozet.hexdigest()
+
+    def _report_dedup(self):
+        """Tekilleştirmenin kazandırdığı embedding işini ve bellek miktarını raporlar"""
+        tekilsiz_bellek = self.madde_sayisi * self.vektor_bellegi() // self.vektor_sayisi
+        bellek = (self.vektor_bellegi() + self._satir_vektor_ids.nbytes
+                  + self._vektor_satirlari.nbytes + self._vektor_satir_ptr.nbytes)
+        self.dedup_raporu = {
+            'madde_sayisi': self.madde_sayisi,
+            'vektor_sayisi': self.vektor_sayisi,
+            'atlanan_embedding': self.madde_sayisi - self.vektor_sayisi,
+            'tekilsiz_bellek_bytes': tekilsiz_bellek,
+            'bellek_bytes': bellek
+        }
+        print(f"Tekilleştirme: {self.madde_sayisi - self.vektor_sayisi} madde embedding'i atlandı "
+              f"(%{100 * (1 - self.vektor_sayisi / self.madde_sayisi):.1f}), vektör belleği "
+              f"{tekilsiz_bellek / 1e6:.1f} MB yerine {bellek / 1e6:.1f} MB")
+
+    def _gozlemle(self, asama: str, baslangic: float) -> float:
+        """Aşama süresini gözlemciye bildirir ve aşamanın bitiş zamanını döndürür"""
+        simdi = time.perf_counter()
+        if self.asama_gozlemci is not None:
+            self.asama_gozlemci(asama, simdi - baslangic)
+        return simdi
+
+    def _konum(self, row: int) -> Dict[str, Any]:
+        """Bir satırın kanun ve madde konumunu döndürür"""
+        kanun = self.kanunlar[self.madde_kanun_ids[row]]
+        return {
+            'kanun_no': kanun.kanun_no,
+            'baslik': self.basliklar[kanun.baslik_id],
+            'madde_no': self.madde_nolari[row],
+            'madde_turu': MADDE_TURLERI[self.madde_turleri[row]]
+        }
+
+    def _bolum_metni(self, metin_id: int) -> Optional[str]:
+        return self.bolum_metinleri[metin_id] if metin_id >= 0 else None
+
+    def madde_basligi(self, row: int) -> Optional[str]:
+        """Maddenin başlığını döndürür ("Kanunun şümulü")"""
+        return self._bolum_metni(self.madde_baslik_ids[row])
+
+    def _bolum_ref(self, bolum_id: int) -> Dict[str, Any]:
+        """Bölümün kanun içindeki id'sini, adını ve başlığını döndürür"""
+        kanun = self.kanunlar[self.bolum_kanun_ids[bolum_id]]
+        return {
+            'id': bolum_id - kanun.bolum_baslangic,
+            'ad': self.bolum_metinleri[self.bolum_ad_ids[bolum_id]],
+            'baslik': self._bolum_metni(self.bolum_baslik_ids[bolum_id])
+        }
+
+    def _bolum_zinciri(self, bolum_id: int) -> List[int]:
+        """Kökten verilen bölüme kadar bölüm id'lerini döndürür"""
+        zincir = []
+        while bolum_id >= 0:
+            zincir.append(bolum_id)
+            bolum_id = self.bolum_ust_ids[bolum_id]
+        zincir.reverse()
+        return zincir
+
+    def bolum_yolu(self, row: int) -> List[Dict[str, Any]]:
+        """Maddenin bulunduğu bölüm yolunu kökten başlayarak döndürür"""
+        return [self._bolum_ref(bolum_id) for bolum_id in self._bolum_zinciri(self.madde_bolum_ids[row])]
+
+    def _madde_ozeti(self, row: int) -> Dict[str, Any]:
+        return {
+            'madde_no': self.madde_nolari[row],
+            'madde_turu': MADDE_TURLERI[self.madde_turleri[row]],
+            'madde_basligi': self.madde_basligi(row)
+        }
+
+    def _bolum_ozeti(self, bolum_id: int) -> Dict[str, Any]:
+        ozet = self._bolum_ref(bolum_id)
+        ozet['madde_sayisi'] = self.bolum_satir_bitis[bolum_id] - self.bolum_satir_baslangic[bolum_id]
+        return ozet
+
+    @_okur
+    def get_toc(self, kanun_no: str) -> Optional[Dict[str, Any]]:
+        """Kanunun bölüm ağacını madde başlıklarıyla birlikte döndürür (kanun yoksa None)"""
+        kanun_id = self._resolve_kanun_id(kanun_no)
+        if kanun_id is None:
+            return None
+        kanun = self.kanunlar[kanun_id]
+
+        # Bölümler ön-sıralı (pre-order) tutulduğu için ebeveynler çocuklarından önce gelir
+        dugumler = {}
+        kokler = []
+        for bolum_id in range(kanun.bolum_baslangic, kanun.bolum_bitis):
+            dugum = self._bolum_ozeti(bolum_id)
+            dugum['maddeler'] = []
+            dugum['alt_bolumler'] = []
+            dugumler[bolum_id] = dugum
+            ust_id = self.bolum_ust_ids[bolum_id]
+            (dugumler[ust_id]['alt_bolumler'] if ust_id >= 0 else kokler).append(dugum)
+
+        # Maddeler doğrudan bulundukları bölüme eklenir; bölümsüz maddeler kök düzeyindedir
+        bolumsuz = []
+        for row in range(kanun.satir_baslangic, kanun.satir_bitis):
+            bolum_id = self.madde_bolum_ids[row]
+            (dugumler[bolum_id]['maddeler'] if bolum_id >= 0 else bolumsuz).append(self._madde_ozeti(row))
+
+        return {
+            'kanun_no': kanun.kanun_no,
+            'baslik': self.basliklar[kanun.baslik_id],
+            'bolum_sayisi': kanun.bolum_bitis - kanun.bolum_baslangic,
+            'bolumler': kokler,
+            'maddeler': bolumsuz
+        }
+
+    @_okur
+    def get_bolum(self, kanun_no: str, bolum_no: int) -> Optional[Dict[str, Any]]:
+        """Bir bölümün yolunu, alt bölümlerini ve madde metinlerini döndürür (bulunamazsa None)"""
+        kanun_id = self._resolve_kanun_id(kanun_no)
+        if kanun_id is None:
+            return None
+        kanun = self.kanunlar[kanun_id]
+        bolum_id = kanun.bolum_baslangic + bolum_no
+        if bolum_no < 0 or bolum_id >= kanun.bolum_bitis:
+            return None
+
+        bolum = self._bolum_ozeti(bolum_id)
+        bolum['kanun_no'] = kanun.kanun_no
+        bolum['yol'] = [self._bolum_ref(ust_id) for ust_id in self._bolum_zinciri(bolum_id)[:-1]]
+        bolum['alt_bolumler'] = [
+            self._bolum_ozeti(alt_id) for alt_id in range(bolum_id + 1, kanun.bolum_bitis)
+            if self.bolum_ust_ids[alt_id] == bolum_id
+        ]
+        bolum['maddeler'] = []
+        for row in range(self.bolum_satir_baslangic[bolum_id], self.bolum_satir_bitis[bolum_id]):
+            madde = self._madde_ozeti(row)
+            madde['icerik'] = self.get_madde_icerik(row)
+            bolum['maddeler'].append(madde)
+        return bolum
+
+    @_okur
+    def find_madde_row(self, kanun_no: str, madde_no: int, madde_turu: str = 'normal') -> Optional[int]:
+        """Kanun ve madde numarasına karşılık gelen ilk satırı döndürür (bulunamazsa None)"""
+        if madde_turu not in MADDE_TURLERI:
+            raise ValueError(f"Geçersiz madde türü: {madde_turu} (geçerli türler: {', '.join(MADDE_TURLERI)})")
+        kanun_id = self._resolve_kanun_id(kanun_no)
+        if kanun_id is None:
+            return None
+        kanun = self.kanunlar[kanun_id]
+        tur_id = MADDE_TURLERI.index(madde_turu)
+        for row in range(kanun.satir_baslangic, kanun.satir_bitis):
+            if self.madde_nolari[row] == madde_no and self.madde_turleri[row] == tur_id:
+                return row
+        return None
+
+    def _madde_ref(self, row: int) -> Dict[str, Any]:
+        """Bir maddenin kanunu ve başlığıyla kısa kaydı"""
+        kanun = self.kanunlar[self.madde_kanun_ids[row]]
+        ref = {'kanun_no': kanun.kanun_no, 'baslik': self.basliklar[kanun.baslik_id]}
+        ref.update(self._madde_ozeti(row))
+        return ref
+
+    @_okur
+    def atiflar(self, row: int) -> List[Dict[str, Any]]:
+        """Maddenin atıf yaptığı kanun ve maddeleri döndürür"""
+        sonuc = []
+        for i in range(self._atif_ptr[row], self._atif_ptr[row + 1]):
+            hedef = int(self._atif_hedef_satirlar[i])
+            if hedef >= 0:
+                atif = self._madde_ref(hedef)
+            else:
+                kanun_id = int(self._atif_hedef_kanun_ids[i])
+                if kanun_id >= 0:
+                    kanun = self.kanunlar[kanun_id]
+                    atif = {'kanun_no': kanun.kanun_no, 'baslik': self.basliklar[kanun.baslik_id]}
+                else:
+                    atif = {'kanun_no': f"{int(self._atif_hedef_kanun_nolari[i]):04d}0000", 'baslik': None}
+                madde_no = int(self._atif_hedef_maddeler[i])
+                atif['madde_no'] = madde_no or None
+                atif['madde_turu'] = MADDE_TURLERI[self._atif_hedef_turleri[i]] if madde_no else None
+            atif['yuklu'] = hedef >= 0
+            sonuc.append(atif)
+        return sonuc
+
+    @_okur
+    def atif_edenler(self, row: int) -> List[Dict[str, Any]]:
+        """Maddeye atıf yapan maddeleri döndürür"""
+        return [
+            self._madde_ref(int(kaynak))
+            for kaynak in self._atif_ters_kaynaklar[self._atif_ters_ptr[row]:self._atif_ters_ptr[row + 1]]
+        ]
+
+    @_okur
+    def kanun_atif_edenler(self, kanun_no: str) -> Optional[List[Dict[str, Any]]]:
+        """Kanuna (veya maddelerine) atıf yapan diğer kanunları atıf yapan madde sayısıyla döndürür"""
+        kanun_id = self._resolve_kanun_id(kanun_no)
+        if kanun_id is None:
+            return None
+        kaynaklar = self._kanun_atif_kaynaklar[self._kanun_atif_ptr[kanun_id]:self._kanun_atif_ptr[kanun_id + 1]]
+        kaynak_kanunlar = self._satir_kanun_ids[kaynaklar]
+        kaynak_kanunlar = kaynak_kanunlar[kaynak_kanunlar != kanun_id]
+        ids, sayilar = np.unique(kaynak_kanunlar, return_counts=True)
+        sira = np.argsort(-sayilar, kind='stable')
+        return [
+            {
+                'kanun_no': self.kanunlar[ids[i]].kanun_no,
+                'baslik': self.basliklar[self.kanunlar[ids[i]].baslik_id],
+                'atif_eden_madde_sayisi': int(sayilar[i])
+            }
+            for i in sira
+        ]
+
+    def _atif_edilen_maddeler(self, row: int) -> List[Dict[str, Any]]:
+        """Arama sonucuna eklenecek, maddenin doğrudan atıf yaptığı yüklü maddeler"""
+        hedefler = self._atif_hedef_satirlar[self._atif_ptr[row]:self._atif_ptr[row + 1]]
+        sonuc = []
+        for hedef in hedefler[hedefler >= 0][:self.max_atif]:
+            atif = self._madde_ref(int(hedef))
+            atif['icerik'] = self.get_madde_icerik(int(hedef))
+            sonuc.append(atif)
+        return sonuc
+
+    def _degisiklik(self, olay_id: int) -> Dict[str, Any]:
+        """Tek bir değişiklik olayının kaydı"""
+        kanun_no = int(self._degisiklik_kanun_nolari[olay_id])
+        return {
+            'tarih': format_tarih(int(self._degisiklik_tarihleri[olay_id])),
+            'tur': DEGISIKLIK_TURLERI[self._degisiklik_turleri[olay_id]],
+            'kapsam': KAPSAMLAR[self._degisiklik_kapsamlari[olay_id]],
+            'resmi_gazete_sayisi': int(self._degisiklik_rg_sayilari[olay_id]) or None,
+            'degistiren_kanun_no': f"{kanun_no:04d}0000" if kanun_no else None,
+            'degistiren_madde_no': int(self._degisiklik_kanun_maddeleri[olay_id]) or None
+        }
+
+    @_okur
+    def degisiklikler(self, row: int) -> List[Dict[str, Any]]:
+        """Maddenin değişiklik geçmişini metindeki sırasıyla döndürür"""
+        return [self._degisiklik(olay_id) for olay_id in range(self._degisiklik_ptr[row], self._degisiklik_ptr[row + 1])]
+
+    @_okur
+    def mulga_mi(self, row: int) -> bool:
+        return bool(self._mulga_mask[row])
+
+    @_okur
+    def degisiklik_ara(self, baslangic: Optional[str] = None, bitis: Optional[str] = None,
+                       kanun_no: Optional[List[str]] = None, tur: Optional[List[str]] = None,
+                       limit: int = 100, offset: int = 0) -> Dict[str, Any]:
+        """Tarih aralığındaki değişiklikleri tarih sırasıyla döndürür ("X tarihinden sonra değişen maddeler")"""
+        # Tarih aralığı sıralı dizide ikili arama ile bulunur
+        sol = np.searchsorted(self._sirali_degisiklik_tarihleri, parse_tarih(baslangic), 'left') if baslangic else 0
+        sag = (np.searchsorted(self._sirali_degisiklik_tarihleri, parse_tarih(bitis), 'right') if bitis
+               else len(self._sirali_degisiklik_tarihleri))
+        olay_ids = self._degisiklik_tarih_sirasi[sol:sag]
+
+        if tur:
+            for deger in tur:
+                if deger not in DEGISIKLIK_TURLERI:
+                    raise ValueError(f"Geçersiz değişiklik türü: {deger} "
+                                     f"(geçerli türler: {', '.join(DEGISIKLIK_TURLERI)})")
+            tur_ids = [DEGISIKLIK_TURLERI.index(deger) for deger in tur]
+            olay_ids = olay_ids[np.isin(self._degisiklik_turleri[olay_ids], tur_ids)]
+        kanun_mask = self._kanun_mask(kanun_no)
+        if kanun_mask is not None:
+            olay_ids = olay_ids[kanun_mask[self._satir_kanun_ids[self._degisiklik_satirlari[olay_ids]]]]
+
+        sonuc = []
+        for olay_id in olay_ids[offset:offset + limit]:
+            degisiklik = self._madde_ref(int(self._degisiklik_satirlari[olay_id]))
+            degisiklik.update(self._degisiklik(int(olay_id)))
+            sonuc.append(degisiklik)
+        return {
+            'toplam': int(len(olay_ids)),
+            'madde_sayisi': int(len(np.unique(self._degisiklik_satirlari[olay_ids]))),
+            'degisiklikler': sonuc
+        }
+
+    @_okur
+    def mulga_maddeler(self, kanun_no: str) -> Optional[List[Dict[str, Any]]]:
+        """Kanunun yürürlükten kaldırılmış veya iptal edilmiş maddelerini döndürür (kanun yoksa None)"""
+        kanun_id = self._resolve_kanun_id(kanun_no)
+        if kanun_id is None:
+            return None
+        kanun = self.kanunlar[kanun_id]
+        sol, sag = np.searchsorted(self._mulga_satirlari, [kanun.satir_baslangic, kanun.satir_bitis])
+
+        sonuc = []
+        for row in self._mulga_satirlari[sol:sag]:
+            madde = self._madde_ref(int(row))
+            # Maddeyi kaldıran son olay
+            olay_ids = range(self._degisiklik_ptr[row], self._degisiklik_ptr[row + 1])
+            kaldiran = [olay_id for olay_id in olay_ids
+                        if DEGISIKLIK_TURLERI[self._degisiklik_turleri[olay_id]] in ('mulga', 'iptal')
+                        and KAPSAMLAR[self._degisiklik_kapsamlari[olay_id]] == 'madde']
+            madde['degisiklik'] = self._degisiklik(kaldiran[-1]) if kaldiran else None
+            sonuc.append(madde)
+        return sonuc
+
+    def _result(self, row: int, score: float, alanlar: Optional[frozenset] = None,
+                snippet_sorgusu=None) -> Dict[str, Any]:
+        """Tek bir satır için cevap sözlüğünü oluşturur (alanlar verilirse yalnızca onlar)"""
+        kanun = self.kanunlar[self.madde_kanun_ids[row]]
+        result = {
+            'kanun_no': kanun.kanun_no,
+            'baslik': self.basliklar[kanun.baslik_id],
+            'madde_no': self.madde_nolari[row],
+            'madde_turu': MADDE_TURLERI[self.madde_turleri[row]],
+            'madde_basligi': self.madde_basligi(row),
+            'bolum_yolu': self.bolum_yolu(row),
+            'mulga': self.mulga_mi(row),
+            'yayim_tarihi': kanun.yayim_tarihi,
+            'gist_url': self.urls[kanun.url_id]
+        }
+        # Madde metni yalnızca istendiyse açılır
+        if alanlar is None or 'text' in alanlar:
+            result['text'] = self.get_madde_text(row)
+        if alanlar is not None and 'snippet' in alanlar:
+            result['snippet'] = self.snippet(row, snippet_sorgusu)
+        result['similarity_score'] = score
+        if alanlar is not None:
+            result = {alan: deger for alan, deger in result.items() if alan in alanlar}
+        return result
+
+    def sonuc_alanlari(self, alanlar: Optional[List[str]] = None, snippet: bool = False) -> Optional[frozenset]:
+        """İstenen alanları doğrular; snippet modunda varsayılan alanlarda text yerine snippet döner
+
+        Alan seçimi yoksa None (tüm alanlar). Kimlik alanları her zaman eklenir.
+        """
+        if alanlar is None and not snippet:
+            return None
+        if alanlar is None:
+            secilen = set(SONUC_ALANLARI) - {'text', 'snippet'}
+        else:
+            gecersiz = sorted(set(alanlar) - set(SONUC_ALANLARI))
+            if gecersiz:
+                raise ValueError(f"Geçersiz alan: {', '.join(gecersiz)} (geçerli alanlar: {', '.join(SONUC_ALANLARI)})")
+            secilen = set(alanlar)
+        if snippet:
+            secilen.add('snippet')
+        return frozenset(secilen.union(KIMLIK_ALANLARI))
+
+    def snippet_sorgusu(self, question: str, alanlar: Optional[frozenset]):
+        """Snippet istendiyse sorgunun terim ağırlıklarını bir kez hesaplar"""
+        if alanlar is None or 'snippet' not in alanlar:
+            return None
+        return self.kelime_ofsetleri.sorgu_agirliklari(question)
+
+    def snippet(self, row: int, snippet_sorgusu=None) -> Dict[str, Any]:
+        """Madde metninin sorguyla en çok eşleşen penceresini vurgularıyla döndürür
+
+        baslangic/bitis pencerenin, vurgular eşleşen kelimelerin pencere metnindeki karakter ofsetleridir;
+        madde_uzunlugu ile birlikte pencerenin kesilip kesilmediği anlaşılır.
+        """
+        vektor_id = self.madde_vektor_ids[row]
+        ilk_satir = self.vektor_ilk_satir[vektor_id]
+        uzunluk = self.metin_bitis[ilk_satir] - self.metin_baslangic[ilk_satir]
+        bas, son, vurgular = self.kelime_ofsetleri.pencere(vektor_id, snippet_sorgusu, self.snippet_kelime_sayisi)
+        if son < 0:
+            son = uzunluk
+        return {
+            'text': self.text_store.get_text(self._metin_blok_id(ilk_satir),
+                                             self.metin_baslangic[ilk_satir] + bas, self.metin_baslangic[ilk_satir] + son),
+            'baslangic': bas,
+            'bitis': son,
+            'madde_uzunlugu': uzunluk,
+            'vurgular': [[vurgu_bas - bas, vurgu_son - bas] for vurgu_bas, vurgu_son in vurgular]
+        }
+
+    @_okur
+    def get_madde(self, row: int) -> Dict[str, Any]:
+        """Maddenin tam metnini ve konum bilgilerini döndürür"""
+        result = self._result(row, 0.0)
+        del result['similarity_score']
+        return result
+
+    def vektor_satirlari(self, vektor_id: int, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Bir vektörü paylaşan satırları döndürür (rows verilirse yalnızca onların içindekiler)"""
+        satirlar = self._vektor_satirlari[self._vektor_satir_ptr[vektor_id]:self._vektor_satir_ptr[vektor_id + 1]]
+        if rows is not None:
+            konumlar = np.searchsorted(rows, satirlar)
+            konumlar[konumlar == len(rows)] = 0
+            satirlar = satirlar[rows[konumlar] == satirlar]
+        return satirlar
+
+    def _baslik_sirala(self, satirlar: np.ndarray, question_embedding: Optional[np.ndarray]) -> np.ndarray:
+        """Paylaşılan bir vektörün satırlarından başlık skorunu belirleyen satırı başa alır"""
+        if (question_embedding is None or len(satirlar) < 2 or not self.baslik_agirligi
+                or self.baslik_embeddings is None):
+            return satirlar
+        baslik_ids = self._kanun_baslik_ids[self._satir_kanun_ids[satirlar]]
+        en_iyi = int(np.argmax(self.baslik_embeddings[baslik_ids] @ question_embedding))
+        if en_iyi == 0:
+            return satirlar
+        return np.concatenate([satirlar[en_iyi:en_iyi + 1], satirlar[:en_iyi], satirlar[en_iyi + 1:]])
+
+    def _vektor_result(self, vektor_id: int, score: float, rows: Optional[np.ndarray],
+                       atiflari_ekle: bool = False, alanlar: Optional[frozenset] = None,
+                       snippet_sorgusu=None, question_embedding: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Bir vektör için cevap oluşturur ve aynı metnin diğer konumlarını ekler
+
+        Skora başlık benzerliği karıştırıldıysa cevap, en yüksek başlık skorunu veren satırdır.
+        """
+        satirlar = self._baslik_sirala(self.vektor_satirlari(vektor_id, rows), question_embedding)
+        result = self._result(int(satirlar[0]), score, alanlar, snippet_sorgusu)
+        if len(satirlar) > 1 and (alanlar is None or 'diger_konumlar' in alanlar):
+            result['tekrar_sayisi'] = int(len(satirlar))
+            result['diger_konumlar'] = [self._konum(int(row)) for row in satirlar[1:1 + self.max_diger_konum]]
+        if atiflari_ekle:
+            result['atif_edilen_maddeler'] = self._atif_edilen_maddeler(int(satirlar[0]))
+        return result
+
+    def _resolve_kanun_id(self, kanun_no: str) -> Optional[int]:
+        """Kanun numarasını ("02130000" veya "213") kanun id'sine çevirir"""
+        kanun_no = str(kanun_no).strip()
+        kanun_id = self._kanun_ids.get(kanun_no)
+        if kanun_id is None and kanun_no.isdigit() and len(kanun_no) <= 4:
+            kanun_id = self._kanun_ids.get(f"{int(kanun_no):04d}0000")
+        return kanun_id
+
+    def _kanun_mask(self, kanun_no: Optional[List[str]] = None,
+                    yayim_tarihi_baslangic: Optional[str] = None,
+                    yayim_tarihi_bitis: Optional[str] = None) -> Optional[np.ndarray]:
+        """Kanun listesi ve tarih aralığına uyan canlı kanunların maskesini döndürür (filtre ve tombstone yoksa None)"""
+        if not (kanun_no or yayim_tarihi_baslangic or yayim_tarihi_bitis):
+            return ~self._silinmis_kanun_mask if self._silinen_kanunlar else None
+
+        kanun_mask = ~self._silinmis_kanun_mask
+        if kanun_no:
+            kanun_mask[:] = False
+            kanun_ids = [self._resolve_kanun_id(no) for no in kanun_no]
+            kanun_mask[[kanun_id for kanun_id in kanun_ids if kanun_id is not None]] = True
+        if yayim_tarihi_baslangic:
+            kanun_mask &= self._kanun_tarihleri >= parse_tarih(yayim_tarihi_baslangic)
+        if yayim_tarihi_bitis:
+            kanun_mask &= (self._kanun_tarihleri <= parse_tarih(yayim_tarihi_bitis)) & (self._kanun_tarihleri > 0)
+        return kanun_mask
+
+    def _rows_for(self, kanun_mask: Optional[np.ndarray], madde_turu: Optional[List[str]] = None,
+                  mulga_haric: bool = False) -> Optional[np.ndarray]:
+        """Kanun maskesi, madde türleri ve mülga filtresine uyan satırları döndürür (filtre yoksa None)"""
+        if kanun_mask is None and not madde_turu and not mulga_haric:
+            return None
+
+        if kanun_mask is None:
+            row_mask = np.ones(self.madde_sayisi, dtype=bool)
+        else:
+            # Az sayıda kanun seçildiyse satır aralıklarını birleştir, aksi halde satır maskesi kullan
+            secili_kanunlar = np.flatnonzero(kanun_mask)
+            if len(secili_kanunlar) <= 64:
+                row_mask = np.zeros(self.madde_sayisi, dtype=bool)
+                for kanun_id in secili_kanunlar:
+                    row_mask[self._kanun_satir_baslangic[kanun_id]:self._kanun_satir_bitis[kanun_id]] = True
+            else:
+                row_mask = kanun_mask[self._satir_kanun_ids]
+
+        # Madde türü bitmap'leri
+        if madde_turu:
+            tur_mask = np.zeros(self.madde_sayisi, dtype=bool)
+            for tur in madde_turu:
+                if tur not in MADDE_TURLERI:
+                    raise ValueError(f"Geçersiz madde türü: {tur} (geçerli türler: {', '.join(MADDE_TURLERI)})")
+                tur_mask |= self._tur_bitmaps[MADDE_TURLERI.index(tur)]
+            row_mask &= tur_mask
+
+        # Yürürlükten kaldırılmış maddeler skorlanmaz
+        if mulga_haric:
+            row_mask &= ~self._mulga_mask
+
+        return np.flatnonzero(row_mask)
+
+    @_okur
+    def filter_rows(self, kanun_no: Optional[List[str]] = None,
+                    yayim_tarihi_baslangic: Optional[str] = None,
+                    yayim_tarihi_bitis: Optional[str] = None,
+                    madde_turu: Optional[List[str]] = None, mulga_haric: bool = False) -> Optional[np.ndarray]:
+        """Filtrelere uyan satırları döndürür (filtre yoksa None)"""
+        return self._rows_for(self._kanun_mask(kanun_no, yayim_tarihi_baslangic, yayim_tarihi_bitis),
+                              madde_turu, mulga_haric)
+
+    def select_kanunlar(self, question_embedding: np.ndarray, aday_kanun_sayisi: int,
+                        kanun_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Kaba aşama: madde merkezleri ve başlıklara göre en uygun M kanunun maskesini döndürür"""
+        kanun_scores = np.maximum(
+            self.kanun_centroids @ question_embedding,
+            (self.baslik_embeddings @ question_embedding)[self._kanun_baslik_ids]
+        )
+        if kanun_mask is not None:
+            kanun_scores[~kanun_mask] = -np.inf
+
+        secili = np.argpartition(-kanun_scores, aday_kanun_sayisi - 1)[:aday_kanun_sayisi]
+        aday_mask = np.zeros(self.kanun_sayisi, dtype=bool)
+        aday_mask[secili] = True
+        if kanun_mask is not None:
+            aday_mask &= kanun_mask
+        return aday_mask
+
+    def _baslik_skorlari(self, question_embedding: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Her vektör için satırlarının kanun başlıklarıyla en yüksek benzerliği (filtre dışı satırlar hariç)"""
+        kanun_skorlari = (self.baslik_embeddings @ question_embedding)[self._kanun_baslik_ids]
+        satir_skorlari = kanun_skorlari[self._satir_kanun_ids]
+        if rows is not None:
+            filtreli = np.full(self.madde_sayisi, -np.inf, dtype=np.float32)
+            filtreli[rows] = satir_skorlari[rows]
+            satir_skorlari = filtreli
+
+        # Satırları vektör sırasında olan CSR üzerinde vektör başına en büyük değer (boş vektörler -inf)
+        ptr = self._vektor_satir_ptr
+        dolu = np.flatnonzero(ptr[:-1] < ptr[1:])
+        skorlar = np.full(self.vektor_sayisi, -np.inf, dtype=np.float32)
+        if len(dolu):
+            skorlar[dolu] = np.maximum.reduceat(satir_skorlari[self._vektor_satirlari], ptr[dolu])
+        return skorlar
+
+    def _baslik_karistir(self, similarities: np.ndarray, baslik_skorlari: Optional[np.ndarray],
+                         vektorler: Optional[np.ndarray]) -> np.ndarray:
+        """Madde benzerliklerine kanun başlığı benzerliğini karıştırır"""
+        if baslik_skorlari is None:
+            return similarities
+        baslik = baslik_skorlari if vektorler is None else baslik_skorlari[vektorler]
+        return (1 - self.baslik_agirligi) * similarities + self.baslik_agirligi * baslik
+
+    def encode_questions(self, questions: List[str]) -> np.ndarray:
+        """Soruları tek seferde normalize edilmiş embedding'lere dönüştürür"""
+        return self._normalize(np.asarray(self.model.encode(questions), dtype=np.float32))
+
+    def encode_question(self, question: str) -> np.ndarray:
+        """Soruyu normalize edilmiş embedding'e dönüştürür"""
+        return self.encode_questions([question])[0]
+
+    @_okur
+    def rank(self, question_embedding: np.ndarray, max_results: int = 5,
+             aday_kanun_sayisi: Optional[int] = None, madde_turu: Optional[List[str]] = None,
+             mulga_haric: bool = False, **kanun_filtreleri):
+        """En yüksek skorlu vektörleri, skorlarını ve filtreye uyan satırları döndürür"""
+        bos = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32), None)
+        if self.embeddings is None or max_results <= 0:
+            return bos
+
+        baslangic = time.perf_counter()
+
+        # Filtreleri skorlamadan önce uygula
+        kanun_mask = self._kanun_mask(**kanun_filtreleri)
+
+        # İki aşamalı arama: önce aday kanunları seç, sonra yalnızca onların maddelerini skorla
+        if aday_kanun_sayisi is None:
+            aday_kanun_sayisi = self.aday_kanun_sayisi
+        aday_sayisi = self.kanun_sayisi if kanun_mask is None else int(kanun_mask.sum())
+        if aday_kanun_sayisi and aday_sayisi > aday_kanun_sayisi:
+            kanun_mask = self.select_kanunlar(question_embedding, aday_kanun_sayisi, kanun_mask)
+
+        rows = self._rows_for(kanun_mask, madde_turu, mulga_haric)
+        baslangic = self._gozlemle('filter', baslangic)
+        if rows is not None and not len(rows):
+            return bos
+
+        # Cosine similarity hesapla (filtre varsa yalnızca eşleşen satırların benzersiz vektörleri)
+        vektorler = None if rows is None else np.unique(self._satir_vektor_ids[rows])
+        baslik_skorlari = None
+        if self.baslik_agirligi and self.baslik_embeddings is not None:
+            baslik_skorlari = self._baslik_skorlari(question_embedding, rows)
+        if self._nicem_kodlari is not None:
+            similarities = self._baslik_karistir(self._nicem_skorlari(question_embedding, vektorler),
+                                                 baslik_skorlari, vektorler)
+            baslangic = self._gozlemle('scoring', baslangic)
+
+            # Yaklaşık skorlardaki en iyi adaylar float32 vektörlerle tam skorlanır (sıralı okuma için
+            # adaylar vektör sırasında; eşit skorlar float32 yoldaki gibi vektör sırasıyla kalır)
+            aday = min(max(max_results, self.yeniden_skorlama_sayisi), len(similarities))
+            secilen = np.sort(np.argpartition(-similarities, aday - 1)[:aday])
+            vektorler = secilen if vektorler is None else vektorler[secilen]
+            similarities = self._baslik_karistir(self.embeddings[vektorler] @ question_embedding,
+                                                 baslik_skorlari, vektorler)
+            baslangic = self._gozlemle('rescore', baslangic)
+        else:
+            if vektorler is None:
+                similarities = self.embeddings @ question_embedding
+            elif len(vektorler) * 2 > self.vektor_sayisi:
+                similarities = (self.embeddings @ question_embedding)[vektorler]
+            else:
+                similarities = self.embeddings[vektorler] @ question_embedding
+            similarities = self._baslik_karistir(similarities, baslik_skorlari, vektorler)
+            baslangic = self._gozlemle('scoring', baslangic)
+
+        # En yüksek skorlu sonuçları al (tam sıralama yerine kısmi seçim)
+        k = min(max_results, len(similarities))
+        top_indices = np.argpartition(-similarities, k - 1)[:k]
+        # Eşit skorlar vektör sırasıyla sıralanır; sayfalar farklı derinliklerde aynı sırayı görür
+        top_indices = top_indices[np.lexsort((top_indices, -similarities[top_indices]))]
+        top_indices = top_indices[similarities[top_indices] > self.min_similarity]  # Minimum similarity threshold
+
+        top_vektorler = vektorler[top_indices] if vektorler is not None else top_indices
+        self._gozlemle('topk', baslangic)
+        return top_vektorler, similarities[top_indices], rows
+
+    @_okur
+    def search(self, question: str, max_results: int = 5, atiflari_ekle: bool = False,
+               alanlar: Optional[List[str]] = None, snippet: bool = False, **secenekler) -> List[Dict[str, Any]]:
+        """Soruyu indekste arar ve en uygun sonuçları döndürür"""
+        alanlar = self.sonuc_alanlari(alanlar, snippet)
+        if self.embeddings is None or self.model is None or max_results <= 0:
+            return []
+
+        baslangic = time.perf_counter()
+        question_embedding = self.encode_question(question)
+        self._gozlemle('encode', baslangic)
+
+        vektorler, scores, rows = self.rank(question_embedding, max_results, **secenekler)
+
+        baslangic = time.perf_counter()
+        snippet_sorgusu = self.snippet_sorgusu(question, alanlar)
+        results = [
+            self._vektor_result(int(vektor_id), float(score), rows, atiflari_ekle, alanlar, snippet_sorgusu,
+                                question_embedding)
+            for vektor_id, score in zip(vektorler, scores)
+        ]
+        self._gozlemle('materialize', baslangic)
+        return results
+
+    @_okur
+    def search_page(self, question: str, max_results: int = 5, offset: int = 0, atiflari_ekle: bool = False,
+                    alanlar: Optional[List[str]] = None, snippet: bool = False,
+                    **secenekler) -> Tuple[List[Dict[str, Any]], bool]:
+        """Sıralanmış aday listesinin offset'ten başlayan sayfasını ve sonraki sayfanın olup olmadığını döndürür"""
+        alanlar = self.sonuc_alanlari(alanlar, snippet)
+        if self.embeddings is None or self.model is None or max_results <= 0 or offset < 0:
+            return [], False
+
+        # Sonraki sayfanın varlığını bilmek için bir aday fazlası gerekir
+        gereken = offset + max_results + 1
+        anahtar = (question, json.dumps(secenekler, sort_keys=True, ensure_ascii=False), self.surum)
+        kayit = self.siralama_onbellegi.get(anahtar)
+
+        if kayit is None or (kayit['kesik'] and len(kayit['vektorler']) < gereken):
+            if kayit is None:
+                baslangic = time.perf_counter()
+                question_embedding = self.encode_question(question)
+                self._gozlemle('encode', baslangic)
+            else:
+                question_embedding = kayit['embedding']
+
+            derinlik = max(gereken, self.sayfa_derinligi)
+            vektorler, scores, rows = self.rank(question_embedding, derinlik, **secenekler)
+            if rows is not None and len(vektorler):
+                # Yalnızca adayların filtreye uyan satırları saklanır
+                rows = np.unique(np.concatenate([self.vektor_satirlari(int(v), rows) for v in vektorler]))
+            kayit = {
+                'embedding': question_embedding,
+                'vektorler': vektorler,
+                'scores': scores,
+                'rows': rows,
+                # Liste derinliğe ulaştıysa daha fazla aday olabilir
+                'kesik': len(vektorler) == derinlik
+            }
+            self.siralama_onbellegi.put(anahtar, kayit)
+
+        baslangic = time.perf_counter()
+        sayfa = slice(offset, offset + max_results)
+        snippet_sorgusu = self.snippet_sorgusu(question, alanlar)
+        results = [
+            self._vektor_result(int(vektor_id), float(score), kayit['rows'], atiflari_ekle, alanlar, snippet_sorgusu,
+                                kayit['embedding'])
+            for vektor_id, score in zip(kayit['vektorler'][sayfa], kayit['scores'][sayfa])
+        ]
+        self._gozlemle('materialize', baslangic)
+        return results, len(kayit['vektorler']) > offset + max_results
+
+    @_okur
+    def search_batch(self, questions: List[str], max_results: int = 5, atiflari_ekle: bool = False,
+                     alanlar: Optional[List[str]] = None, snippet: bool = False,
+                     **secenekler) -> List[List[Dict[str, Any]]]:
+        """Birden fazla soruyu tek bir encode çağrısıyla arar"""
+        alanlar = self.sonuc_alanlari(alanlar, snippet)
+        if self.embeddings is None or self.model is None or not questions:
+            return [[] for _ in questions]
+
+        baslangic = time.perf_counter()
+        question_embeddings = self.encode_questions(questions)
+        self._gozlemle('encode', baslangic)
+
+        results = []
+        for question, question_embedding in zip(questions, question_embeddings):
+            vektorler, scores, rows = self.rank(question_embedding, max_results, **secenekler)
+            baslangic = time.perf_counter()
+            snippet_sorgusu = self.snippet_sorgusu(question, alanlar)
+            results.append([
+                self._vektor_result(int(vektor_id), float(score), rows, atiflari_ekle, alanlar, snippet_sorgusu,
+                                    question_embedding)
+                for vektor_id, score in zip(vektorler, scores)
+            ])
+            self._gozlemle('materialize', baslangic)
+        return results
+
+    def _kanun_ozeti(self, kanun_id: int) -> Dict[str, Any]:
+        kanun = self.kanunlar[kanun_id]
+        baslik = self.basliklar[kanun.baslik_id]
+        return {
+            'kanun_no': kanun.kanun_no,
+            'baslik': baslik,
+            'kisaltma': kisaltma_cikar(baslik),
+            'yayim_tarihi': kanun.yayim_tarihi
+        }
+
+    @_okur
+    def suggest_kanunlar(self, sorgu: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Başlık kelimelerinin, kanun numarasının veya kısaltmanın önekiyle eşleşen kanunları döndürür"""
+        return [self._kanun_ozeti(kanun_id) for kanun_id in self.baslik_onek_indeksi.ara(sorgu, limit)]
+
+    @_okur
+    def search_kanunlar(self, sorgu: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Yazım hatalı olabilecek kanun adına en yakın kanunları benzerlikleriyle döndürür"""
+        sonuc = []
+        for kanun_id, benzerlik in self.baslik_trigram_indeksi.ara(sorgu, limit):
+            kanun = self._kanun_ozeti(kanun_id)
+            kanun['benzerlik'] = benzerlik
+            sonuc.append(kanun)
+        return sonuc
+
+    @_okur
+    def resolve_kanun_adi(self, kanun_adi: str) -> Optional[str]:
+        """Kanun adını en yakın kanunun numarasına çevirir (yeterince benzer kanun yoksa None)"""
+        eslesmeler = self.baslik_trigram_indeksi.ara(kanun_adi, 1)
+        if not eslesmeler or eslesmeler[0][1] < self.min_ad_benzerligi:
+            return None
+        return self.kanunlar[eslesmeler[0][0]].kanun_no
+
+    def _kanun_listesi_ogesi(self, kanun: KanunKaydi) -> Dict[str, Any]:
+        return {
+            "kanun_no": kanun.kanun_no,
+            "baslik": self.basliklar[kanun.baslik_id],
+            "yayim_tarihi": kanun.yayim_tarihi,
+            "madde_sayisi": kanun.satir_bitis - kanun.satir_baslangic,
+            "bolum_sayisi": kanun.bolum_bitis - kanun.bolum_baslangic
+        }
+
+    @_okur
+    def list_kanunlar(self) -> List[Dict[str, Any]]:
+        """Yüklenen kanunların özet listesini kanun_no sırasıyla döndürür"""
+        return [self._kanun_listesi_ogesi(self.kanunlar[kanun_id]) for kanun_id in self._kanun_no_sirasi]
+
+    @_okur
+    def list_kanunlar_sayfa(self, after: Optional[str] = None, limit: int = 100) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """kanun_no sırasında after'dan sonraki kanunları ve sonraki sayfanın anahtarını döndürür (keyset)"""
+        baslangic = bisect_right(self._sirali_kanun_nolari, after) if after is not None else 0
+        kanun_ids = self._kanun_no_sirasi[baslangic:baslangic + limit]
+        kanunlar = [self._kanun_listesi_ogesi(self.kanunlar[kanun_id]) for kanun_id in kanun_ids]
+        sonraki = kanunlar[-1]["kanun_no"] if kanunlar and baslangic + limit < len(self._kanun_no_sirasi) else None
+        return kanunlar, sonraki
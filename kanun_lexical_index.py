@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hafif Sözcüksel Kanun İndeksi
+Kanun .txt dosyalarından veya bir chunk dosyasından önceden üretilen tek dosyalık bir BM25 indeksi.
+Serverless giriş noktası (api/index.py) torch ve sentence_transformers yüklemeden yalnızca standart
+kütüphane ve NumPy ile bu dosyayı açıp arama yapar.
+
+Dosya düzeni: sihirli başlık, JSON üst bilgi (kanun tablosu, madde numaraları, terim sözlüğü) ve
+64 bayta hizalı ham diziler. Diziler mmap üzerinden kopyalanmadan okunur; madde metinleri kanun
+başına zlib bloklarında tutulur ve yalnızca cevaba giren maddeler için açılır.
+
+Terimler Türkçe küçük harfe çevrilip ASCII'ye katlanır ve ilk 5 karaktere kısaltılır (Türkçe gibi
+eklemeli dillerde sabit önek kısaltma basit ve etkili bir gövdeleme yöntemidir). Her posting için
+BM25 ağırlığı build sırasında hesaplanır ve terim başına ölçekle uint8'e nicemlenir; sorgu
+zamanında yalnızca ilgili posting dilimleri toplanır.
+
+Kullanım:
+    python kanun_lexical_index.py --kanun-klasoru . --output kanun_lexical.idx [--gist-links tumlinkler]
+    python kanun_lexical_index.py --chunks kanun_chunks_gist.json --output kanun_lexical.idx
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import time
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
+import numpy as np
+from kanun_baslik_arama import ascii_katla
+
+MAGIC = b'KANUNLEX1\n'
+HIZALAMA = 64
+
+# Gövdeleme için terimlerin kısaltıldığı uzunluk
+ONEK_UZUNLUGU = 5
+
+# BM25 parametreleri
+K1 = 1.2
+B = 0.75
+
+
+def terimler(metin: str) -> List[str]:
+    """Metni katlanmış ve kısaltılmış arama terimlerine ayırır"""
+    return [kelime[:ONEK_UZUNLUGU] for kelime in re.findall(r'\w+', ascii_katla(metin)) if len(kelime) > 1]
+
+
+def _hizala(konum: int) -> int:
+    return (konum + HIZALAMA - 1) // HIZALAMA * HIZALAMA
+
+
+def build_lexical_index(chunks: List[Dict[str, Any]], output: str, compression_level: int = 6,
+                        gist_urls: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Chunk listesinden indeks dosyasını yazar ve özet istatistikleri döndürür
+
+    Kanunun gist_url'i chunk'lardan, chunk'larda yoksa gist_urls sözlüğünden (kanun_no -> URL) alınır.
+    """
+    if not chunks:
+        raise ValueError("Boş chunk listesinden indeks üretilemez")
+    baslangic = time.perf_counter()
+    gist_urls = gist_urls or {}
+
+    # Kanun tablosu ve madde sütunları
+    kanunlar, kanun_ids, kanun_maddeleri = [], {}, []
+    doc_kanunlari = np.empty(len(chunks), dtype=np.int32)
+    maddeler = []
+    for doc_id, chunk in enumerate(chunks):
+        kanun_no = str(chunk['kanun_no'])
+        kanun_id = kanun_ids.get(kanun_no)
+        if kanun_id is None:
+            kanun_id = kanun_ids[kanun_no] = len(kanunlar)
+            kanunlar.append([kanun_no, chunk.get('baslik'), chunk.get('yayim_tarihi'), gist_urls.get(kanun_no)])
+            kanun_maddeleri.append([])
+        if chunk.get('gist_url'):
+            kanunlar[kanun_id][3] = chunk['gist_url']
+        kanun_maddeleri[kanun_id].append(doc_id)
+        doc_kanunlari[doc_id] = kanun_id
+        maddeler.append(chunk.get('madde_no'))
+
+    # Kanun başına metin blokları; madde metni blok içindeki karakter aralığıdır
+    bloklar, blok_ofsetleri = [], [0]
+    doc_baslangic = np.empty(len(chunks), dtype=np.int32)
+    doc_bitis = np.empty(len(chunks), dtype=np.int32)
+    for doc_idleri in kanun_maddeleri:
+        parcalar, konum = [], 0
+        for doc_id in doc_idleri:
+            metin = chunks[doc_id]['text']
+            doc_baslangic[doc_id] = konum
+            konum += len(metin)
+            doc_bitis[doc_id] = konum
+            parcalar.append(metin)
+        blok = zlib.compress(''.join(parcalar).encode('utf-8'), compression_level)
+        bloklar.append(blok)
+        blok_ofsetleri.append(blok_ofsetleri[-1] + len(blok))
+
+    # Terim sayıları
+    sozluk: Dict[str, int] = {}
+    posting_terimleri, posting_dokumanlari, posting_frekanslari = [], [], []
+    doc_uzunluklari = np.empty(len(chunks), dtype=np.float32)
+    for doc_id, chunk in enumerate(chunks):
+        sayac = Counter(terimler(chunk['text']))
+        doc_uzunluklari[doc_id] = sum(sayac.values())
+        for terim, frekans in sayac.items():
+            terim_id = sozluk.get(terim)
+            if terim_id is None:
+                terim_id = sozluk[terim] = len(sozluk)
+            posting_terimleri.append(terim_id)
+            posting_dokumanlari.append(doc_id)
+            posting_frekanslari.append(frekans)
+
+    posting_terimleri = np.asarray(posting_terimleri, dtype=np.int32)
+    # 65536'dan az maddede doküman id'leri 2 bayta sığar
+    posting_dokumanlari = np.asarray(posting_dokumanlari, dtype=np.uint16 if len(chunks) <= 0xFFFF else np.uint32)
+    posting_frekanslari = np.asarray(posting_frekanslari, dtype=np.float32)
+
+    # Terimler alfabetik sıraya dizilir; posting'ler terime, sonra dokümana göre sıralanır
+    terim_listesi = sorted(sozluk)
+    yeni_id = np.empty(len(sozluk), dtype=np.int32)
+    for sira, terim in enumerate(terim_listesi):
+        yeni_id[sozluk[terim]] = sira
+    posting_terimleri = yeni_id[posting_terimleri]
+    sira = np.lexsort((posting_dokumanlari, posting_terimleri))
+    posting_terimleri = posting_terimleri[sira]
+    posting_dokumanlari = posting_dokumanlari[sira]
+    posting_frekanslari = posting_frekanslari[sira]
+
+    terim_ptr = np.zeros(len(terim_listesi) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(posting_terimleri, minlength=len(terim_listesi)), out=terim_ptr[1:])
+
+    # BM25 ağırlıkları ve terim başına uint8 nicemleme
+    doc_sayisi = len(chunks)
+    ortalama_uzunluk = float(doc_uzunluklari.mean()) if doc_sayisi else 0.0
+    df = np.diff(terim_ptr).astype(np.float32)
+    idf = np.log(1.0 + (doc_sayisi - df + 0.5) / (df + 0.5))
+    norm = K1 * (1.0 - B + B * doc_uzunluklari[posting_dokumanlari] / max(ortalama_uzunluk, 1.0))
+    agirliklar = idf[posting_terimleri] * posting_frekanslari * (K1 + 1.0) / (posting_frekanslari + norm)
+    terim_olcekleri = (np.maximum.reduceat(agirliklar, terim_ptr[:-1]) / 255.0).astype(np.float32) \
+        if len(agirliklar) else np.zeros(0, dtype=np.float32)
+    nicem = np.rint(agirliklar / terim_olcekleri[posting_terimleri]).clip(1, 255).astype(np.uint8)
+
+    diziler = {
+        'doc_kanunlari': doc_kanunlari,
+        'doc_baslangic': doc_baslangic,
+        'doc_bitis': doc_bitis,
+        'terim_ptr': terim_ptr,
+        'posting_dokumanlari': posting_dokumanlari,
+        'posting_agirliklari': nicem,
+        'terim_olcekleri': terim_olcekleri,
+        'blok_ofsetleri': np.asarray(blok_ofsetleri, dtype=np.int64),
+        'metinler': np.frombuffer(b''.join(bloklar), dtype=np.uint8),
+    }
+
+    ust_bilgi = {
+        'doc_sayisi': doc_sayisi,
+        'ortalama_uzunluk': ortalama_uzunluk,
+        'onek_uzunlugu': ONEK_UZUNLUGU,
+        'olusturulma': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'kanunlar': kanunlar,
+        'maddeler': maddeler,
+        'terimler': '\n'.join(terim_listesi),
+        'diziler': {}
+    }
+
+    # Dizilerin ofsetleri üst bilginin uzunluğuna bağlı olduğu için önce göreli konumlar hesaplanır
+    konum = 0
+    for ad, dizi in diziler.items():
+        konum = _hizala(konum)
+        ust_bilgi['diziler'][ad] = [dizi.dtype.str, list(dizi.shape), konum]
+        konum += dizi.nbytes
+    ust_bilgi_baytlari = json.dumps(ust_bilgi, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    veri_baslangici = _hizala(len(MAGIC) + 8 + len(ust_bilgi_baytlari))
+
+    with open(output, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(ust_bilgi_baytlari).to_bytes(8, 'little'))
+        f.write(ust_bilgi_baytlari)
+        for ad, dizi in diziler.items():
+            f.seek(veri_baslangici + ust_bilgi['diziler'][ad][2])
+            f.write(np.ascontiguousarray(dizi).tobytes())
+        boyut = f.tell()
+
+    return {
+        'doc_sayisi': doc_sayisi,
+        'kanun_sayisi': len(kanunlar),
+        'terim_sayisi': len(terim_listesi),
+        'posting_sayisi': int(len(nicem)),
+        'dosya_boyutu': boyut,
+        'sure_saniye': round(time.perf_counter() - baslangic, 2)
+    }
+
+
+class KanunLexicalIndex:
+    def __init__(self, path: str, metin_onbellegi: int = 32):
+        self.path = path
+
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} bir kanun sözcüksel indeks dosyası değil")
+
+        uzunluk = int.from_bytes(self._mmap[len(MAGIC):len(MAGIC) + 8], 'little')
+        ust_bilgi = json.loads(self._mmap[len(MAGIC) + 8:len(MAGIC) + 8 + uzunluk].decode('utf-8'))
+        veri_baslangici = _hizala(len(MAGIC) + 8 + uzunluk)
+
+        self.doc_sayisi = ust_bilgi['doc_sayisi']
+        self.olusturulma = ust_bilgi['olusturulma']
+        self.kanunlar = ust_bilgi['kanunlar']
+        self.maddeler = ust_bilgi['maddeler']
+        self._terim_ids = {terim: i for i, terim in enumerate(ust_bilgi['terimler'].split('\n'))}
+        self._kanun_ids = {kanun[0]: i for i, kanun in enumerate(self.kanunlar)}
+
+        # Diziler mmap üzerinde görünümdür; sayfalar yalnızca okunduklarında belleğe gelir
+        for ad, (dtype, shape, konum) in ust_bilgi['diziler'].items():
+            dizi = np.frombuffer(self._mmap, dtype=np.dtype(dtype), count=int(np.prod(shape)),
+                                 offset=veri_baslangici + konum)
+            setattr(self, f'_{ad}', dizi.reshape(shape))
+
+        self._get_block = lru_cache(maxsize=metin_onbellegi)(self._decompress_block)
+
+    @property
+    def kanun_sayisi(self) -> int:
+        return len(self.kanunlar)
+
+    @property
+    def terim_sayisi(self) -> int:
+        return len(self._terim_ids)
+
+    @property
+    def dosya_boyutu(self) -> int:
+        return len(self._mmap)
+
+    def _decompress_block(self, kanun_id: int) -> str:
+        """Bir kanunun madde metinlerini içeren bloğu açar"""
+        baslangic, bitis = self._blok_ofsetleri[kanun_id], self._blok_ofsetleri[kanun_id + 1]
+        return zlib.decompress(self._metinler[baslangic:bitis]).decode('utf-8')
+
+    def get_text(self, doc_id: int) -> str:
+        return self._get_block(int(self._doc_kanunlari[doc_id]))[self._doc_baslangic[doc_id]:self._doc_bitis[doc_id]]
+
+    def _resolve_kanun_id(self, kanun_no: str) -> Optional[int]:
+        """Kanun numarasını ("02130000" veya "213") kanun id'sine çevirir"""
+        kanun_no = str(kanun_no).strip()
+        kanun_id = self._kanun_ids.get(kanun_no)
+        if kanun_id is None and kanun_no.isdigit() and len(kanun_no) <= 4:
+            kanun_id = self._kanun_ids.get(f"{int(kanun_no):04d}0000")
+        return kanun_id
+
+    def _bm25(self, question: str) -> np.ndarray:
+        """Sorgu terimlerinin posting dilimlerini toplayarak tüm maddelerin skorunu döndürür"""
+        dokumanlar, agirliklar = [], []
+        for terim, sayi in Counter(terimler(question)).items():
+            terim_id = self._terim_ids.get(terim)
+            if terim_id is None:
+                continue
+            baslangic, bitis = self._terim_ptr[terim_id], self._terim_ptr[terim_id + 1]
+            dokumanlar.append(self._posting_dokumanlari[baslangic:bitis])
+            agirliklar.append(self._posting_agirliklari[baslangic:bitis] * np.float32(self._terim_olcekleri[terim_id] * sayi))
+        if not dokumanlar:
+            return np.zeros(self.doc_sayisi, dtype=np.float64)
+        return np.bincount(np.concatenate(dokumanlar), weights=np.concatenate(agirliklar), minlength=self.doc_sayisi)
+
+    def search(self, question: str, max_results: int = 5, kanun_no: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Soruya en uygun maddeleri BM25 skoruna göre döndürür"""
+        skorlar = self._bm25(question)
+        if kanun_no:
+            kanun_mask = np.zeros(self.kanun_sayisi, dtype=bool)
+            kanun_mask[[i for i in map(self._resolve_kanun_id, kanun_no) if i is not None]] = True
+            skorlar[~kanun_mask[self._doc_kanunlari]] = 0.0
+
+        aday_sayisi = min(max_results, self.doc_sayisi)
+        if aday_sayisi == 0:
+            return []
+        adaylar = np.argpartition(-skorlar, aday_sayisi - 1)[:aday_sayisi]
+        adaylar = adaylar[skorlar[adaylar] > 0]
+        adaylar = adaylar[np.lexsort((adaylar, -skorlar[adaylar]))]
+        sonuc_skorlari = skorlar[adaylar]
+
+        results = []
+        for doc_id, skor in zip(adaylar.tolist(), sonuc_skorlari.tolist()):
+            kanun_no_, baslik, yayim_tarihi, gist_url = self.kanunlar[self._doc_kanunlari[doc_id]]
+            sonuc = {
+                'kanun_no': kanun_no_,
+                'baslik': baslik,
+                'madde_no': self.maddeler[doc_id],
+                'yayim_tarihi': yayim_tarihi,
+                'text': self.get_text(doc_id),
+                'similarity_score': round(skor, 4)
+            }
+            # URL'si bilinmeyen kanunlarda (yerel .txt'lerden üretilen chunk'lar) alan eklenmez
+            if gist_url:
+                sonuc['gist_url'] = gist_url
+            results.append(sonuc)
+        return results
+
+    def close(self):
+        self._get_block.cache_clear()
+        for ad in [ad for ad in vars(self) if ad.startswith('_') and isinstance(getattr(self, ad), np.ndarray)]:
+            delattr(self, ad)
+        self._mmap.close()
+        self._file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kanun .txt dosyalarından veya chunk dosyasından serverless sözcüksel indeks dosyası üretir")
+    kaynak = parser.add_mutually_exclusive_group()
+    kaynak.add_argument("--chunks", default="kanun_chunks.json", help="Chunk dosyası")
+    kaynak.add_argument("--kanun-klasoru", default=None, help="Chunk'ları bu klasördeki kanun .txt dosyalarından üret")
+    parser.add_argument("--output", default="kanun_lexical.idx", help="Yazılacak indeks dosyası")
+    parser.add_argument("--gist-links", default=None,
+                        help="Her satırında bir kanun .txt URL'si bulunan dosya (chunk'larda gist_url yoksa kullanılır)")
+    args = parser.parse_args()
+
+    if args.kanun_klasoru:
+        # kanun_processor serverless pakete girmez; yalnızca build sırasında gerekir
+        from kanun_processor import KanunProcessor
+        processor = KanunProcessor(args.kanun_klasoru)
+        processor.process_all_kanunlar()
+        # Dosya sırası dosya sistemine bağlı olmasın
+        processor.processed_kanunlar.sort(key=lambda kanun: kanun['kanun_no'])
+        chunks = processor.create_searchable_chunks()
+    else:
+        with open(args.chunks, 'r', encoding='utf-8') as f:
+            chunks = json.load(f)
+    print(f"{len(chunks)} chunk okundu.")
+
+    # URL'ler dosya adıyla eşlenir: .../01080000.txt -> 01080000
+    gist_urls = {}
+    if args.gist_links:
+        with open(args.gist_links, 'r', encoding='utf-8') as f:
+            for satir in f:
+                url = satir.strip()
+                if url:
+                    gist_urls[os.path.splitext(os.path.basename(url))[0]] = url
+
+    ozet = build_lexical_index(chunks, args.output, gist_urls=gist_urls)
+    print(f"İndeks yazıldı: {args.output}")
+    for ad, deger in ozet.items():
+        print(f"  {ad}: {deger}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Prometheus Uyumlu Metrikler
+Sayaç, gösterge ve histogram türlerini ek bağımlılık olmadan tutar ve /metrics için Prometheus
+metin biçiminde yazar. Sıcak yoldaki kayıtlar bir sözlük güncellemesi ve bisect ile sınırlıdır;
+yüklenen kanun sayısı, önbellek oranı ve RSS gibi göstergeler yalnızca okunurken hesaplanır.
+"""
+
+import os
+import resource
+import sys
+import threading
+from bisect import bisect_left
+from typing import List, Dict, Tuple, Callable, Optional, Sequence
+
+# HTTP istekleri için gecikme kovaları (saniye)
+HTTP_KOVALARI = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Arama aşamaları için daha ince kovalar (saniye)
+ASAMA_KOVALARI = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# Arama yolunun aşamaları
+ARAMA_ASAMALARI = ('encode', 'filter', 'scoring', 'rescore', 'topk', 'materialize', 'serialize')
+
+
+def process_rss_bytes() -> int:
+    """Sürecin anlık RSS değerini byte olarak döndürür"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        # /proc olmayan sistemlerde süreç boyunca görülen en yüksek değer
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    parts = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        parts.append(f'{name}="{value}"')
+    return '{' + ','.join(parts) + '}'
+
+
+class _Metric:
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç"""
+    type_name = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labelvalues, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Anlık değer; fonksiyon verilirse değer her okumada yeniden hesaplanır"""
+    type_name = 'gauge'
+
+    def __init__(self, name: str, documentation: str, fonksiyon: Optional[Callable[[], float]] = None):
+        super().__init__(name, documentation)
+        self.fonksiyon = fonksiyon
+        self._value = 0.0
+
+    def set(self, value: float):
+        self._value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    def value(self) -> float:
+        return float(self.fonksiyon()) if self.fonksiyon is not None else self._value
+
+    def render(self) -> List[str]:
+        return self.header() + [f"{self.name} {_format_value(self.value())}"]
+
+
+class Histogram(_Metric):
+    """Kova sayıları, toplam ve adet tutan histogram"""
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = HTTP_KOVALARI):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Etiket değerleri -> [kova sayıları (son eleman +Inf), toplam]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labelvalues: str) -> int:
+        series = self._series.get(labelvalues)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        labelnames = self.labelnames + ('le',)
+        for labelvalues, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bucket, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                labels = _format_labels(labelnames, labelvalues + (_format_value(bucket),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class KanunMetrics:
+    """API server'larının yayınladığı metrikler"""
+
+    def __init__(self, kanun_index=None):
+        self.metrics: List[_Metric] = []
+
+        self.http_istekleri = self._register(Counter(
+            'kanun_http_requests_total', "Route, method ve durum koduna göre HTTP istek sayısı",
+            ('method', 'route', 'status')
+        ))
+        self.http_sureleri = self._register(Histogram(
+            'kanun_http_request_duration_seconds', "Route ve method'a göre HTTP istek süresi",
+            ('method', 'route'), HTTP_KOVALARI
+        ))
+        self.arama_asamalari = self._register(Histogram(
+            'kanun_search_stage_duration_seconds', "Arama yolundaki aşamaların süresi",
+            ('stage',), ASAMA_KOVALARI
+        ))
+
+        # Arama executor'ı: sırada bekleyen ve çalışan aramalar
+        self.kuyruk_derinligi = self._register(Gauge(
+            'kanun_search_executor_queue_depth', "Arama executor'ında sırada bekleyen istek sayısı"
+        ))
+        self.calisan_aramalar = self._register(Gauge(
+            'kanun_search_executor_active', "Arama executor'ında çalışan istek sayısı"
+        ))
+        self._register(Gauge(
+            'kanun_process_resident_memory_bytes', "Sürecin RSS değeri (byte)", process_rss_bytes
+        ))
+
+        if kanun_index is not None:
+            self.bind_index(kanun_index)
+
+    def _register(self, metric: _Metric) -> _Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def bind_index(self, kanun_index):
+        """İndeks göstergelerini ekler ve arama aşamalarını histograma bağlar"""
+        def cache_hit_ratio() -> float:
+            info = kanun_index.text_store.cache_info()
+            toplam = info.hits + info.misses
+            return info.hits / toplam if toplam else 0.0
+
+        self._register(Gauge('kanun_loaded_kanunlar', "Yüklenen kanun sayısı", lambda: kanun_index.canli_kanun_sayisi))
+        self._register(Gauge('kanun_loaded_maddeler', "Yüklenen madde sayısı", lambda: kanun_index.madde_sayisi))
+        self._register(Gauge('kanun_loaded_vektorler', "Benzersiz madde vektörü sayısı", lambda: kanun_index.vektor_sayisi))
+        self._register(Gauge('kanun_tombstone_maddeler', "Compaction bekleyen silinmiş madde satırı sayısı",
+                             lambda: kanun_index.tombstone_satir_sayisi))
+        self._register(Gauge('kanun_vector_memory_bytes', "Aramada kullanılan madde vektörlerinin bellek boyutu",
+                             kanun_index.vektor_bellegi))
+        self._register(Gauge('kanun_index_version', "İndeks sürümü (her build'de artar)", lambda: kanun_index.surum))
+        self._register(Gauge('kanun_text_cache_hit_ratio', "Kanun metni blok önbelleğinin isabet oranı", cache_hit_ratio))
+        self._register(Gauge('kanun_rank_cache_entries', "Sayfalama için önbellekteki sıralanmış aday listesi sayısı",
+                             lambda: len(kanun_index.siralama_onbellegi)))
+        self._register(Gauge('kanun_rank_cache_hit_ratio', "Sıralanmış aday listesi önbelleğinin isabet oranı",
+                             kanun_index.siralama_onbellegi.hit_ratio))
+
+        kanun_index.asama_gozlemci = self.observe_stage
+
+    def observe_stage(self, asama: str, sure: float):
+        """Bir arama aşamasının süresini kaydeder"""
+        self.arama_asamalari.observe(sure, asama)
+
+    def observe_request(self, method: str, route: str, status: int, sure: float):
+        """Tamamlanan bir HTTP isteğini kaydeder"""
+        self.http_istekleri.inc(method, route, str(status))
+        self.http_sureleri.observe(sure, method, route)
+
+    def render(self) -> str:
+        """Tüm metrikleri Prometheus metin biçiminde döndürür"""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
@@ -12,8 +12,14 @@ from typing import List, Dict, Any
 from pathlib import Path
 import hashlib
 
+# Bölüm başlık satırlarındaki seviye kelimeleri ("BİRİNCİ KISIM", "İKİNCİ BÖLÜM" ...)
+BOLUM_SEVIYE_PATTERN = re.compile(r'\b(KİTAP|KISIM|BÖLÜM|BOLÜM|BAP|FASIL|KESİM)\b')
+MADDE_SATIR_PATTERN = re.compile(r'(?:Geçici |Ek )?Madde\s+\d+:')
+# Aynı satırda "Madde N:" öncesinde görülen önekler ("Ek Geçici Madde", "Mükerrer Madde" ...)
+MADDE_ONEK_PATTERN = re.compile(r'\s*(?:(?:Ek|Geçici|Geciçi|Geici|Mükerrer|Muvakkat)\s*)*')
+
 class KanunProcessor:
-    def __init__(self, kanun_folder: str):
+    def __init__(self, kanun_folder: str = "."):
         self.kanun_folder = Path(kanun_folder)
         self.processed_kanunlar = []
     
@@ -24,53 +30,155 @@ class KanunProcessor:
                 content = f.read()
             
             # Dosya adından kanun numarasını çıkar
-            kanun_no = file_path.stem
-            
-            # İlk satırdan kanun başlığını al
-            lines = content.split('\n')
-            baslik = lines[0].strip() if lines else "Bilinmeyen Kanun"
-            
-            # Tarih bilgilerini çıkar
-            tarih_pattern = r'Yayımlandığı Resmî Gazete Tarihi: (\d{2}\.\d{2}\.\d{4})'
-            tarih_match = re.search(tarih_pattern, content)
-            yayim_tarihi = tarih_match.group(1) if tarih_match else None
-            
-            # Madde numaralarını ve içeriklerini çıkar
-            maddeler = self.extract_maddeler(content)
-            
-            # Geçici maddeleri çıkar
-            gecici_maddeler = self.extract_gecici_maddeler(content)
-            
-            return {
-                'kanun_no': kanun_no,
-                'baslik': baslik,
-                'yayim_tarihi': yayim_tarihi,
-                'maddeler': maddeler,
-                'gecici_maddeler': gecici_maddeler,
-                'full_content': content,
-                'file_path': str(file_path)
-            }
+            kanun = self.parse_kanun_content(content, file_path.stem)
+            kanun['file_path'] = str(file_path)
+            return kanun
             
         except Exception as e:
             print(f"Hata: {file_path} dosyası işlenirken hata oluştu: {e}")
             return None
     
+    def parse_kanun_content(self, content: str, kanun_no: str) -> Dict[str, Any]:
+        """Ham kanun metnini parse eder"""
+        # İlk satırdan kanun başlığını al
+        lines = content.split('\n', 1)
+        baslik = lines[0].strip() if lines else "Bilinmeyen Kanun"
+        
+        # Tarih bilgilerini çıkar
+        tarih_pattern = r'Yayımlandığı Resmî Gazete Tarihi: (\d{2}\.\d{2}\.\d{4})'
+        tarih_match = re.search(tarih_pattern, content)
+        yayim_tarihi = tarih_match.group(1) if tarih_match else None
+        
+        # Madde numaralarını ve içeriklerini çıkar
+        maddeler = self.extract_maddeler(content)
+        
+        # Geçici maddeleri çıkar
+        gecici_maddeler = self.extract_gecici_maddeler(content)
+        
+        return {
+            'kanun_no': kanun_no,
+            'baslik': baslik,
+            'yayim_tarihi': yayim_tarihi,
+            'maddeler': maddeler,
+            'gecici_maddeler': gecici_maddeler,
+            'full_content': content
+        }
+    
+    def _is_bolum_satiri(self, line: str) -> bool:
+        """Büyük harfli bölüm satırı mı ("BİRİNCİ KISIM", "GİRİŞ", "GEÇİCİ HÜKÜMLER")"""
+        if not line or len(line) > 120 or len(line.split()) > 12 or '\t' in line:
+            return False
+        if line[-1] in '.:;,' or line[0] == '(':
+            return False
+        return sum(ch.isalpha() for ch in line) >= 2 and line == line.upper()
+    
+    def _is_baslik_satiri(self, line: str) -> bool:
+        """Bölüm satırından sonra gelen başlık satırı olabilir mi ("Genel Hükümler")"""
+        return (bool(line) and len(line) <= 150 and line[-1] not in '.:;,' and line[0] != '('
+                and not MADDE_SATIR_PATTERN.match(line))
+    
+    def _bolum_blogu(self, content: str, end: int, lo: int = 0):
+        """end ofsetinden hemen önce gelen başlık bloğunun başlangıç ofsetini ve satırlarını döndürür"""
+        # "Ek Madde" / "Geçici Madde" önekinin bulunduğu satırdan başla
+        line_start = content.rfind('\n', lo, end) + 1
+        if line_start > lo and MADDE_ONEK_PATTERN.fullmatch(content, line_start, end):
+            end = line_start
+        if end <= lo or content[end - 1] != '\n':
+            return end, []
+        
+        def onceki_satir(pos):
+            if pos <= lo:
+                return None, None
+            start = max(lo, content.rfind('\n', lo, pos - 1) + 1)
+            return start, content[start:pos - 1].strip()
+        
+        satirlar = []
+        blok_baslangic = end
+        pos = end
+        while True:
+            start, line = onceki_satir(pos)
+            if start is None:
+                break
+            if self._is_bolum_satiri(line):
+                satirlar.append(line)
+                blok_baslangic = pos = start
+                continue
+            # Başlık satırı yalnızca bir bölüm satırından sonra geliyorsa kabul edilir
+            onceki_start, onceki = onceki_satir(start)
+            if onceki_start is not None and self._is_baslik_satiri(line) and self._is_bolum_satiri(onceki):
+                satirlar.extend([line, onceki])
+                blok_baslangic = pos = onceki_start
+                continue
+            break
+        
+        satirlar.reverse()
+        return blok_baslangic, satirlar
+    
+    def _bolum_yolu(self, satirlar: List[str]) -> List[Dict[str, str]]:
+        """Başlık bloğu satırlarını (ad, başlık) çiftlerine gruplar"""
+        yol = []
+        for line in satirlar:
+            if BOLUM_SEVIYE_PATTERN.search(line) or not yol or (yol[-1]['baslik'] is not None and self._is_bolum_satiri(line)):
+                yol.append({'ad': line, 'baslik': None})
+            elif yol[-1]['baslik'] is None:
+                yol[-1]['baslik'] = line
+            else:
+                yol[-1]['baslik'] += ' ' + line
+        return yol
+    
+    def _madde_from_match(self, match, content: str) -> Dict[str, Any]:
+        """Regex eşleşmesinden madde kaydı oluşturur (metin içindeki ofsetlerle)"""
+        # Sonraki maddenin bölüm başlıkları bu maddenin metnine dahil edilmez
+        icerik_bitis, _ = self._bolum_blogu(content, match.end(2), match.start(2))
+        madde_icerik = content[match.start(2):icerik_bitis]
+        
+        # Madde içeriğini temizle
+        stripped = madde_icerik.strip()
+        if not stripped:
+            return None
+        
+        # "Geçici Madde" / "Ek Madde" başlıklarından madde türünü belirle
+        onek = content[max(0, match.start() - 16):match.start()]
+        tur_match = re.search(r'(Geçici|Ek)\s+$', onek)
+        if not tur_match:
+            madde_turu = 'normal'
+        elif tur_match.group(1) == 'Geçici':
+            madde_turu = 'gecici'
+        else:
+            madde_turu = 'ek'
+        
+        # Maddeden önce tekrarlanan bölüm yolu ("BİRİNCİ KISIM / Genel Hükümler" ...)
+        satir_baslangic = content.rfind('\n', 0, match.start()) + 1
+        _, bolum_satirlari = self._bolum_blogu(content, satir_baslangic)
+        
+        # "Madde 0001: Kanunun şümulü" satırındaki kısa metin madde başlığıdır
+        satir_sonu = content.find('\n', match.start())
+        ilk_satir = content[match.end(1) + 1:satir_sonu if satir_sonu != -1 else len(content)].strip()
+        madde_basligi = None
+        if ilk_satir and len(ilk_satir) <= 120 and ilk_satir[-1] != '.' and ilk_satir[0] != '(':
+            madde_basligi = ilk_satir
+        
+        baslangic = match.start(2) + len(madde_icerik) - len(madde_icerik.lstrip())
+        return {
+            'madde_no': int(match.group(1)),
+            'madde_turu': madde_turu,
+            'madde_basligi': madde_basligi,
+            'bolum_yolu': self._bolum_yolu(bolum_satirlari),
+            'icerik': stripped,
+            'baslangic': baslangic,
+            'bitis': baslangic + len(stripped)
+        }
+    
     def extract_maddeler(self, content: str) -> List[Dict[str, str]]:
         """Kanun metninden maddeleri çıkarır"""
         maddeler = []
         
         # Madde pattern'i: "Madde 0001:" veya "Madde 1:"
         madde_pattern = r'Madde\s+(\d+):\s*(.*?)(?=Madde\s+\d+:|Geçici Madde|$)'
-        matches = re.findall(madde_pattern, content, re.DOTALL)
-        
-        for madde_no, madde_icerik in matches:
-            # Madde içeriğini temizle
-            madde_icerik = madde_icerik.strip()
-            if madde_icerik:
-                maddeler.append({
-                    'madde_no': int(madde_no),
-                    'icerik': madde_icerik
-                })
+        for match in re.finditer(madde_pattern, content, re.DOTALL):
+            madde = self._madde_from_match(match, content)
+            if madde:
+                maddeler.append(madde)
         
         return maddeler
     
@@ -80,15 +188,11 @@ class KanunProcessor:
         
         # Geçici madde pattern'i
         gecici_pattern = r'Geçici Madde\s+(\d+):\s*(.*?)(?=Geçici Madde\s+\d+:|Madde\s+\d+:|$)'
-        matches = re.findall(gecici_pattern, content, re.DOTALL)
-        
-        for madde_no, madde_icerik in matches:
-            madde_icerik = madde_icerik.strip()
-            if madde_icerik:
-                gecici_maddeler.append({
-                    'madde_no': int(madde_no),
-                    'icerik': madde_icerik
-                })
+        for match in re.finditer(gecici_pattern, content, re.DOTALL):
+            madde = self._madde_from_match(match, content)
+            if madde:
+                madde['madde_turu'] = 'gecici'
+                gecici_maddeler.append(madde)
         
         return gecici_maddeler
     
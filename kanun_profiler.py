@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+İstek Profilleme, Yavaş Sorgu ve Sorgu Kaydı
+Her /ask isteği için arama aşamalarının sürelerini toplar. Debug modu açıkken bu süreler cevaba
+eklenir; eşiği aşan istekler parametreleri, aşama süreleri ve (örnekleniyorsa) stack örnekleriyle
+birlikte dönen (rotating) bir JSON satırları dosyasına yazılır. Isınma için sorular süreden bağımsız
+olarak (isteğe bağlı örneklenerek) ayrı bir dönen sorgu kaydına yazılır.
+"""
+
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Dict, Any, Optional
+
+
+class SorguProfili:
+    """Tek bir isteğin aşama süreleri ve stack örnekleri"""
+    __slots__ = ('baslangic', 'asamalar', 'stack_ornekle', 'stack_ornekleri')
+
+    def __init__(self, stack_ornekle: bool = False):
+        self.baslangic = time.perf_counter()
+        self.asamalar: Dict[str, float] = {}
+        self.stack_ornekle = stack_ornekle
+        self.stack_ornekleri: Optional[Counter] = None
+
+    def ekle(self, asama: str, sure: float):
+        """Aşama süresini ekler (aynı aşama birden fazla çalışırsa toplanır)"""
+        self.asamalar[asama] = self.asamalar.get(asama, 0.0) + sure
+
+    @property
+    def toplam_ms(self) -> float:
+        return (time.perf_counter() - self.baslangic) * 1000
+
+    def rapor(self) -> Dict[str, Any]:
+        """Aşama sürelerini milisaniye olarak döndürür"""
+        return {
+            'asamalar_ms': {asama: round(sure * 1000, 3) for asama, sure in self.asamalar.items()},
+            'toplam_ms': round(self.toplam_ms, 3)
+        }
+
+
+class StackOrnekleyici:
+    """Bir thread'in stack'ini belirli aralıklarla örnekler ve katlanmış (collapsed) stack'leri sayar"""
+
+    def __init__(self, thread_id: int, aralik_ms: float = 5.0, max_derinlik: int = 40):
+        self.thread_id = thread_id
+        self.aralik = aralik_ms / 1000
+        self.max_derinlik = max_derinlik
+        self.ornekler: Counter = Counter()
+        self._durdur = threading.Event()
+        self._thread = threading.Thread(target=self._calistir, daemon=True)
+
+    def _stack(self, frame) -> str:
+        cerceveler = []
+        while frame is not None and len(cerceveler) < self.max_derinlik:
+            code = frame.f_code
+            cerceveler.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+            frame = frame.f_back
+        return ';'.join(reversed(cerceveler))
+
+    def _calistir(self):
+        while not self._durdur.wait(self.aralik):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.ornekler[self._stack(frame)] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._durdur.set()
+        self._thread.join()
+        return self.ornekler
+
+
+class SorguProfilleyici:
+    def __init__(self, log_path: str = "slow_queries.log", esik_ms: float = 1000.0,
+                 debug_izinli: bool = False, stack_orani: float = 0.0, stack_araligi_ms: float = 5.0,
+                 max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5, max_stack: int = 20,
+                 sorgu_log_path: str = "queries.log", sorgu_orani: float = 1.0):
+        self.log_path = log_path
+        self.esik_ms = esik_ms
+        # Tüm soruların (sorgu_orani ile örneklenen) kaydı; ısınma sorguları buradan okunur
+        self.sorgu_log_path = sorgu_log_path
+        self.sorgu_orani = sorgu_orani
+        self.debug_izinli = debug_izinli
+        self.stack_orani = stack_orani
+        self.stack_araligi_ms = stack_araligi_ms
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.max_stack = max_stack
+
+        # Aktif profil, aramanın çalıştığı thread'e bağlıdır
+        self._yerel = threading.local()
+        self._logger: Optional[logging.Logger] = None
+        self._sorgu_logger: Optional[logging.Logger] = None
+
+    @classmethod
+    def from_env(cls) -> "SorguProfilleyici":
+        """Ayarları ortam değişkenlerinden okur"""
+        return cls(
+            log_path=os.getenv("SLOW_QUERY_LOG", "slow_queries.log"),
+            esik_ms=float(os.getenv("SLOW_QUERY_MS", 1000)),
+            debug_izinli=os.getenv("KANUN_DEBUG_IZINLI", "0").lower() in ("1", "true", "yes"),
+            stack_orani=float(os.getenv("SLOW_QUERY_STACK_ORANI", 0)),
+            stack_araligi_ms=float(os.getenv("SLOW_QUERY_STACK_ARALIGI_MS", 5)),
+            sorgu_log_path=os.getenv("QUERY_LOG", "queries.log"),
+            sorgu_orani=float(os.getenv("QUERY_LOG_ORANI", 1))
+        )
+
+    def bind_index(self, kanun_index):
+        """İndeksin aşama gözlemcisini, aktif profile de yazacak şekilde sarar"""
+        onceki = kanun_index.asama_gozlemci
+        yerel = self._yerel
+
+        def gozlemci(asama: str, sure: float):
+            if onceki is not None:
+                onceki(asama, sure)
+            profil = getattr(yerel, 'profil', None)
+            if profil is not None:
+                profil.ekle(asama, sure)
+
+        kanun_index.asama_gozlemci = gozlemci
+
+    def debug_istendi(self, header: Optional[str], query: Optional[str]) -> bool:
+        """Debug modu header veya query ile istendi ve ayarlarda izin verildiyse True döner"""
+        if not self.debug_izinli:
+            return False
+        return any(deger is not None and deger.lower() in ("1", "true", "yes") for deger in (header, query))
+
+    def yeni_profil(self) -> SorguProfili:
+        """Yeni bir istek profili oluşturur (stack örneklemesi orana göre seçilir)"""
+        return SorguProfili(stack_ornekle=self.stack_orani > 0 and random.random() < self.stack_orani)
+
+    @contextmanager
+    def aktif(self, profil: SorguProfili):
+        """Profili çağıran thread'de aktif yapar; gerekirse stack örneklemesini başlatır"""
+        self._yerel.profil = profil
+        ornekleyici = None
+        if profil.stack_ornekle:
+            ornekleyici = StackOrnekleyici(threading.get_ident(), self.stack_araligi_ms).start()
+        try:
+            yield profil
+        finally:
+            self._yerel.profil = None
+            if ornekleyici is not None:
+                profil.stack_ornekleri = ornekleyici.stop()
+
+    def _dosya_logger(self, ad: str, log_path: str) -> logging.Logger:
+        """Dönen dosyaya JSON satırları yazan logger oluşturur"""
+        logger = logging.getLogger(f"kanun.{ad}.{id(self)}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        handler = RotatingFileHandler(log_path, maxBytes=self.max_bytes, backupCount=self.backup_count, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        return logger
+
+    def _get_logger(self) -> logging.Logger:
+        """Yavaş sorgu logger'ını ilk yavaş sorguda oluşturur"""
+        if self._logger is None:
+            self._logger = self._dosya_logger('slow_query', self.log_path)
+        return self._logger
+
+    def kaydet(self, profil: SorguProfili, parametreler: Dict[str, Any]) -> bool:
+        """İstek eşiği aştıysa yavaş sorgu dosyasına yazar"""
+        toplam_ms = profil.toplam_ms
+        if toplam_ms < self.esik_ms:
+            return False
+
+        kayit = {
+            'zaman': datetime.now(timezone.utc).isoformat(),
+            'toplam_ms': round(toplam_ms, 3),
+            'parametreler': parametreler,
+            'asamalar_ms': profil.rapor()['asamalar_ms']
+        }
+        if profil.stack_ornekleri:
+            kayit['stack_ornekleri'] = dict(profil.stack_ornekleri.most_common(self.max_stack))
+
+        self._get_logger().info(json.dumps(kayit, ensure_ascii=False))
+        return True
+
+    def sorgu_kaydet(self, parametreler: Dict[str, Any]) -> bool:
+        """İsteği süresinden bağımsız olarak (sorgu_orani ile örneklenerek) sorgu kaydına yazar"""
+        if not self.sorgu_log_path or self.sorgu_orani <= 0:
+            return False
+        if self.sorgu_orani < 1 and random.random() >= self.sorgu_orani:
+            return False
+
+        if self._sorgu_logger is None:
+            self._sorgu_logger = self._dosya_logger('query', self.sorgu_log_path)
+        kayit = {'zaman': datetime.now(timezone.utc).isoformat(), 'parametreler': parametreler}
+        self._sorgu_logger.info(json.dumps(kayit, ensure_ascii=False))
+        return True
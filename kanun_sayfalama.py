@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sonuç Sayfalama
+/ask sonuçları için opak cursor'lar ve sıralanmış aday listelerini kısa süre tutan sınırlı önbellek.
+Cursor sorguyu, filtreleri, sayfa konumunu ve indeks sürümünü taşır; sonraki sayfalar önbellekteki
+sıralamadan yeniden encode veya skorlama yapılmadan kesilir. Önbellekten düşen bir sıralama cursor'daki
+sorguyla yeniden hesaplanır; indeks yeniden kurulduysa eski cursor'lar geçersizdir.
+"""
+
+import base64
+import binascii
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Hashable, Sequence
+
+
+class CursorHatasi(ValueError):
+    """Çözülemeyen veya indeksin eski bir sürümüne ait cursor"""
+
+
+def encode_cursor(veri: Dict[str, Any]) -> str:
+    """Sayfa bilgisini URL'de kullanılabilir opak bir metne çevirir"""
+    ham = json.dumps(veri, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(ham).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, gerekli_alanlar: Sequence[str] = (), metin_alanlari: Sequence[str] = (),
+                  tamsayi_alanlari: Sequence[str] = (),
+                  sozluk_alanlari: Optional[Dict[str, Sequence[str]]] = None) -> Dict[str, Any]:
+    """Opak cursor'ı sayfa bilgisine çevirir
+
+    Gerekli alanlardan biri yoksa, metin alanları str, tamsayı alanları negatif olmayan int değilse
+    veya sözlük alanları izin verilen anahtarlar dışında anahtar içeriyorsa CursorHatasi verir.
+    """
+    try:
+        ham = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        veri = json.loads(ham.decode('utf-8'))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise CursorHatasi("Geçersiz cursor")
+    if not isinstance(veri, dict) or any(alan not in veri for alan in gerekli_alanlar):
+        raise CursorHatasi("Geçersiz cursor")
+    if any(alan in veri and not isinstance(veri[alan], str) for alan in metin_alanlari):
+        raise CursorHatasi("Geçersiz cursor")
+    # bool da int'tir; cursor'da yalnızca gerçek tamsayılar kabul edilir
+    for alan in tamsayi_alanlari:
+        if alan in veri and (type(veri[alan]) is not int or veri[alan] < 0):
+            raise CursorHatasi("Geçersiz cursor")
+    for alan, izinli in (sozluk_alanlari or {}).items():
+        if alan in veri and (not isinstance(veri[alan], dict) or not set(veri[alan]) <= set(izinli)):
+            raise CursorHatasi("Geçersiz cursor")
+    return veri
+
+
+class SiralamaOnbellegi:
+    """Sıralanmış aday listelerini kayıt sayısı ve yaşa göre sınırlı tutan LRU önbellek"""
+
+    def __init__(self, max_kayit: int = 256, ttl_saniye: float = 300.0):
+        self.max_kayit = max_kayit
+        self.ttl_saniye = ttl_saniye
+        self.hits = 0
+        self.misses = 0
+        self._kayitlar: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        # Aramalar executor thread'lerinde çalışır
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._kayitlar)
+
+    def get(self, anahtar: Hashable) -> Optional[Any]:
+        """Süresi dolmamış kaydı döndürür ve en yeni kullanılan olarak işaretler"""
+        with self._lock:
+            kayit = self._kayitlar.get(anahtar)
+            if kayit is None or time.monotonic() - kayit[0] > self.ttl_saniye:
+                if kayit is not None:
+                    del self._kayitlar[anahtar]
+                self.misses += 1
+                return None
+            self._kayitlar.move_to_end(anahtar)
+            self.hits += 1
+            return kayit[1]
+
+    def put(self, anahtar: Hashable, deger: Any):
+        """Kaydı ekler; sınır aşılırsa en eski kullanılan kayıtları atar"""
+        with self._lock:
+            self._kayitlar[anahtar] = (time.monotonic(), deger)
+            self._kayitlar.move_to_end(anahtar)
+            while len(self._kayitlar) > self.max_kayit:
+                self._kayitlar.popitem(last=False)
+
+    def temizle(self):
+        with self._lock:
+            self._kayitlar.clear()
+
+    def hit_ratio(self) -> float:
+        toplam = self.hits + self.misses
+        return self.hits / toplam if toplam else 0.0
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sorguya Göre Madde Pencereleri (Snippet)
+Madde metinlerindeki kelimelerin ofsetleri ve terimleri benzersiz metin başına sütunlarda tutulur.
+Bir sonucun snippet'i metin yeniden taranmadan bu dizilerden bulunur: sorgu terimlerinin idf ağırlıklı
+eşleşmelerini en çok içeren kelime penceresi seçilir ve eşleşen kelimeler pencere içindeki ofsetleriyle
+vurgu aralığı olarak döner.
+
+Terimler kanun_lexical_index ile aynıdır (ASCII'ye katlanmış ilk 5 karakter); "sözleşmesinin" sorgusu
+"sözleşme" kelimesini de vurgular.
+"""
+
+import math
+import re
+from array import array
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from kanun_baslik_arama import ascii_katla, turkce_kucuk
+from kanun_lexical_index import ONEK_UZUNLUGU, terimler
+
+# En az iki karakterli kelimeler (kanun_lexical_index.terimler ile aynı)
+KELIME_PATTERN = re.compile(r'\w\w+')
+
+# Kelime uzunlukları uint8 tutulur; daha uzun kelimelerin vurgusu bu uzunlukta kesilir
+MAX_KELIME_UZUNLUGU = 255
+
+
+class KelimeOfsetleri:
+    """Metin başına kelime ofsetleri, uzunlukları ve terim id'leri (CSR)
+
+    Metin m'nin kelimeleri baslangiclar/uzunluklar/terimler[ptr[m]:ptr[m + 1]] aralığındadır; ofsetler
+    metin içindeki karakter konumlarıdır. Metinler yalnızca sona eklenir.
+    """
+
+    def __init__(self):
+        self.ptr = array('q', [0])
+        self.baslangiclar = array('I')
+        self.uzunluklar = array('B')
+        self.terimler = array('i')
+        # Terim başına terimi içeren metin sayısı (idf için)
+        self.terim_df = array('i')
+        self._terim_ids: Dict[str, int] = {}
+        # Kelime -> terim id önbelleği (katlama her kelime için bir kez yapılır)
+        self._kelime_terimleri: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ptr) - 1
+
+    @property
+    def kelime_sayisi(self) -> int:
+        return len(self.terimler)
+
+    @property
+    def terim_sayisi(self) -> int:
+        return len(self.terim_df)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(sutun.itemsize * len(sutun) for sutun in
+                   (self.ptr, self.baslangiclar, self.uzunluklar, self.terimler, self.terim_df))
+
+    def kopya(self) -> 'KelimeOfsetleri':
+        """Canlı güncellemelerde gölge indeksin ekleme yapacağı kopya"""
+        kopya = KelimeOfsetleri()
+        for ad, deger in vars(self).items():
+            setattr(kopya, ad, deger[:] if isinstance(deger, array) else dict(deger))
+        return kopya
+
+    def _terim_id(self, terim: str) -> int:
+        terim_id = self._terim_ids.get(terim)
+        if terim_id is None:
+            terim_id = self._terim_ids[terim] = len(self._terim_ids)
+            self.terim_df.append(0)
+        return terim_id
+
+    def _tara(self, metin: str) -> Tuple[List[int], List[int], List[int]]:
+        """Metnin kelime başlangıçlarını, uzunluklarını ve terim id'lerini döndürür"""
+        # Küçük harfe çevirme uzunluğu değiştirmediyse ofsetler küçük harfli metinde bulunur
+        kucuk = turkce_kucuk(metin)
+        eslesmeler = list(KELIME_PATTERN.finditer(kucuk if len(kucuk) == len(metin) else metin))
+        kelimeler = list(map(re.Match.group, eslesmeler))
+        for kelime in set(kelimeler).difference(self._kelime_terimleri):
+            self._kelime_terimleri[kelime] = self._terim_id(ascii_katla(kelime)[:ONEK_UZUNLUGU])
+        return (list(map(re.Match.start, eslesmeler)),
+                [min(len(kelime), MAX_KELIME_UZUNLUGU) for kelime in kelimeler],
+                list(map(self._kelime_terimleri.__getitem__, kelimeler)))
+
+    def ekle(self, metin: str):
+        """Metnin kelimelerini sona ekler"""
+        baslangiclar, uzunluklar, terim_ids = self._tara(metin)
+        for terim_id in set(terim_ids):
+            self.terim_df[terim_id] += 1
+        self.baslangiclar.extend(baslangiclar)
+        self.uzunluklar.extend(uzunluklar)
+        self.terimler.extend(terim_ids)
+        self.ptr.append(len(self.terimler))
+
+    def suz(self, metin_ids: np.ndarray, yeni_metinler: Optional[Dict[int, str]] = None) -> 'KelimeOfsetleri':
+        """Verilen metinlerden (sırasıyla) yeni bir tablo oluşturur; yeni_metinler'deki konumlar yeniden taranır
+
+        Terim sözlüğü korunur, belge frekansları kalan metinlerden yeniden hesaplanır.
+        """
+        yeni = KelimeOfsetleri()
+        yeni._terim_ids = dict(self._terim_ids)
+        yeni._kelime_terimleri = dict(self._kelime_terimleri)
+        yeni.terim_df = self.terim_df[:]
+        taranan = {sira: yeni._tara(metin) for sira, metin in (yeni_metinler or {}).items()}
+
+        # Metinlerin kelimeleri tek seferde toplanır; yeniden taranan metinlerin aralıkları sonra doldurulur
+        ptr = np.frombuffer(self.ptr, dtype=np.int64)
+        metin_ids = np.asarray(metin_ids, dtype=np.int64)
+        kaynak_bas = ptr[metin_ids]
+        kelime_sayilari = ptr[metin_ids + 1] - kaynak_bas
+        for sira, (baslangiclar, _, _) in taranan.items():
+            kelime_sayilari[sira] = len(baslangiclar)
+        yeni_ptr = np.zeros(len(metin_ids) + 1, dtype=np.int64)
+        np.cumsum(kelime_sayilari, out=yeni_ptr[1:])
+        kaynak = np.arange(yeni_ptr[-1]) + np.repeat(kaynak_bas - yeni_ptr[:-1], kelime_sayilari)
+        for sira in taranan:
+            kaynak[yeni_ptr[sira]:yeni_ptr[sira + 1]] = 0
+
+        sutunlar = []
+        for ad, dtype in (('baslangiclar', np.uint32), ('uzunluklar', np.uint8), ('terimler', np.int32)):
+            sutun = np.frombuffer(getattr(self, ad), dtype=dtype)[kaynak]
+            for sira, degerler in taranan.items():
+                sutun[yeni_ptr[sira]:yeni_ptr[sira + 1]] = degerler[len(sutunlar)]
+            getattr(yeni, ad).frombytes(sutun.tobytes())
+            sutunlar.append(sutun)
+        yeni.ptr = array('q', yeni_ptr.tobytes())
+
+        # Belge frekansı: (metin, terim) çiftleri bir kez sayılır
+        terim_sayisi = len(yeni.terim_df)
+        metinler = np.repeat(np.arange(len(metin_ids), dtype=np.int64), kelime_sayilari)
+        ciftler = np.sort(metinler * terim_sayisi + sutunlar[2])
+        tekil = np.ones(len(ciftler), dtype=bool)
+        tekil[1:] = ciftler[1:] != ciftler[:-1]
+        ciftler = ciftler[tekil]
+        df = np.bincount(ciftler % terim_sayisi, minlength=terim_sayisi) if terim_sayisi else []
+        yeni.terim_df = array('i', np.asarray(df, dtype=np.int32).tobytes())
+        return yeni
+
+    def sorgu_agirliklari(self, sorgu: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Sorgunun tabloda geçen terimlerini (sıralı id'ler) ve idf ağırlıklarını döndürür"""
+        terim_ids = sorted({self._terim_ids[terim] for terim in terimler(sorgu) if terim in self._terim_ids})
+        if not terim_ids:
+            return None
+        metin_sayisi = max(len(self), 1)
+        idf = [math.log(1 + metin_sayisi / max(self.terim_df[terim_id], 1)) for terim_id in terim_ids]
+        return np.array(terim_ids, dtype=np.int32), np.array(idf, dtype=np.float32)
+
+    def pencere(self, metin_id: int, agirliklar: Optional[Tuple[np.ndarray, np.ndarray]],
+                kelime_sayisi: int) -> Tuple[int, int, List[Tuple[int, int]]]:
+        """Sorgu eşleşmelerini en çok içeren pencerenin karakter aralığını ve vurgularını döndürür
+
+        Dönen bitiş metnin son kelimesinde -1'dir (pencere metnin sonuna kadar uzanır); vurgular
+        metin içindeki (başlangıç, bitiş) ofsetleridir.
+        """
+        bas, son = self.ptr[metin_id], self.ptr[metin_id + 1]
+        n = son - bas
+        if not n:
+            return 0, -1, []
+        baslangiclar = np.frombuffer(self.baslangiclar, dtype=np.uint32)[bas:son]
+        uzunluklar = np.frombuffer(self.uzunluklar, dtype=np.uint8)[bas:son]
+
+        eslesen = np.zeros(n, dtype=bool)
+        skorlar = np.zeros(n, dtype=np.float32)
+        if agirliklar is not None:
+            terim_ids, idf = agirliklar
+            metin_terimleri = np.frombuffer(self.terimler, dtype=np.int32)[bas:son]
+            konumlar = np.minimum(np.searchsorted(terim_ids, metin_terimleri), len(terim_ids) - 1)
+            eslesen = terim_ids[konumlar] == metin_terimleri
+            skorlar = np.where(eslesen, idf[konumlar], 0)
+
+        # Kayan pencere toplamları; en iyi pencere eşleşmeleri ortalayacak şekilde kaydırılır
+        w = min(kelime_sayisi, n)
+        toplamlar = np.cumsum(np.concatenate(([0], skorlar)))
+        ilk = int(np.argmax(toplamlar[w:] - toplamlar[:-w]))
+        penceredekiler = np.flatnonzero(eslesen[ilk:ilk + w])
+        if len(penceredekiler):
+            orta = ilk + (int(penceredekiler[0]) + int(penceredekiler[-1])) // 2
+            ilk = min(max(orta - w // 2, 0), n - w)
+        else:
+            ilk = 0
+        son_kelime = ilk + w - 1
+
+        karakter_bas = 0 if ilk == 0 else int(baslangiclar[ilk])
+        karakter_son = -1 if son_kelime == n - 1 else int(baslangiclar[son_kelime]) + int(uzunluklar[son_kelime])
+        vurgular = [(int(baslangiclar[i]), int(baslangiclar[i]) + int(uzunluklar[i]))
+                    for i in np.flatnonzero(eslesen[ilk:son_kelime + 1]) + ilk]
+        return karakter_bas, karakter_son, vurgular
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sıkıştırılmış Kanun Metni Deposu
+Her kanunun ham metni ayrı bir zlib bloğu olarak tek bir dosyaya yazılır ve dosya mmap ile açılır.
+Bloklar yalnızca bir madde metnine ihtiyaç duyulduğunda açılır; sık kullanılan bloklar küçük bir
+LRU önbelleğinde tutulur.
+"""
+
+import mmap
+import tempfile
+import zlib
+from array import array
+from functools import lru_cache
+from typing import Optional
+
+
+class KanunTextStore:
+    def __init__(self, path: Optional[str] = None, cache_size: int = 64, compression_level: int = 6):
+        self.path = path
+        self.compression_level = compression_level
+
+        # Yol verilmezse diskte isimsiz geçici bir dosya kullanılır
+        if path:
+            self._file = open(path, 'w+b')
+        else:
+            self._file = tempfile.TemporaryFile(prefix='kanun_metinleri_')
+
+        # Blok id = sıra numarası
+        self.block_offsets = array('q')
+        self.block_lengths = array('q')
+        self.block_raw_lengths = array('q')
+        self.raw_bytes = 0
+        self._size = 0
+        self._mmap = None
+        self._mapped_size = 0
+
+        # Açılmış blokların LRU önbelleği
+        self._get_block = lru_cache(maxsize=cache_size)(self._decompress_block)
+
+    def __len__(self) -> int:
+        return len(self.block_offsets)
+
+    @property
+    def compressed_bytes(self) -> int:
+        return self._size
+
+    def add(self, content: str) -> int:
+        """Ham metni sıkıştırıp dosyanın sonuna ekler ve blok id'sini döndürür"""
+        encoded = content.encode('utf-8')
+        compressed = zlib.compress(encoded, self.compression_level)
+
+        self._file.seek(self._size)
+        self._file.write(compressed)
+
+        self.block_offsets.append(self._size)
+        self.block_lengths.append(len(compressed))
+        self.block_raw_lengths.append(len(encoded))
+        self._size += len(compressed)
+        self.raw_bytes += len(encoded)
+        return len(self.block_offsets) - 1
+
+    def kopyala(self, kaynak: 'KanunTextStore', block_id: int) -> int:
+        """Başka bir depodaki bloğu açmadan (sıkıştırılmış haliyle) sona ekler"""
+        kaynak._ensure_mapped()
+        offset = kaynak.block_offsets[block_id]
+        compressed = kaynak._mmap[offset:offset + kaynak.block_lengths[block_id]]
+
+        self._file.seek(self._size)
+        self._file.write(compressed)
+
+        self.block_offsets.append(self._size)
+        self.block_lengths.append(len(compressed))
+        self.block_raw_lengths.append(kaynak.block_raw_lengths[block_id])
+        self._size += len(compressed)
+        self.raw_bytes += kaynak.block_raw_lengths[block_id]
+        return len(self.block_offsets) - 1
+
+    def sync(self):
+        """Eklenen blokları okunabilir hale getirir (ilk okumayı beklemeden yeniden map eder)"""
+        self._ensure_mapped()
+
+    def _ensure_mapped(self):
+        """Yeni bloklar eklendiyse dosyayı yeniden map eder
+
+        Eski map kapatılmaz; onu okumakta olan thread'ler bitince serbest kalır. Bu sayede canlı
+        güncellemeler okuyucular varken sona blok ekleyebilir.
+        """
+        if self._mmap is not None and self._mapped_size == self._size:
+            return
+
+        self._file.flush()
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_size = self._size
+
+    def _decompress_block(self, block_id: int) -> str:
+        """Tek bir bloğu açar ve metin olarak döndürür"""
+        offset = self.block_offsets[block_id]
+        end = offset + self.block_lengths[block_id]
+        # Yalnızca henüz map edilmemiş bir blok istendiğinde yeniden map edilir
+        if end > self._mapped_size:
+            self._ensure_mapped()
+        return zlib.decompress(self._mmap[offset:end]).decode('utf-8')
+
+    def get_content(self, block_id: int) -> str:
+        """Bir kanunun ham metnini döndürür"""
+        return self._get_block(block_id)
+
+    def get_text(self, block_id: int, start: int, end: int) -> str:
+        """Bir kanun metninden verilen aralığı keser"""
+        return self._get_block(block_id)[start:end]
+
+    def cache_info(self):
+        """LRU önbellek istatistiklerini döndürür"""
+        return self._get_block.cache_info()
+
+    def close(self):
+        """Dosyayı ve map'i kapatır"""
+        self._get_block.cache_clear()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP Yanıt Katmanı
+İndeksten türetilen GET yanıtları için indeks etiketine bağlı güçlü ETag'ler (değişmeyen yanıtlar
+endpoint çalıştırılmadan 304 döner), eşik üzerindeki yanıtlar için Accept-Encoding'e göre brotli
+veya gzip sıkıştırma ve orjson varsa daha hızlı JSON serileştirme.
+"""
+
+import gzip
+import hashlib
+from typing import Callable, Iterable, List, Optional, Tuple
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as HizliJSONResponse
+except ImportError:
+    orjson = None
+    HizliJSONResponse = JSONResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Sıkıştırılan içerik türleri
+SIKISTIRILABILIR = (b'application/json', b'text/')
+
+# Sıkıştırma middleware'inin güçlü ETag'lere eklediği kodlama ekleri
+KODLAMA_EKLERI = ('-br', '-gzip')
+
+
+def json_yaniti(body, status_code: int = 200) -> JSONResponse:
+    """Yanıtı orjson varsa onunla, yoksa standart json ile serileştirir"""
+    return HizliJSONResponse(body, status_code=status_code)
+
+
+def kodlama_sec(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding başlığından desteklenen en iyi kodlamayı seçer (q=0 olanlar hariç)"""
+    kabul = {}
+    for parca in accept_encoding.split(','):
+        ad, _, parametre = parca.strip().partition(';')
+        q = 1.0
+        if parametre.strip().startswith('q='):
+            try:
+                q = float(parametre.strip()[2:])
+            except ValueError:
+                q = 0.0
+        kabul[ad.strip().lower()] = q
+
+    adaylar = (['br'] if brotli is not None else []) + ['gzip']
+    for kodlama in adaylar:
+        if kabul.get(kodlama, kabul.get('*', 0.0)) > 0:
+            return kodlama
+    return None
+
+
+def _basliklar(scope) -> dict:
+    return {ad.decode('latin-1'): deger.decode('latin-1') for ad, deger in scope['headers']}
+
+
+def eslesen_etag(if_none_match: str, etag: str) -> Optional[str]:
+    """If-None-Match içinde (kodlama eki çıkarılmış hâliyle) etag'e eşleşen değeri döndürür"""
+    for deger in if_none_match.split(','):
+        deger = deger.strip()
+        if deger == '*':
+            return f'"{etag}"'
+        etiket = (deger[2:] if deger.startswith('W/') else deger).strip('"')
+        for ek in KODLAMA_EKLERI:
+            if etiket.endswith(ek):
+                etiket = etiket[:-len(ek)]
+                break
+        if etiket == etag:
+            return deger
+    return None
+
+
+class ETagMiddleware:
+    """Belirtilen öneklerdeki GET yanıtlarına indeks etiketi ve URL'den türetilen güçlü ETag ekler
+
+    Yanıt yalnızca indeks içeriğine ve URL'ye bağlı olduğundan eşleşen If-None-Match endpoint
+    çalıştırılmadan 304 ile cevaplanır.
+    """
+
+    def __init__(self, app, etiket: Callable[[], str], onekler: Iterable[str] = ('/kanunlar', '/amendments')):
+        self.app = app
+        self.etiket = etiket
+        self.onekler = tuple(onekler)
+
+    def _etag(self, scope) -> str:
+        ozet = hashlib.blake2b(digest_size=8)
+        ozet.update(self.etiket().encode('utf-8'))
+        ozet.update(scope['path'].encode('utf-8'))
+        ozet.update(b'?' + scope.get('query_string', b''))
+        return ozet.hexdigest()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD') or not scope['path'].startswith(self.onekler):
+            await self.app(scope, receive, send)
+            return
+
+        etag = self._etag(scope)
+        if_none_match = _basliklar(scope).get('if-none-match')
+        eslesen = eslesen_etag(if_none_match, etag) if if_none_match else None
+        if eslesen:
+            # İstemcinin elindeki temsilin (kodlama ekiyle) etiketi geri gönderilir
+            await send({'type': 'http.response.start', 'status': 304,
+                        'headers': [(b'etag', eslesen.encode('latin-1')), (b'cache-control', b'no-cache')]})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        async def etag_ekle(message):
+            # Hata yanıtları önbelleğe alınmaz
+            if message['type'] == 'http.response.start' and message['status'] == 200:
+                message['headers'] = list(message.get('headers', [])) + [
+                    (b'etag', f'"{etag}"'.encode('latin-1')), (b'cache-control', b'no-cache')]
+            await send(message)
+
+        await self.app(scope, receive, etag_ekle)
+
+
+class SikistirmaMiddleware:
+    """minimum_boyut üzerindeki JSON/metin yanıtlarını istemcinin kabul ettiği kodlamayla sıkıştırır"""
+
+    # gzip 4, /kanunlar listesinde 6'ya göre ~%45 daha az CPU ile ~%9 daha büyük çıktı verir
+    def __init__(self, app, minimum_boyut: int = 1024, gzip_seviyesi: int = 4, brotli_seviyesi: int = 5):
+        self.app = app
+        self.minimum_boyut = minimum_boyut
+        self.gzip_seviyesi = gzip_seviyesi
+        self.brotli_seviyesi = brotli_seviyesi
+
+    def sikistir(self, govde: bytes, kodlama: str) -> bytes:
+        if kodlama == 'br':
+            return brotli.compress(govde, quality=self.brotli_seviyesi)
+        # mtime=0: aynı gövde her seferinde aynı baytlara sıkışır (güçlü ETag için)
+        return gzip.compress(govde, compresslevel=self.gzip_seviyesi, mtime=0)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        kodlama = kodlama_sec(_basliklar(scope).get('accept-encoding', ''))
+        if kodlama is None:
+            await self.app(scope, receive, send)
+            return
+
+        baslangic_mesaji = None
+        parcalar: List[bytes] = []
+
+        async def tampon(message):
+            nonlocal baslangic_mesaji
+            if message['type'] == 'http.response.start':
+                baslangic_mesaji = message
+                return
+            if message['type'] != 'http.response.body':
+                await send(message)
+                return
+            parcalar.append(message.get('body', b''))
+            if message.get('more_body', False):
+                return
+            await self._gonder(send, baslangic_mesaji, b''.join(parcalar), kodlama)
+
+        await self.app(scope, receive, tampon)
+
+    async def _gonder(self, send, baslangic_mesaji, govde: bytes, kodlama: str):
+        """Uygunsa gövdeyi sıkıştırıp başlıkları güncelleyerek gönderir"""
+        basliklar: List[Tuple[bytes, bytes]] = list(baslangic_mesaji.get('headers', []))
+        adlar = {ad.lower(): deger for ad, deger in basliklar}
+        uygun = (len(govde) >= self.minimum_boyut
+                 and b'content-encoding' not in adlar
+                 and adlar.get(b'content-type', b'').startswith(SIKISTIRILABILIR))
+        if uygun:
+            govde = self.sikistir(govde, kodlama)
+            yeni = []
+            for ad, deger in basliklar:
+                if ad.lower() == b'content-length':
+                    continue
+                if ad.lower() == b'etag' and not deger.startswith(b'W/'):
+                    # Güçlü ETag temsile özgü olmalı: kodlama eki eklenir
+                    deger = deger[:-1] + f'-{kodlama}"'.encode('latin-1')
+                yeni.append((ad, deger))
+            basliklar = yeni + [(b'content-encoding', kodlama.encode('latin-1')),
+                                (b'content-length', str(len(govde)).encode('latin-1'))]
+        if b'vary' not in adlar:
+            basliklar.append((b'vary', b'Accept-Encoding'))
+        await send({**baslangic_mesaji, 'headers': basliklar})
+        await send({'type': 'http.response.body', 'body': govde})
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Uçtan Uca Yük Testi Scripti
+Repodaki .txt dosyalarını Gist yerine sunan yerel bir HTTP sunucusu başlatır (gecikme ve hata
+enjeksiyonu ile), API server'ı bu sunucuya yönlendirerek ayağa kaldırır ve bir soru iş yükünü
+hedef QPS veya eşzamanlılıkla oynatır. Başlatma süresi, throughput, gecikme histogramları ve
+hata oranları /ask, /kanunlar ve /health için ayrı ayrı raporlanır.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import aiohttp
+import numpy as np
+from benchmark_two_stage import VARSAYILAN_SORULAR
+
+# Gecikme histogramı kova sınırları (ms)
+HISTOGRAM_KOVALARI = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+SERVERLAR = {
+    'n8n': 'n8n_api_server',
+    'repocloud': 'repocloud_api_server'
+}
+
+
+class GistStandInServer:
+    """Kanun .txt dosyalarını Gist'in yerine sunan yerel HTTP sunucusu"""
+
+    def __init__(self, folder: str, host: str = "127.0.0.1", port: int = 0,
+                 gecikme_ms: float = 0.0, jitter_ms: float = 0.0, hata_orani: float = 0.0,
+                 limit: Optional[int] = None, seed: int = 42):
+        self.folder = Path(folder)
+        self.gecikme_ms = gecikme_ms
+        self.jitter_ms = jitter_ms
+        self.hata_orani = hata_orani
+        self.random = random.Random(seed)
+        self.istek_sayisi = 0
+        self.hata_sayisi = 0
+
+        files = sorted(self.folder.glob("*.txt"))
+        if limit:
+            files = files[:limit]
+        self.files = {file_path.name: file_path for file_path in files}
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def links_url(self) -> str:
+        return f"{self.base_url}/tumlinkler"
+
+    def _handler_class(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                stand_in.istek_sayisi += 1
+
+                # Yapay ağ gecikmesi
+                gecikme = stand_in.gecikme_ms + stand_in.random.uniform(0, stand_in.jitter_ms)
+                if gecikme > 0:
+                    time.sleep(gecikme / 1000)
+
+                name = self.path.lstrip('/')
+                if name == 'tumlinkler':
+                    links = '\n'.join(f"{stand_in.base_url}/{file_name}" for file_name in stand_in.files)
+                    self._send(200, links.encode('utf-8'))
+                    return
+
+                file_path = stand_in.files.get(name)
+                if file_path is None:
+                    self._send(404, b"not found")
+                    return
+
+                # Hata enjeksiyonu (yalnızca kanun dosyalarında)
+                if stand_in.random.random() < stand_in.hata_orani:
+                    stand_in.hata_sayisi += 1
+                    self._send(500, b"injected error")
+                    return
+
+                self._send(200, file_path.read_bytes())
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class EndpointStats:
+    """Bir endpoint için gecikme ve hata istatistiklerini toplar"""
+
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.hatalar = 0
+        self.durum_kodlari: Dict[str, int] = {}
+
+    def record(self, latency_ms: float, status: Optional[int], ok: bool):
+        self.latencies_ms.append(latency_ms)
+        key = str(status) if status is not None else 'baglanti_hatasi'
+        self.durum_kodlari[key] = self.durum_kodlari.get(key, 0) + 1
+        if not ok:
+            self.hatalar += 1
+
+    def report(self, sure_s: float) -> Dict[str, Any]:
+        count = len(self.latencies_ms)
+        if not count:
+            return {'istek_sayisi': 0}
+
+        latencies = np.array(self.latencies_ms)
+        counts, _ = np.histogram(latencies, bins=[0] + HISTOGRAM_KOVALARI + [np.inf])
+        histogram = {f"<={kova}ms": int(c) for kova, c in zip(HISTOGRAM_KOVALARI, counts)}
+        histogram[f">{HISTOGRAM_KOVALARI[-1]}ms"] = int(counts[-1])
+
+        return {
+            'istek_sayisi': count,
+            'hata_sayisi': self.hatalar,
+            'hata_orani': self.hatalar / count,
+            'throughput_rps': count / sure_s if sure_s else 0.0,
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p95_ms': float(np.percentile(latencies, 95)),
+            'p99_ms': float(np.percentile(latencies, 99)),
+            'max_ms': float(latencies.max()),
+            'durum_kodlari': self.durum_kodlari,
+            'histogram': histogram
+        }
+
+
+def start_api_server(server: str, port: int, gist_url: str, kanun_limit: Optional[int]) -> subprocess.Popen:
+    """API server'ı yerel Gist sunucusuna yönlendirilmiş olarak başlatır"""
+    env = dict(os.environ)
+    env['KANUN_GIST_URL'] = gist_url
+    if kanun_limit:
+        env['KANUN_LIMIT'] = str(kanun_limit)
+
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", f"{SERVERLAR[server]}:app", "--host", "127.0.0.1", "--port", str(port)],
+        env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+
+
+async def wait_until_ready(base_url: str, process: subprocess.Popen, timeout: float) -> float:
+    """/health cevap verene kadar bekler ve geçen süreyi döndürür"""
+    start = time.perf_counter()
+    async with aiohttp.ClientSession() as session:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"API server beklenmedik şekilde kapandı (çıkış kodu {process.returncode})")
+            try:
+                async with session.get(f"{base_url}/health") as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.1)
+    raise TimeoutError(f"API server {timeout} saniye içinde hazır olmadı")
+
+
+class Workload:
+    """Soru iş yükünü endpoint ağırlıklarına göre üretir"""
+
+    def __init__(self, questions: List[str], weights: Dict[str, float], max_results: int, seed: int = 42):
+        self.questions = questions
+        self.endpoints = list(weights)
+        self.weights = [weights[endpoint] for endpoint in self.endpoints]
+        self.max_results = max_results
+        self.random = random.Random(seed)
+
+    def next_request(self):
+        endpoint = self.random.choices(self.endpoints, weights=self.weights)[0]
+        if endpoint == '/ask':
+            question = self.random.choice(self.questions)
+            return 'POST', endpoint, {'question': question, 'max_results': self.max_results}
+        return 'GET', endpoint, None
+
+
+async def send(session: aiohttp.ClientSession, base_url: str, request, stats: Dict[str, EndpointStats]):
+    """Tek bir isteği gönderir ve sonucunu kaydeder"""
+    method, endpoint, body = request
+    start = time.perf_counter()
+    status = None
+    try:
+        async with session.request(method, f"{base_url}{endpoint}", json=body) as response:
+            await response.read()
+            status = response.status
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        pass
+    latency_ms = (time.perf_counter() - start) * 1000
+    stats[endpoint].record(latency_ms, status, status is not None and 200 <= status < 300)
+
+
+async def run_workload(base_url: str, workload: Workload, duration: float,
+                       qps: Optional[float], concurrency: int, timeout: float) -> Dict[str, Any]:
+    """İş yükünü hedef QPS (açık döngü) veya eşzamanlılıkla (kapalı döngü) oynatır"""
+    stats = {endpoint: EndpointStats() for endpoint in workload.endpoints}
+    connector = aiohttp.TCPConnector(limit=max(concurrency, 100))
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        start = time.perf_counter()
+        deadline = start + duration
+
+        if qps:
+            # Açık döngü: istekler cevapları beklemeden sabit aralıklarla gönderilir
+            tasks = []
+            interval = 1.0 / qps
+            next_time = start
+            while next_time < deadline:
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.ensure_future(send(session, base_url, workload.next_request(), stats)))
+                next_time += interval
+            await asyncio.gather(*tasks)
+        else:
+            # Kapalı döngü: her işçi bir cevap gelince yeni istek gönderir
+            async def worker():
+                while time.perf_counter() < deadline:
+                    await send(session, base_url, workload.next_request(), stats)
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        elapsed = time.perf_counter() - start
+
+    toplam = sum(len(s.latencies_ms) for s in stats.values())
+    return {
+        'sure_s': elapsed,
+        'toplam_istek': toplam,
+        'toplam_throughput_rps': toplam / elapsed if elapsed else 0.0,
+        'endpointler': {endpoint: s.report(elapsed) for endpoint, s in stats.items()}
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    """Sonuçları okunabilir biçimde yazdırır"""
+    print(f"\nBaşlatma süresi: {report['baslatma_s']:.2f} s")
+    print(f"Gist stand-in: {report['gist']['istek_sayisi']} istek, {report['gist']['hata_sayisi']} enjekte hata")
+    sonuc = report['sonuc']
+    print(f"Toplam: {sonuc['toplam_istek']} istek, {sonuc['toplam_throughput_rps']:.1f} istek/s")
+    for endpoint, stats in sonuc['endpointler'].items():
+        if not stats['istek_sayisi']:
+            continue
+        print(f"\n{endpoint}: {stats['istek_sayisi']} istek, {stats['throughput_rps']:.1f} istek/s, "
+              f"hata oranı %{stats['hata_orani'] * 100:.2f}")
+        print(f"  p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+              f"p99 {stats['p99_ms']:.1f} ms, max {stats['max_ms']:.1f} ms")
+        for kova, count in stats['histogram'].items():
+            if count:
+                print(f"  {kova:>10}: {count}")
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    """"/ask=8,/kanunlar=1,/health=1" biçimindeki ağırlıkları çözer"""
+    weights = {}
+    for part in value.split(','):
+        endpoint, weight = part.split('=')
+        weights[endpoint.strip()] = float(weight)
+    return weights
+
+
+async def main_async(args) -> Dict[str, Any]:
+    questions = VARSAYILAN_SORULAR
+    if args.sorular:
+        with open(args.sorular, 'r', encoding='utf-8') as f:
+            questions = [line.strip() for line in f if line.strip()]
+
+    gist = GistStandInServer(
+        args.folder, gecikme_ms=args.gecikme_ms, jitter_ms=args.jitter_ms,
+        hata_orani=args.hata_orani, limit=args.kanun_limit
+    ).start()
+    print(f"Gist stand-in {gist.links_url} adresinde çalışıyor ({len(gist.files)} kanun).")
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    process = start_api_server(args.server, args.port, gist.links_url, args.kanun_limit)
+    try:
+        print(f"{args.server} API server başlatılıyor...")
+        startup = await wait_until_ready(base_url, process, args.startup_timeout)
+        print(f"API server {startup:.2f} saniyede hazır oldu.")
+
+        workload = Workload(questions, parse_weights(args.weights), args.max_results)
+        mode = f"{args.qps} QPS" if args.qps else f"{args.concurrency} eşzamanlı istemci"
+        print(f"İş yükü {args.duration} saniye boyunca {mode} ile oynatılıyor...")
+        result = await run_workload(base_url, workload, args.duration, args.qps, args.concurrency, args.timeout)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        gist.stop()
+
+    return {
+        'ayarlar': vars(args),
+        'baslatma_s': startup,
+        'gist': {'istek_sayisi': gist.istek_sayisi, 'hata_sayisi': gist.hata_sayisi},
+        'sonuc': result
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kanun API uçtan uca yük testi")
+    parser.add_argument("--server", choices=sorted(SERVERLAR), default="n8n", help="Test edilecek API server")
+    parser.add_argument("--folder", default=".", help="Kanun .txt dosyalarının bulunduğu klasör")
+    parser.add_argument("--port", type=int, default=8765, help="API server portu")
+    parser.add_argument("--kanun-limit", type=int, default=50, help="Yüklenecek kanun sayısı")
+    parser.add_argument("--gecikme-ms", type=float, default=0.0, help="Gist isteklerine eklenen gecikme")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Gecikmeye eklenen rastgele sapma üst sınırı")
+    parser.add_argument("--hata-orani", type=float, default=0.0, help="Gist dosya isteklerinde 500 oranı (0-1)")
+    parser.add_argument("--qps", type=float, default=None, help="Hedef QPS (açık döngü)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Eşzamanlı istemci sayısı (QPS verilmezse)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Test süresi (saniye)")
+    parser.add_argument("--weights", default="/ask=8,/kanunlar=1,/health=1", help="Endpoint ağırlıkları")
+    parser.add_argument("--max-results", type=int, default=5, help="/ask için max_results")
+    parser.add_argument("--sorular", default=None, help="Her satırda bir soru bulunan dosya")
+    parser.add_argument("--timeout", type=float, default=30.0, help="İstek zaman aşımı (saniye)")
+    parser.add_argument("--startup-timeout", type=float, default=900.0, help="Başlatma zaman aşımı (saniye)")
+    parser.add_argument("--output", default=None, help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nSonuçlar {args.output} dosyasına kaydedildi.")
+
+
+if __name__ == "__main__":
+    main()
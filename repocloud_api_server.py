@@ -5,40 +5,104 @@ RepoCloud için Optimize Edilmiş Kanun API Server
 Bu server RepoCloud'da deploy edilmek üzere optimize edilmiştir.
 """
 
-from fastapi import FastAPI, HTTPException
+import time
+# Başlangıç raporu için süreler modül yüklenmeye başladığı andan ölçülür
+_BASLANGIC = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Request, Query, Header
+from fastapi.responses import Response
+from starlette.routing import Match
 from pydantic import BaseModel
 import requests
 import json
+import hmac
 import re
-from typing import List, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import List, Dict, Any, Optional, Tuple
+from kanun_processor import KanunProcessor
+from kanun_index import KanunIndex
+from kanun_metrics import KanunMetrics
+from kanun_profiler import SorguProfilleyici
+from kanun_sayfalama import CursorHatasi, encode_cursor, decode_cursor
+from kanun_yanit import ETagMiddleware, SikistirmaMiddleware, HizliJSONResponse, json_yaniti
+from kanun_guncelleme import KanunGuncelleyici
+from kanun_baslangic import BaslangicRaporu, isinma_sorgulari, isit
 import os
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import aiohttp
 
 app = FastAPI(
     title="Kanun Sorgulama API", 
     version="1.0.0",
-    description="GitHub Gist'teki Türk kanunlarını sorgulama API'si"
+    description="GitHub Gist'teki Türk kanunlarını sorgulama API'si",
+    default_response_class=HizliJSONResponse
 )
 
 # Global değişkenler
-kanun_data = []
+processor = KanunProcessor()
+# İki aşamalı arama: KANUN_ADAY_SAYISI > 0 ise önce en uygun M kanun seçilir; kanun başlığı
+# benzerliği madde skorlarına KANUN_BASLIK_AGIRLIGI oranında karıştırılır
+kanun_index = KanunIndex(aday_kanun_sayisi=int(os.getenv("KANUN_ADAY_SAYISI", 0)),
+                         nicem_vektorler=os.getenv("KANUN_INT8_VEKTORLER", "0") == "1",
+                         yeniden_skorlama_sayisi=int(os.getenv("KANUN_YENIDEN_SKORLAMA_SAYISI", 200)),
+                         baslik_agirligi=float(os.getenv("KANUN_BASLIK_AGIRLIGI", 0.2)))
 model = None
-gist_url = "https://gist.githubusercontent.com/yasinuzunoglu/e17910de5ef97cf1763def88d7f7bec2/raw/56bbfc87c01ef78af791521ac35470ee0526673f/tumlinkler"
+metrics = KanunMetrics(kanun_index)
+# Debug modu ve yavaş sorgu kaydı (KANUN_DEBUG_IZINLI, SLOW_QUERY_MS, SLOW_QUERY_LOG)
+profiler = SorguProfilleyici.from_env()
+profiler.bind_index(kanun_index)
+# Aramalar event loop'u bloklamaması için ayrı bir thread havuzunda çalışır
+arama_executor = ThreadPoolExecutor(max_workers=int(os.getenv("ARAMA_WORKER_SAYISI", 2)))
+# Canlı kanun güncellemeleri (KANUN_DOSYA_DIZINI, COMPACTION_ORANI); yönetim endpoint'leri
+# yalnızca KANUN_ADMIN_TOKEN ayarlıysa ve X-Admin-Token başlığı eşleşirse çalışır
+guncelleyici = KanunGuncelleyici.from_env(kanun_index, processor)
+admin_token = os.getenv("KANUN_ADMIN_TOKEN")
+# İndeksten türetilen GET yanıtlarında ETag/304; sıkıştırma en dışta olduğu için ETag'lere kodlama eki eklenir
+app.add_middleware(ETagMiddleware, etiket=lambda: kanun_index.etiket)
+app.add_middleware(SikistirmaMiddleware, minimum_boyut=int(os.getenv("SIKISTIRMA_MIN_BAYT", 1024)))
+gist_url = os.getenv("KANUN_GIST_URL", "https://gist.githubusercontent.com/yasinuzunoglu/e17910de5ef97cf1763def88d7f7bec2/raw/56bbfc87c01ef78af791521ac35470ee0526673f/tumlinkler")
+# Embedding modeli; sentence_transformers (ve torch) ilk kez startup'ta model yüklenirken import edilir
+MODEL_NAME = 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
+# ISINMA_SORGU_SAYISI > 0 ise hazır olmadan önce sorgu kaydındaki (QUERY_LOG) en sık sorgular çalıştırılır
+isinma_sorgu_sayisi = int(os.getenv("ISINMA_SORGU_SAYISI", 0))
+isinma_sorgu_kaydi = os.getenv("ISINMA_SORGU_KAYDI", profiler.sorgu_log_path)
+baslangic_raporu = BaslangicRaporu(_BASLANGIC)
+baslangic_raporu.ekle('imports', time.perf_counter() - _BASLANGIC)
 
 class QuestionRequest(BaseModel):
-    question: str
+    # cursor verilirse opsiyonel (verilirse cursor'daki soruyla aynı olmalı)
+    question: Optional[str] = None
     max_results: Optional[int] = 5
+    # Opsiyonel filtreler (skorlamadan önce uygulanır)
+    kanun_no: Optional[List[str]] = None
+    kanun_adi: Optional[str] = None  # "gumruk kanunu" gibi; en yakın kanun kanun_no filtresine eklenir
+    yayim_tarihi_baslangic: Optional[str] = None  # gg.aa.yyyy
+    yayim_tarihi_bitis: Optional[str] = None  # gg.aa.yyyy
+    madde_turu: Optional[List[str]] = None  # normal, gecici, ek
+    # Sonuçlara doğrudan atıf yapılan maddeleri ekle
+    atiflari_ekle: Optional[bool] = False
+    # Yürürlükten kaldırılmış (mülga) maddeleri skorlamadan önce çıkar
+    mulga_haric: Optional[bool] = False
+    # Cevaplarda dönecek alanlar (ör. ["kanun_no", "madde_no", "baslik", "snippet"]); verilmezse tümü
+    fields: Optional[List[str]] = None
+    # Tam metin yerine maddenin soruyla en çok eşleşen penceresi ve vurgu ofsetleri döner
+    snippet: Optional[bool] = False
+    # Önceki cevaptaki next_cursor; verilirse sorgu ve filtreler cursor'dan okunur
+    cursor: Optional[str] = None
 
 class QuestionResponse(BaseModel):
     question: str
     answers: List[Dict[str, Any]]
     total_found: int
+    next_cursor: Optional[str] = None
     status: str
 
+class KanunGuncellemeRequest(BaseModel):
+    # Ham kanun metni veya KANUN_DOSYA_DIZINI içindeki bir .txt dosyası (yalnızca biri)
+    content: Optional[str] = None
+    path: Optional[str] = None
+    gist_url: Optional[str] = None
+
 async def load_kanun_from_gist_async(session: aiohttp.ClientSession, gist_url: str) -> Dict[str, Any]:
     """Tek bir kanun dosyasını Gist'ten asenkron olarak yükler"""
     try:
@@ -50,49 +114,14 @@ async def load_kanun_from_gist_async(session: aiohttp.ClientSession, gist_url: s
                 filename = gist_url.split('/')[-1]
                 kanun_no = filename.replace('.txt', '')
                 
-                # İlk satırdan kanun başlığını al
-                lines = content.split('\n')
-                baslik = lines[0].strip() if lines else "Bilinmeyen Kanun"
-                
-                # Tarih bilgilerini çıkar
-                tarih_pattern = r'Yayımlandığı Resmî Gazete Tarihi: (\d{2}\.\d{2}\.\d{4})'
-                tarih_match = re.search(tarih_pattern, content)
-                yayim_tarihi = tarih_match.group(1) if tarih_match else None
-                
-                # Madde numaralarını ve içeriklerini çıkar
-                maddeler = extract_maddeler(content)
-                
-                return {
-                    'kanun_no': kanun_no,
-                    'baslik': baslik,
-                    'yayim_tarihi': yayim_tarihi,
-                    'maddeler': maddeler,
-                    'full_content': content,
-                    'gist_url': gist_url
-                }
+                # Başlık, tarih ve maddeleri çıkar
+                kanun = processor.parse_kanun_content(content, kanun_no)
+                kanun['gist_url'] = gist_url
+                return kanun
     except Exception as e:
         print(f"Hata: {gist_url} dosyası yüklenirken hata oluştu: {e}")
         return None
 
-def extract_maddeler(content: str) -> List[Dict[str, str]]:
-    """Kanun metninden maddeleri çıkarır"""
-    maddeler = []
-    
-    # Madde pattern'i: "Madde 0001:" veya "Madde 1:"
-    madde_pattern = r'Madde\s+(\d+):\s*(.*?)(?=Madde\s+\d+:|Geçici Madde|$)'
-    matches = re.findall(madde_pattern, content, re.DOTALL)
-    
-    for madde_no, madde_icerik in matches:
-        # Madde içeriğini temizle
-        madde_icerik = madde_icerik.strip()
-        if madde_icerik:
-            maddeler.append({
-                'madde_no': int(madde_no),
-                'icerik': madde_icerik
-            })
-    
-    return maddeler
-
 async def load_all_gist_urls_async() -> List[str]:
     """Gist'ten tüm kanun URL'lerini asenkron olarak çeker"""
     try:
@@ -107,88 +136,151 @@ async def load_all_gist_urls_async() -> List[str]:
         print(f"Gist URL'leri yüklenirken hata: {e}")
         return []
 
-def search_kanunlar(question: str, max_results: int = 5) -> List[Dict[str, Any]]:
-    """Soruyu kanunlarda arar ve en uygun sonuçları döndürür"""
-    global kanun_data, model
+def search_kanunlar(question: str, max_results: int = 5, offset: int = 0,
+                    **filtreler) -> Tuple[List[Dict[str, Any]], bool]:
+    """Soruyu kanunlarda arar; sonuç sayfasını ve sonraki sayfanın olup olmadığını döndürür"""
+    global kanun_index, model
     
-    if not kanun_data:
-        return []
+    if not kanun_index.canli_kanun_sayisi:
+        return [], False
     
     if not model:
-        return []
+        return [], False
     
-    # Soruyu embedding'e dönüştür
-    question_embedding = model.encode([question])
-    
-    # Tüm kanun maddelerini embedding'e dönüştür
-    all_texts = []
-    all_metadata = []
-    
-    for kanun in kanun_data:
-        for madde in kanun['maddeler']:
-            text = f"Kanun: {kanun['baslik']}\nMadde {madde['madde_no']}: {madde['icerik']}"
-            all_texts.append(text)
-            all_metadata.append({
-                'kanun_no': kanun['kanun_no'],
-                'baslik': kanun['baslik'],
-                'madde_no': madde['madde_no'],
-                'yayim_tarihi': kanun['yayim_tarihi'],
-                'gist_url': kanun['gist_url'],
-                'text': text
-            })
-    
-    if not all_texts:
-        return []
+    return kanun_index.search_page(question, max_results, offset, **filtreler)
+
+async def run_search(question: str, max_results: int = 5, offset: int = 0, profil=None,
+                     **filtreler) -> Tuple[List[Dict[str, Any]], bool]:
+    """Aramayı executor'da çalıştırır ve kuyruk derinliğini izler"""
+    metrics.kuyruk_derinligi.inc()
+    gonderim = time.perf_counter()
     
-    # Embedding'leri oluştur
-    text_embeddings = model.encode(all_texts)
+    def calistir():
+        metrics.kuyruk_derinligi.dec()
+        metrics.calisan_aramalar.inc()
+        try:
+            if profil is None:
+                return search_kanunlar(question, max_results, offset, **filtreler)
+            # Executor kuyruğunda geçen süre de profile eklenir
+            profil.ekle('queue', time.perf_counter() - gonderim)
+            with profiler.aktif(profil):
+                return search_kanunlar(question, max_results, offset, **filtreler)
+        finally:
+            metrics.calisan_aramalar.dec()
     
-    # Cosine similarity hesapla
-    similarities = cosine_similarity(question_embedding, text_embeddings)[0]
+    return await asyncio.get_running_loop().run_in_executor(arama_executor, calistir)
+
+# istek_filtreleri'nin ürettiği ve cursor'larda taşınan arama filtreleri
+FILTRE_ADLARI = ("kanun_no", "yayim_tarihi_baslangic", "yayim_tarihi_bitis", "madde_turu",
+                 "atiflari_ekle", "mulga_haric", "alanlar", "snippet")
+
+def istek_filtreleri(request: QuestionRequest) -> Dict[str, Any]:
+    """İsteğin arama filtrelerini döndürür"""
+    # Kanun adı (yazım hatalı olabilir) en yakın kanunun numarasına çevrilir
+    kanun_no = request.kanun_no
+    if request.kanun_adi:
+        bulunan = kanun_index.resolve_kanun_adi(request.kanun_adi)
+        if bulunan is None:
+            raise ValueError(f"Kanun adı bulunamadı: {request.kanun_adi}")
+        kanun_no = (kanun_no or []) + [bulunan]
     
-    # En yüksek skorlu sonuçları al
-    top_indices = np.argsort(similarities)[::-1][:max_results]
+    return {
+        "kanun_no": kanun_no,
+        "yayim_tarihi_baslangic": request.yayim_tarihi_baslangic,
+        "yayim_tarihi_bitis": request.yayim_tarihi_bitis,
+        "madde_turu": request.madde_turu,
+        "atiflari_ekle": bool(request.atiflari_ekle),
+        "mulga_haric": bool(request.mulga_haric),
+        "alanlar": request.fields,
+        "snippet": bool(request.snippet)
+    }
+
+def cursor_filtreleri(question: str, filtreler: Dict[str, Any]) -> Dict[str, Any]:
+    """Cursor'daki filtreleri istek modeliyle doğrular (geçersiz değerler CursorHatasi verir)"""
+    alanlar = {ad: deger for ad, deger in filtreler.items() if ad != "alanlar"}
+    try:
+        istek = QuestionRequest(question=question, fields=filtreler.get("alanlar"), **alanlar)
+    except ValueError:
+        raise CursorHatasi("Geçersiz cursor")
+    return istek_filtreleri(istek)
+
+def model_yukle():
+    """Embedding modelini yükler; ağır import'lar burada yapılır"""
+    print("Embedding modeli yükleniyor...")
+    with baslangic_raporu.asama('model_import'):
+        from sentence_transformers import SentenceTransformer
+    with baslangic_raporu.asama('model_load'):
+        yuklenen = SentenceTransformer(MODEL_NAME)
+    print("Model yüklendi.")
+    return yuklenen
+
+def isinma_calistir() -> Dict[str, Any]:
+    """Sorgu kaydındaki en sık sorguları çalıştırarak encoder'ı ve önbellekleri ısıtır"""
+    sorgular = isinma_sorgulari(isinma_sorgu_kaydi, isinma_sorgu_sayisi)
+    if not sorgular:
+        # Kayıt yoksa en azından encoder'ın ilk sorgu maliyeti ödenir
+        print(f"Isınma sorgusu bulunamadı ({isinma_sorgu_kaydi}), yalnızca encoder ısıtılıyor.")
+        kanun_index.encode_question("kanun maddesi")
+        return {"sorgu_sayisi": 0}
     
-    results = []
-    for idx in top_indices:
-        if similarities[idx] > 0.1:  # Minimum similarity threshold
-            metadata = all_metadata[idx]
-            results.append({
-                'kanun_no': metadata['kanun_no'],
-                'baslik': metadata['baslik'],
-                'madde_no': metadata['madde_no'],
-                'yayim_tarihi': metadata['yayim_tarihi'],
-                'gist_url': metadata['gist_url'],
-                'text': metadata['text'],
-                'similarity_score': float(similarities[idx])
-            })
+    def calistir(sorgu):
+        # Düz metin sorular varsayılan istek filtreleriyle çalışır (önbellek anahtarı gerçek isteklerle aynı olur)
+        filtreler = sorgu["filtreler"]
+        if filtreler is None:
+            filtreler = istek_filtreleri(QuestionRequest(question=sorgu["question"]))
+        return search_kanunlar(sorgu["question"], sorgu["max_results"], 0, **filtreler)
     
-    return results
+    return isit(calistir, sorgular)
+
+def route_sablonu(request: Request) -> str:
+    """Metrik etiketi için isteğin route şablonu (eşleşen route yoksa "other")"""
+    route = request.scope.get("route")
+    if route is None:
+        # ETag 304'leri gibi endpoint'e ulaşmadan cevaplanan isteklerde route path'ten eşlenir
+        route = next((aday for aday in app.routes if aday.matches(request.scope)[0] == Match.FULL), None)
+    return route.path if route else "other"
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    """Her isteğin route, durum kodu ve süresini kaydeder"""
+    baslangic = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Etiket sayısını sınırlı tutmak için eşleşen route şablonu kullanılır
+        metrics.observe_request(request.method, route_sablonu(request), status, time.perf_counter() - baslangic)
 
 @app.on_event("startup")
 async def startup_event():
     """Uygulama başlatıldığında çalışır"""
-    global kanun_data, model
+    global kanun_index, model
     
     print("Kanun Sorgulama API başlatılıyor...")
     
-    # Embedding modelini yükle
-    print("Embedding modeli yükleniyor...")
-    model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
-    print("Model yüklendi.")
+    # Embedding modeli ayrı bir thread'de yüklenirken kanunlar indirilir
+    loop = asyncio.get_running_loop()
+    model_yukleme = loop.run_in_executor(None, model_yukle)
     
     # Kanun URL'lerini yükle
+    corpus_baslangic = time.perf_counter()
     print("Kanun URL'leri yükleniyor...")
     gist_urls = await load_all_gist_urls_async()
     
     if not gist_urls:
         print("Kanun URL'leri bulunamadı!")
+        baslangic_raporu.ekle('corpus_load', time.perf_counter() - corpus_baslangic)
+        model = await model_yukleme
+        # Kanunsuz başlangıç da bitmiş sayılır; /health toplam süreyi raporlar
+        baslangic_raporu.hazir()
         return
     
     print(f"Toplam {len(gist_urls)} kanun URL'si bulundu.")
     
-    # İlk 100 kanunu yükle (RepoCloud için optimize edildi)
-    urls_to_load = gist_urls[:100]
+    # İlk 100 kanunu yükle (RepoCloud için optimize edildi, KANUN_LIMIT ile değiştirilebilir)
+    urls_to_load = gist_urls[:int(os.getenv("KANUN_LIMIT", 100))]
     print(f"İlk {len(urls_to_load)} kanun yükleniyor...")
     
     # Asenkron olarak kanunları yükle
@@ -198,9 +290,23 @@ async def startup_event():
         
         for result in results:
             if isinstance(result, dict) and result:
-                kanun_data.append(result)
+                kanun_index.add_kanun(result)
     
-    print(f"Toplam {len(kanun_data)} kanun yüklendi.")
+    print(f"Toplam {kanun_index.kanun_sayisi} kanun yüklendi.")
+    baslangic_raporu.ekle('corpus_load', time.perf_counter() - corpus_baslangic)
+    
+    model = await model_yukleme
+    
+    # Madde embedding'lerini bir kez hesapla
+    with baslangic_raporu.asama('index_build'):
+        kanun_index.build(model)
+    
+    # Encoder ve sıralama önbelleği hazır olmadan önce ısıtılır
+    if isinma_sorgu_sayisi > 0:
+        with baslangic_raporu.asama('warmup'):
+            baslangic_raporu.isinma = await loop.run_in_executor(None, isinma_calistir)
+    
+    baslangic_raporu.hazir()
     print("API hazır!")
 
 @app.get("/")
@@ -209,7 +315,7 @@ async def root():
     return {
         "message": "Kanun Sorgulama API - RepoCloud",
         "version": "1.0.0",
-        "loaded_kanunlar": len(kanun_data),
+        "loaded_kanunlar": kanun_index.canli_kanun_sayisi,
         "status": "ready",
         "endpoints": {
             "ask": "/ask",
@@ -219,44 +325,237 @@ async def root():
     }
 
 @app.post("/ask", response_model=QuestionResponse)
-async def ask_question(request: QuestionRequest):
+async def ask_question(request: QuestionRequest, http_request: Request):
     """Kanun sorusu sorar"""
     try:
-        results = search_kanunlar(request.question, request.max_results)
+        # Debug modu: X-Kanun-Debug header'ı veya ?debug=1 ile (KANUN_DEBUG_IZINLI=1 ise)
+        debug = profiler.debug_istendi(http_request.headers.get("x-kanun-debug"), http_request.query_params.get("debug"))
+        profil = profiler.yeni_profil()
         
-        return QuestionResponse(
-            question=request.question,
+        if request.cursor:
+            # Sonraki sayfa: sorgu, filtreler ve konum cursor'dan okunur
+            sayfa = decode_cursor(request.cursor, ("q", "n", "o", "f", "s"), metin_alanlari=("q",),
+                                  tamsayi_alanlari=("n", "o"), sozluk_alanlari={"f": FILTRE_ADLARI})
+            if sayfa.get("s") != kanun_index.surum:
+                raise CursorHatasi("Cursor indeksin eski bir sürümüne ait, arama yeniden yapılmalı")
+            question, max_results, offset = sayfa["q"], sayfa["n"], sayfa["o"]
+            if request.question is not None and request.question != question:
+                raise CursorHatasi("question cursor'daki soruyla uyuşmuyor; yeni soru cursor'sız gönderilmeli")
+            filtreler = cursor_filtreleri(question, sayfa["f"])
+        else:
+            if request.question is None:
+                raise ValueError("question gerekli (cursor verilmediyse)")
+            # max_results: null varsayılan sayfa boyutuyla aranır
+            max_results = request.max_results if request.max_results is not None else 5
+            question, offset = request.question, 0
+            filtreler = istek_filtreleri(request)
+        results, sonraki_var = await run_search(question, max_results, offset, profil=profil, **filtreler)
+        next_cursor = None
+        if sonraki_var:
+            next_cursor = encode_cursor({"q": question, "n": max_results, "o": offset + max_results,
+                                         "f": filtreler, "s": kanun_index.surum})
+        
+        body = QuestionResponse(
+            question=question,
             answers=results,
             total_found=len(results),
+            next_cursor=next_cursor,
             status="success"
-        )
+        ).model_dump()
+        if debug:
+            body["debug"] = profil.rapor()
+        
+        baslangic = time.perf_counter()
+        response = json_yaniti(body)
+        sure = time.perf_counter() - baslangic
+        metrics.observe_stage('serialize', sure)
+        profil.ekle('serialize', sure)
         
+        # Eşiği aşan istekler yavaş sorgu dosyasına, ilk sayfa istekleri ısınma için sorgu kaydına yazılır
+        parametreler = {"question": question, "max_results": max_results, "offset": offset,
+                        "kanun_adi": request.kanun_adi, **filtreler}
+        profiler.kaydet(profil, parametreler)
+        if offset == 0:
+            profiler.sorgu_kaydet(parametreler)
+        return response
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Soru işlenirken hata: {str(e)}")
 
 @app.get("/kanunlar")
-async def get_kanunlar():
-    """Yüklenen kanunların listesini döndürür"""
+async def get_kanunlar(limit: Optional[int] = Query(None, ge=1, le=1000), after: Optional[str] = None):
+    """Yüklenen kanunların listesini döndürür (limit/after verilirse kanun_no sırasında sayfalı)"""
+    if limit is None and after is None:
+        return {
+            "total": kanun_index.canli_kanun_sayisi,
+            "kanunlar": kanun_index.list_kanunlar()
+        }
+    
+    kanunlar, sonraki = kanun_index.list_kanunlar_sayfa(after, limit or 100)
+    return {
+        "total": kanun_index.canli_kanun_sayisi,
+        "kanunlar": kanunlar,
+        "next_after": sonraki
+    }
+
+@app.get("/kanunlar/suggest")
+async def suggest_kanunlar(q: str, limit: int = Query(10, ge=1, le=100)):
+    """Kanun seçici için başlık, kanun numarası veya kısaltma önekine göre kanun önerir"""
+    kanunlar = kanun_index.suggest_kanunlar(q, limit)
+    return {"q": q, "total": len(kanunlar), "kanunlar": kanunlar}
+
+@app.get("/kanunlar/search")
+async def search_kanun_adlari(q: str, limit: int = Query(10, ge=1, le=100)):
+    """Yazım hatalı olabilecek kanun adına en yakın kanunları döndürür"""
+    kanunlar = kanun_index.search_kanunlar(q, limit)
+    return {"q": q, "total": len(kanunlar), "kanunlar": kanunlar}
+
+@app.get("/kanunlar/{kanun_no}/toc")
+async def get_kanun_toc(kanun_no: str):
+    """Kanunun bölüm ağacını (içindekiler) madde başlıklarıyla döndürür"""
+    toc = kanun_index.get_toc(kanun_no)
+    if toc is None:
+        raise HTTPException(status_code=404, detail=f"Kanun bulunamadı: {kanun_no}")
+    return toc
+
+@app.get("/kanunlar/{kanun_no}/sections/{bolum_id}")
+async def get_kanun_bolumu(kanun_no: str, bolum_id: int):
+    """Bir bölümün yolunu, alt bölümlerini ve madde metinlerini döndürür"""
+    bolum = kanun_index.get_bolum(kanun_no, bolum_id)
+    if bolum is None:
+        raise HTTPException(status_code=404, detail=f"Bölüm bulunamadı: {kanun_no}/{bolum_id}")
+    return bolum
+
+@app.get("/kanunlar/{kanun_no}/cited-by")
+async def get_kanun_atif_edenler(kanun_no: str):
+    """Kanuna atıf yapan diğer kanunları döndürür"""
+    kanunlar = kanun_index.kanun_atif_edenler(kanun_no)
+    if kanunlar is None:
+        raise HTTPException(status_code=404, detail=f"Kanun bulunamadı: {kanun_no}")
+    return {"kanun_no": kanun_no, "total": len(kanunlar), "kanunlar": kanunlar}
+
+def find_madde(kanun_no: str, madde_no: int, madde_turu: str) -> int:
+    """Maddenin satırını bulur; bulunamazsa 404, geçersiz türde 400 döndürür"""
+    try:
+        row = kanun_index.find_madde_row(kanun_no, madde_no, madde_turu)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Madde bulunamadı: {kanun_no}/{madde_no}")
+    return row
+
+@app.get("/kanunlar/{kanun_no}/maddeler/{madde_no}")
+async def get_madde(kanun_no: str, madde_no: int, madde_turu: str = "normal"):
+    """Maddenin tam metnini döndürür (/ask cevabındaki kanun_no, madde_no ve madde_turu ile)"""
+    with kanun_index.okuma():
+        return kanun_index.get_madde(find_madde(kanun_no, madde_no, madde_turu))
+
+@app.get("/kanunlar/{kanun_no}/maddeler/{madde_no}/cites")
+async def get_madde_atiflari(kanun_no: str, madde_no: int, madde_turu: str = "normal"):
+    """Maddenin atıf yaptığı kanun ve maddeleri döndürür"""
+    # Satır bulma ve okuma aynı indeks durumunda yapılır (arada canlı güncelleme olmaz)
+    with kanun_index.okuma():
+        atiflar = kanun_index.atiflar(find_madde(kanun_no, madde_no, madde_turu))
+    return {"kanun_no": kanun_no, "madde_no": madde_no, "total": len(atiflar), "atiflar": atiflar}
+
+@app.get("/kanunlar/{kanun_no}/maddeler/{madde_no}/cited-by")
+async def get_madde_atif_edenler(kanun_no: str, madde_no: int, madde_turu: str = "normal"):
+    """Maddeye atıf yapan maddeleri döndürür"""
+    with kanun_index.okuma():
+        maddeler = kanun_index.atif_edenler(find_madde(kanun_no, madde_no, madde_turu))
+    return {"kanun_no": kanun_no, "madde_no": madde_no, "total": len(maddeler), "maddeler": maddeler}
+
+@app.get("/kanunlar/{kanun_no}/maddeler/{madde_no}/history")
+async def get_madde_degisiklikleri(kanun_no: str, madde_no: int, madde_turu: str = "normal"):
+    """Maddenin değişiklik geçmişini döndürür"""
+    with kanun_index.okuma():
+        row = find_madde(kanun_no, madde_no, madde_turu)
+        degisiklikler = kanun_index.degisiklikler(row)
+        mulga = kanun_index.mulga_mi(row)
     return {
-        "total": len(kanun_data),
-        "kanunlar": [
-            {
-                "kanun_no": kanun['kanun_no'],
-                "baslik": kanun['baslik'],
-                "yayim_tarihi": kanun['yayim_tarihi'],
-                "madde_sayisi": len(kanun['maddeler'])
-            }
-            for kanun in kanun_data
-        ]
+        "kanun_no": kanun_no,
+        "madde_no": madde_no,
+        "mulga": mulga,
+        "total": len(degisiklikler),
+        "degisiklikler": degisiklikler
     }
 
+@app.get("/kanunlar/{kanun_no}/repealed")
+async def get_mulga_maddeler(kanun_no: str):
+    """Kanunun yürürlükten kaldırılmış veya iptal edilmiş maddelerini döndürür"""
+    maddeler = kanun_index.mulga_maddeler(kanun_no)
+    if maddeler is None:
+        raise HTTPException(status_code=404, detail=f"Kanun bulunamadı: {kanun_no}")
+    return {"kanun_no": kanun_no, "total": len(maddeler), "maddeler": maddeler}
+
+@app.get("/amendments")
+async def get_degisiklikler(baslangic: Optional[str] = None, bitis: Optional[str] = None,
+                            kanun_no: Optional[List[str]] = Query(None), tur: Optional[List[str]] = Query(None),
+                            limit: int = Query(100, ge=1, le=1000), offset: int = Query(0, ge=0)):
+    """Tarih aralığında (gg.aa.yyyy) yapılan değişiklikleri tarih sırasıyla döndürür"""
+    try:
+        return kanun_index.degisiklik_ara(baslangic, bitis, kanun_no, tur, limit, offset)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def admin_dogrula(token: Optional[str]):
+    """Yönetim endpoint'lerine erişimi KANUN_ADMIN_TOKEN ile doğrular"""
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Yönetim endpoint'leri kapalı (KANUN_ADMIN_TOKEN ayarlı değil)")
+    if not token or not hmac.compare_digest(token.encode('utf-8'), admin_token.encode('utf-8')):
+        raise HTTPException(status_code=403, detail="Geçersiz yönetim anahtarı")
+
+@app.put("/admin/kanunlar/{kanun_no}")
+async def put_kanun(kanun_no: str, request: KanunGuncellemeRequest, x_admin_token: Optional[str] = Header(None)):
+    """Kanunu ham metinden veya dosyadan parse edip çalışan indekse ekler ya da günceller"""
+    admin_dogrula(x_admin_token)
+    if model is None:
+        raise HTTPException(status_code=503, detail="Model henüz yüklenmedi")
+    try:
+        # Parse ve encode arama havuzunu meşgul etmemek için varsayılan executor'da çalışır
+        return await asyncio.get_running_loop().run_in_executor(
+            None, lambda: guncelleyici.kanun_yukle(kanun_no, request.content, request.path, request.gist_url))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+@app.delete("/admin/kanunlar/{kanun_no}")
+async def delete_kanun(kanun_no: str, x_admin_token: Optional[str] = Header(None)):
+    """Kanunu çalışan indeksten çıkarır"""
+    admin_dogrula(x_admin_token)
+    ozet = await asyncio.get_running_loop().run_in_executor(None, guncelleyici.kanun_sil, kanun_no)
+    if ozet is None:
+        raise HTTPException(status_code=404, detail=f"Kanun bulunamadı: {kanun_no}")
+    return ozet
+
+@app.post("/admin/compact")
+async def post_compact(x_admin_token: Optional[str] = Header(None)):
+    """Tombstone'lu satırları kaldıran compaction'ı arka planda başlatır"""
+    admin_dogrula(x_admin_token)
+    return {"basladi": guncelleyici.compaction_baslat(), **guncelleyici.durum()}
+
+@app.get("/admin/status")
+async def get_admin_status(x_admin_token: Optional[str] = Header(None)):
+    """Tombstone ve compaction durumunu döndürür"""
+    admin_dogrula(x_admin_token)
+    return guncelleyici.durum()
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrikleri"""
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/health")
 async def health_check():
     """Sistem durumu kontrolü"""
     return {
         "status": "healthy",
-        "kanun_sayisi": len(kanun_data),
+        "kanun_sayisi": kanun_index.canli_kanun_sayisi,
         "model_loaded": model is not None,
+        "baslangic": baslangic_raporu.rapor(),
         "uptime": "running"
     }
 
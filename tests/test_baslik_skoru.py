@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Madde skoruna karıştırılan kanun başlığı benzerliğinin cevaptaki satırla tutarlılığını test eder"""
+
+import numpy as np
+
+from yardimci import index_kur, kanunlari_oku
+
+
+def test_paylasilan_vektor_baslik_skorunu_veren_kanunu_gosterir():
+    index = index_kur(kanunlari_oku(20))
+    paylasilan = [
+        vektor_id for vektor_id in range(index.vektor_sayisi)
+        if len(set(index._satir_kanun_ids[index.vektor_satirlari(vektor_id)].tolist())) > 1
+    ]
+    assert paylasilan
+
+    for vektor_id in paylasilan:
+        satirlar = index.vektor_satirlari(vektor_id)
+        for row in satirlar[1:].tolist():
+            kanun = index.kanunlar[index.madde_kanun_ids[row]]
+            baslik = index.basliklar[kanun.baslik_id]
+            soru = f"{baslik} {index.get_madde_icerik(row)}"
+            q = index.encode_question(soru)
+            result = index._vektor_result(vektor_id, 0.0, None, question_embedding=q)
+            beklenen = index._baslik_skorlari(q, None)[vektor_id]
+            gosterilen = index._kanun_ids[result['kanun_no']]
+            assert np.isclose(index.baslik_embeddings[index._kanun_baslik_ids[gosterilen]] @ q, beklenen)
+            assert result['tekrar_sayisi'] == len(satirlar)
+
+
+def test_baslik_agirligi_sifirsa_ilk_satir_gosterilir():
+    index = index_kur(kanunlari_oku(20), baslik_agirligi=0.0)
+    vektor_id = next(v for v in range(index.vektor_sayisi) if len(index.vektor_satirlari(v)) > 1)
+    satirlar = index.vektor_satirlari(vektor_id)
+    son = int(satirlar[-1])
+    q = index.encode_question(index.basliklar[index.kanunlar[index.madde_kanun_ids[son]].baslik_id])
+    result = index._vektor_result(vektor_id, 0.0, None, question_embedding=q)
+    assert result['madde_no'] == index.get_madde(int(satirlar[0]))['madde_no']
+    assert result['kanun_no'] == index.get_madde(int(satirlar[0]))['kanun_no']
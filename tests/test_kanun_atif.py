@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Atıf çıkarıcısını ve indeksteki ileri/ters atıf grafiğini test eder"""
+
+import numpy as np
+import pytest
+
+from yardimci import index_kur, kanunlari_oku
+from kanun_atif import extract_atiflar
+
+
+@pytest.mark.parametrize('metin, beklenen', [
+    ("4458 sayılı Gümrük Kanununun 242 nci maddesi uyarınca", [(4458, 'normal', 242)]),
+    ("2365 sayılı Kanunun 1 inci maddesiyle", [(2365, 'normal', 1)]),
+    ("5237 sayılı Türk Ceza Kanununun ek 2 nci maddesi", [(5237, 'ek', 2)]),
+    ("bu Kanunun 5 ve 6 ncı maddeleri", [(None, 'normal', 5), (None, 'normal', 6)]),
+    # Madde belirtilmeyen atıf kanunun tamamına, Resmî Gazete sayısı ve KHK atıf değildir
+    ("213 sayılı Vergi Usul Kanunu ile 26781 sayılı Resmî Gazetede yayımlanan", [(213, 'normal', 0)]),
+    ("375 sayılı Kanun Hükmünde Kararname", []),
+])
+def test_atiflar_cikarilir(metin, beklenen):
+    assert extract_atiflar(metin) == beklenen
+
+
+def test_tekrarlanan_atif_bir_kez_doner():
+    metin = "4458 sayılı Kanunun 3 üncü maddesi ve 4458 sayılı Kanunun 3 üncü maddesi"
+    assert extract_atiflar(metin) == [(4458, 'normal', 3)]
+
+
+@pytest.fixture(scope='module')
+def index():
+    return index_kur(kanunlari_oku(40))
+
+
+def test_ters_atiflar_ileri_atiflarla_tutarli(index):
+    cozulen = 0
+    for row in range(index.madde_sayisi):
+        hedefler = index._atif_hedef_satirlar[index._atif_ptr[row]:index._atif_ptr[row + 1]]
+        for hedef in hedefler[hedefler >= 0].tolist():
+            cozulen += 1
+            assert hedef != row
+            kaynaklar = index._atif_ters_kaynaklar[index._atif_ters_ptr[hedef]:index._atif_ters_ptr[hedef + 1]]
+            assert row in kaynaklar
+    assert cozulen == len(index._atif_ters_kaynaklar) > 0
+
+
+def test_kanun_atif_edenler_kendisini_icermez(index):
+    hedef_ids = np.unique(index._atif_hedef_kanun_ids[index._atif_hedef_kanun_ids >= 0])
+    baska_kanundan = 0
+    for kanun_id in hedef_ids.tolist():
+        kanun_no = index.kanunlar[kanun_id].kanun_no
+        edenler = index.kanun_atif_edenler(kanun_no)
+        assert all(eden['kanun_no'] != kanun_no for eden in edenler)
+        sayilar = [eden['atif_eden_madde_sayisi'] for eden in edenler]
+        assert sayilar == sorted(sayilar, reverse=True)
+        baska_kanundan += len(edenler)
+    assert baska_kanundan > 0
+    assert index.kanun_atif_edenler('99990000') is None
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Sorgu kaydını ve ısınma sorgularının kayıttan okunmasını test eder"""
+
+import yardimci  # noqa: F401 (repo kökünü sys.path'e ekler)
+from kanun_baslangic import isinma_sorgulari
+from kanun_profiler import SorguProfilleyici
+
+
+def test_sorgu_kaydi_tum_sorulari_yazar_ve_isinma_en_siklari_okur(tmp_path):
+    log_path = str(tmp_path / "queries.log")
+    profiler = SorguProfilleyici(log_path=str(tmp_path / "slow.log"), sorgu_log_path=log_path)
+    for soru, kanun_no in [("vergi cezası", None), ("kira artışı", None), ("vergi cezası", None),
+                           ("vergi cezası", ["02130000"])]:
+        assert profiler.sorgu_kaydet({"question": soru, "max_results": 5, "offset": 0,
+                                      "kanun_adi": None, "kanun_no": kanun_no})
+
+    sorgular = isinma_sorgulari(log_path, 2)
+    assert [(s['question'], s['filtreler']) for s in sorgular] == [
+        ("vergi cezası", {"kanun_no": None}), ("kira artışı", {"kanun_no": None})]
+    # Yavaş sorgu kaydı eşik aşılmadıkça oluşmaz
+    assert not (tmp_path / "slow.log").exists()
+
+
+def test_sorgu_orani_sifirsa_kayit_yazilmaz(tmp_path):
+    log_path = str(tmp_path / "queries.log")
+    profiler = SorguProfilleyici(sorgu_log_path=log_path, sorgu_orani=0)
+    assert not profiler.sorgu_kaydet({"question": "vergi"})
+    assert isinma_sorgulari(log_path, 5) == []
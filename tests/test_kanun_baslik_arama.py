@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Kanun başlığı önek ve trigram indekslerini test eder"""
+
+import numpy as np
+
+import yardimci  # noqa: F401 (repo kökünü sys.path'e ekler)
+from kanun_baslik_arama import BaslikOnekIndeksi, BaslikTrigramIndeksi, kisaltma_cikar, sinirli_edit_mesafesi
+
+BASLIKLAR = [
+    "213 sayılı Vergi Usul Kanunu (VUK.) 04.01.1961",
+    "193 sayılı Gelir Vergisi Kanunu (GVK.)",
+    "2004 sayılı İcra ve İflas Kanunu (İİK.)",
+    "4458 sayılı Gümrük Kanunu",
+]
+KANUN_NOLARI = ["02130000", "01930000", "20040000", "44580000"]
+
+
+def onek_indeksi(basliklar=BASLIKLAR, kanun_nolari=KANUN_NOLARI):
+    indeks = BaslikOnekIndeksi()
+    indeks.build(basliklar, kanun_nolari)
+    return indeks
+
+
+def test_kisaltma_cikar():
+    assert kisaltma_cikar(BASLIKLAR[0]) == 'VUK'
+    assert kisaltma_cikar(BASLIKLAR[2]) == 'İİK'
+    assert kisaltma_cikar(BASLIKLAR[3]) is None
+
+
+def test_onek_kelime_numara_ve_kisaltma_eslesir():
+    indeks = onek_indeksi()
+    assert indeks.ara("ver") == [0, 1]
+    assert indeks.ara("icra iflas") == [2]
+    assert indeks.ara("0213") == [0]
+    # Kısaltma Türkçe küçük harf kurallarıyla eşleşir
+    assert indeks.ara("iik") == indeks.ara("İİK") == [2]
+    # Her sorgu kelimesi aynı başlıkta eşleşmeli
+    assert indeks.ara("vergi gümrük") == []
+    assert indeks.ara("") == []
+
+
+def test_siralama_konum_ve_baslik_uzunluguna_gore():
+    indeks = onek_indeksi()
+    # "kanun" öneki hepsinde eşleşir: kelime konumu önce, sonra kısa başlık
+    assert indeks.ara("kanun") == [3, 1, 0, 2]
+    assert indeks.ara("kanun", limit=2) == [3, 1]
+
+
+def test_ekle_ve_sil_yeniden_kurulumla_ayni():
+    indeks = onek_indeksi().kopya()
+    indeks.sil(0)
+    assert indeks.ekle("5237 sayılı Türk Ceza Kanunu", "52370000") == 4
+    assert indeks.ara("vergi") == [1]
+    assert indeks.ara("türk") == [4]
+
+    taze = onek_indeksi([None] + BASLIKLAR[1:] + ["5237 sayılı Türk Ceza Kanunu"], KANUN_NOLARI + ["52370000"])
+    assert indeks.tokenler == taze.tokenler
+    assert np.array_equal(indeks.kanun_ids, taze.kanun_ids)
+    assert np.array_equal(indeks.konumlar, taze.konumlar)
+    assert np.array_equal(indeks.baslik_uzunluklari, taze.baslik_uzunluklari)
+
+
+def test_kopya_asil_indeksi_degistirmez():
+    indeks = onek_indeksi()
+    kopya = indeks.kopya()
+    kopya.sil(1)
+    kopya.ekle("5237 sayılı Türk Ceza Kanunu", "52370000")
+    assert indeks.ara("gelir") == [1]
+    assert indeks.ara("türk") == []
+    assert indeks.kanun_sayisi == 4
+
+
+def trigram_indeksi(basliklar=BASLIKLAR):
+    indeks = BaslikTrigramIndeksi()
+    indeks.build(basliklar)
+    return indeks
+
+
+def test_sinirli_edit_mesafesi():
+    assert sinirli_edit_mesafesi("kitap", "kitab", 1) == 1
+    # Sınırı aşan mesafe sinir + 1 döner
+    assert sinirli_edit_mesafesi("abc", "xyz", 1) == 2
+    assert sinirli_edit_mesafesi("mahkeme", "mahkemesi", 1, onek=True) == 0
+
+
+def test_trigram_yazim_hatalarini_ve_turkce_karakterleri_tolere_eder():
+    indeks = trigram_indeksi()
+    assert indeks.ara("vergi usul kanunu")[0] == (0, 1.0)
+    assert indeks.ara("vergi usl")[0][0] == 0
+    assert indeks.ara("gumruk kanunu")[0] == (3, 1.0)
+    assert [kanun_id for kanun_id, _ in indeks.ara("ikra ve iflas")] == [2]
+    assert indeks.ara("gelir vergi")[0][0] == 1
+    assert indeks.ara("zzzz") == []
+
+    benzerlikler = [benzerlik for _, benzerlik in indeks.ara("vergi usul kanunu")]
+    assert benzerlikler == sorted(benzerlikler, reverse=True)
+
+
+def test_trigram_ekle_ve_sil_yeniden_kurulumla_ayni():
+    indeks = trigram_indeksi().kopya()
+    indeks.sil(2)
+    assert indeks.ekle("5237 sayılı Türk Ceza Kanunu") == 4
+    taze = trigram_indeksi(BASLIKLAR[:2] + [None] + BASLIKLAR[3:] + ["5237 sayılı Türk Ceza Kanunu"])
+
+    for sorgu in ["ikra ve iflas", "turk ceza", "vergi usul", "gumruk", "kanunu"]:
+        assert indeks.ara(sorgu) == taze.ara(sorgu)
+    assert indeks.ara("icra iflas") == []
+    assert np.array_equal(indeks.ad_uzunluklari, taze.ad_uzunluklari)
+
+    # Silinen kanunun kelimeleri yeniden eklenince aranabilir olur
+    assert indeks.ekle(BASLIKLAR[2]) == 5
+    assert indeks.ara("icra ve iflas")[0] == (5, 1.0)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Değişiklik notu ayrıştırıcısını ve indeksteki değişiklik geçmişi sorgularını test eder"""
+
+import pytest
+
+from yardimci import index_kur, kanunlari_oku
+from kanun_degisiklik import extract_degisiklikler, is_mulga
+
+
+def test_mulga_notu_maddeyi_kaldirir():
+    olaylar = extract_degisiklikler("Madde 5 – (Mülga: 2/7/2018 - KHK/703/18 md.)", "Madde 5 –")
+    assert len(olaylar) == 1
+    olay = olaylar[0]
+    assert (olay['tarih'], olay['tur'], olay['kapsam']) == (20180702, 'mulga', 'madde')
+    # KHK numarası değiştiren kanun numarası olarak okunmaz
+    assert olay['kanun_no'] is None
+    assert is_mulga(olaylar)
+
+
+def test_uzun_ve_kisa_notlar_ayristirilir():
+    metin = ("Görev – (Değişik: 12/7/2013-6495/24 md.) Kurul üyeleri (Ek cümle: 08.02.2008 tarih ve 26781 "
+             "sayılı Resmi Gazetede yayımlanan 5728 sayılı Kanunun 3 üncü maddesiyle eklenmiştir.) seçilir.")
+    degisik, ek = extract_degisiklikler(metin, "Görev –")
+    assert (degisik['tarih'], degisik['tur'], degisik['kapsam']) == (20130712, 'degisiklik', 'madde')
+    assert (degisik['kanun_no'], degisik['kanun_madde_no']) == (6495, 24)
+    assert degisik['madde_basinda']
+    assert (ek['tarih'], ek['tur'], ek['kapsam']) == (20080208, 'ekleme', 'cumle')
+    assert (ek['resmi_gazete_sayisi'], ek['kanun_no'], ek['kanun_madde_no']) == (26781, 5728, 3)
+    assert not ek['madde_basinda']
+    assert not is_mulga([degisik, ek])
+
+
+def test_govde_icindeki_mulga_fikra_maddeyi_kaldirmaz():
+    metin = "Madde 3 – Birinci fıkra. (Mülga fıkra: 1/1/2010 - 5000/1 md.)"
+    olaylar = extract_degisiklikler(metin, "Madde 3 –")
+    assert [olay['tur'] for olay in olaylar] == ['mulga']
+    assert not is_mulga(olaylar)
+
+
+def test_tarihsiz_parantez_not_sayilmaz():
+    assert extract_degisiklikler("Madde 1 – (Ek ibare) Bu Kanunun amacı.", "Madde 1 –") == []
+
+
+@pytest.fixture(scope='module')
+def index():
+    return index_kur(kanunlari_oku(20))
+
+
+def test_degisiklik_ara_tarih_sirasinda_ve_aralikta(index):
+    tumu = index.degisiklik_ara(limit=100000)
+    assert tumu['toplam'] == len(tumu['degisiklikler']) > 0
+    tarihler = [degisiklik['tarih'][6:] + degisiklik['tarih'][3:5] + degisiklik['tarih'][:2]
+                for degisiklik in tumu['degisiklikler']]
+    assert tarihler == sorted(tarihler)
+
+    aralik = index.degisiklik_ara('01.01.2010', '31.12.2015', limit=100000)
+    assert 0 < aralik['toplam'] < tumu['toplam']
+    assert all('2010' <= degisiklik['tarih'][6:] <= '2015' for degisiklik in aralik['degisiklikler'])
+
+
+def test_degisiklik_ara_gecersiz_tur_hata_verir(index):
+    with pytest.raises(ValueError):
+        index.degisiklik_ara(tur=['yok'])
+
+
+def test_mulga_maddeler_mulga_maskesiyle_ayni(index):
+    assert len(index._mulga_satirlari) > 0
+    for kanun in index.kanunlar:
+        mulgalar = index.mulga_maddeler(kanun.kanun_no)
+        satirlar = [row for row in range(kanun.satir_baslangic, kanun.satir_bitis) if index.mulga_mi(row)]
+        assert len(mulgalar) == len(satirlar)
+        for madde in mulgalar:
+            assert madde['degisiklik'] is None or madde['degisiklik']['tur'] in ('mulga', 'iptal')
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Canlı kanun güncellemesi yarıda kaldığında metin bloklarının kanunlarla eşleşmesini test eder"""
+
+import numpy as np
+import pytest
+
+from yardimci import KanunIndex, SahteModel, index_kur, kanunlari_oku
+
+
+def metinler_eslesiyor(index, kanunlar):
+    """Her canlı satırın metni kendi kanununun parse edilmiş madde metniyle aynı olmalı"""
+    beklenen = {kanun['kanun_no']: [madde['icerik'] for madde in kanun['maddeler']] for kanun in kanunlar}
+    for kanun_id, kanun in enumerate(index.kanunlar):
+        if kanun_id in index._silinen_kanunlar:
+            continue
+        satirlar = range(kanun.satir_baslangic, kanun.satir_bitis)
+        assert [index.get_madde_icerik(row) for row in satirlar] == beklenen[kanun.kanun_no]
+
+
+def ariza_encoder(index, model):
+    model.hatali = True
+
+
+def ariza_turetme(index, model):
+    def hata(*args, **kwargs):
+        raise RuntimeError("türetme hatası")
+    index._atif_guncelle = hata
+
+
+@pytest.mark.parametrize('nicem', [False, True])
+@pytest.mark.parametrize('ariza', [ariza_encoder, ariza_turetme])
+def test_basarisiz_guncelleme_metinleri_kaydirmaz(nicem, ariza):
+    kanunlar = kanunlari_oku(5)
+    index = KanunIndex(nicem_vektorler=nicem)
+    for kanun in kanunlar[:3]:
+        index.add_kanun(kanun)
+    model = SahteModel()
+    index.build(model)
+
+    ariza(index, model)
+    with pytest.raises(RuntimeError):
+        index.upsert_kanun(kanunlar[3])
+    assert index.canli_kanun_sayisi == 3
+    metinler_eslesiyor(index, kanunlar)
+
+    # Arıza giderildikten sonra eklenen kanunlar kendi metinlerini okur
+    model.hatali = False
+    vars(index).pop('_atif_guncelle', None)
+    index.upsert_kanun(kanunlar[3])
+    index.upsert_kanun(kanunlar[4])
+    index.upsert_kanun(kanunlar[0])
+    assert index.canli_kanun_sayisi == 5
+    metinler_eslesiyor(index, kanunlar)
+
+    # Compaction tombstone'lu ve sahipsiz blokları kaldırır
+    index.compact()
+    metinler_eslesiyor(index, kanunlar)
+    assert len(index.text_store) == index.kanun_sayisi
+
+
+def test_guncelleme_sonrasi_etiket_ve_liste_taze_build_ile_ayni():
+    kanunlar = kanunlari_oku(5)
+    taze = KanunIndex()
+    for kanun in kanunlar:
+        taze.add_kanun(kanun)
+    taze.build(SahteModel())
+
+    index = KanunIndex()
+    for kanun in kanunlar:
+        index.add_kanun(kanun)
+    index.build(SahteModel())
+    # Aynı içerikle güncellenen kanun iç sırada sona taşınır
+    index.upsert_kanun(kanunlar[1])
+    assert index.kanunlar[-1].kanun_no == kanunlar[1]['kanun_no']
+
+    assert index.list_kanunlar() == taze.list_kanunlar()
+    assert index.etiket == taze.etiket
+    index.compact()
+    assert index.list_kanunlar() == taze.list_kanunlar()
+    assert index.etiket == taze.etiket
+
+
+TURETILMIS_DIZILER = [
+    '_kanun_tarihleri', '_satir_kanun_ids', '_silinmis_kanun_mask', '_vektor_satirlari', '_vektor_satir_ptr',
+    '_atif_ptr', '_atif_hedef_kanun_ids', '_atif_hedef_satirlar', '_atif_ters_ptr', '_atif_ters_kaynaklar',
+    '_kanun_atif_ptr', '_kanun_atif_kaynaklar', '_degisiklik_ptr', '_degisiklik_satirlari',
+    '_degisiklik_tarih_sirasi', '_mulga_satirlari', 'kanun_centroids', '_kanun_baslik_ids',
+]
+
+
+def test_artimli_guncelleme_tam_yeniden_turetmeyle_ayni():
+    kanunlar = kanunlari_oku(40)
+    index = index_kur(kanunlar[:35])
+    index.upsert_kanun(kanunlar[35])
+    index.upsert_kanun(kanunlar[3])
+    index.remove_kanun(kanunlar[10]['kanun_no'])
+    index.remove_kanun(kanunlar[35]['kanun_no'])
+    index.upsert_kanun(kanunlar[36])
+    index.upsert_kanun(kanunlar[10])
+
+    taze = index._golge()
+    taze._yeniden_turet()
+    for ad in TURETILMIS_DIZILER:
+        assert np.array_equal(getattr(index, ad), getattr(taze, ad)), ad
+    assert index._kanun_ids == taze._kanun_ids
+    assert index._kanun_no_sirasi == taze._kanun_no_sirasi
+    assert index.tombstone_satir_sayisi == taze.tombstone_satir_sayisi
+    assert index.baslik_onek_indeksi.tokenler == taze.baslik_onek_indeksi.tokenler
+    assert np.array_equal(index.baslik_onek_indeksi.kanun_ids, taze.baslik_onek_indeksi.kanun_ids)
+    for sorgu in ['vergi', 'kanun', 'gumruk kanunu', 'ceza muhakemesi']:
+        assert index.suggest_kanunlar(sorgu) == taze.suggest_kanunlar(sorgu)
+        assert index.search_kanunlar(sorgu) == taze.search_kanunlar(sorgu)
+    assert index.etiket == taze.etiket
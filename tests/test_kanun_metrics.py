@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Prometheus metin biçimindeki metrik çıktısını test eder"""
+
+import yardimci  # noqa: F401 (repo kökünü sys.path'e ekler)
+from kanun_metrics import Counter, Gauge, Histogram, KanunMetrics
+
+
+def test_counter_etiketleri_siralar_ve_kacirir():
+    sayac = Counter('istekler_total', "İstek sayısı", ('route', 'status'))
+    sayac.inc('/ask', '200')
+    sayac.inc('/ask', '200', amount=2)
+    sayac.inc('/a"b\\c', '500')
+    assert sayac.render() == [
+        '# HELP istekler_total İstek sayısı',
+        '# TYPE istekler_total counter',
+        'istekler_total{route="/a\\"b\\\\c",status="500"} 1',
+        'istekler_total{route="/ask",status="200"} 3',
+    ]
+
+
+def test_gauge_fonksiyonu_her_okumada_cagrilir():
+    degerler = iter([1, 2.5])
+    gosterge = Gauge('deger', "Değer", lambda: next(degerler))
+    assert gosterge.render()[-1] == 'deger 1'
+    assert gosterge.render()[-1] == 'deger 2.5'
+
+
+def test_histogram_kovalari_kumulatif():
+    histogram = Histogram('sure_seconds', "Süre", ('stage',), buckets=(0.1, 1.0))
+    for sure in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(sure, 'encode')
+    assert histogram.count('encode') == 4
+    assert histogram.render()[2:] == [
+        'sure_seconds_bucket{stage="encode",le="0.1"} 2',
+        'sure_seconds_bucket{stage="encode",le="1"} 3',
+        'sure_seconds_bucket{stage="encode",le="+Inf"} 4',
+        'sure_seconds_sum{stage="encode"} 3.65',
+        'sure_seconds_count{stage="encode"} 4',
+    ]
+
+
+def test_kanun_metrics_render():
+    metrics = KanunMetrics()
+    metrics.observe_request('POST', '/ask', 200, 0.02)
+    metrics.observe_stage('scoring', 0.003)
+    cikti = metrics.render()
+    assert cikti.endswith('\n')
+    satirlar = cikti.splitlines()
+    assert 'kanun_http_requests_total{method="POST",route="/ask",status="200"} 1' in satirlar
+    assert 'kanun_http_request_duration_seconds_count{method="POST",route="/ask"} 1' in satirlar
+    assert 'kanun_search_stage_duration_seconds_bucket{stage="scoring",le="0.005"} 1' in satirlar
+    assert '# TYPE kanun_search_executor_queue_depth gauge' in satirlar
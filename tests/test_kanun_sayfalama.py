@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Opak cursor'ların kodlanmasını ve bozuk cursor'ların reddedilmesini test eder"""
+
+import base64
+
+import pytest
+
+import yardimci  # noqa: F401 (repo kökünü sys.path'e ekler)
+from kanun_sayfalama import CursorHatasi, SiralamaOnbellegi, decode_cursor, encode_cursor
+
+ALANLAR = dict(gerekli_alanlar=("q", "n", "o"), metin_alanlari=("q",), tamsayi_alanlari=("n", "o"),
+               sozluk_alanlari={"f": ("kanun_no", "madde_turu")})
+
+
+def ham_cursor(metin: str) -> str:
+    return base64.urlsafe_b64encode(metin.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def test_cursor_gidis_donus():
+    veri = {"q": "işçi ücreti ödenmezse", "n": 5, "o": 10, "f": {"kanun_no": ["48570000"], "madde_turu": None}}
+    cursor = encode_cursor(veri)
+    assert '=' not in cursor and '+' not in cursor and '/' not in cursor
+    assert decode_cursor(cursor, **ALANLAR) == veri
+
+
+@pytest.mark.parametrize('cursor', [
+    "!!!",
+    ham_cursor("json değil"),
+    ham_cursor('["q", "n", "o"]'),
+    ham_cursor('{"q": "vergi", "n": 5}'),
+    ham_cursor('{"q": 5, "n": 5, "o": 0}'),
+    ham_cursor('{"q": "vergi", "n": 5, "o": -5}'),
+    ham_cursor('{"q": "vergi", "n": true, "o": 0}'),
+    ham_cursor('{"q": "vergi", "n": 5, "o": 1.5}'),
+    ham_cursor('{"q": "vergi", "n": 5, "o": 0, "f": []}'),
+    ham_cursor('{"q": "vergi", "n": 5, "o": 0, "f": {"bilinmeyen": 1}}'),
+])
+def test_bozuk_cursor_reddedilir(cursor):
+    with pytest.raises(CursorHatasi):
+        decode_cursor(cursor, **ALANLAR)
+
+
+def test_siralama_onbellegi_lru_ve_ttl():
+    onbellek = SiralamaOnbellegi(max_kayit=2, ttl_saniye=60)
+    onbellek.put('a', 1)
+    onbellek.put('b', 2)
+    assert onbellek.get('a') == 1
+    onbellek.put('c', 3)
+    # En eski kullanılan ('b') atılır
+    assert onbellek.get('b') is None
+    assert (onbellek.get('a'), onbellek.get('c')) == (1, 3)
+
+    onbellek.ttl_saniye = -1
+    assert onbellek.get('a') is None
+    assert len(onbellek) == 1
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Kelime ofsetlerini, snippet pencerelerini ve vurgu ofsetlerini test eder"""
+
+import numpy as np
+import pytest
+
+from yardimci import index_kur, kanunlari_oku
+from kanun_baslik_arama import ascii_katla
+from kanun_snippet import KelimeOfsetleri
+
+METINLER = [
+    "İşçinin ücreti, İş Kanunu uyarınca ödenir. Sözleşmesinin feshi halinde kıdem tazminatı doğar.",
+    "Kira sözleşmesi yazılı yapılır; kiracı kira bedelini öder.",
+    "Vergi ziyaı cezası uygulanır.",
+]
+
+
+def ofsetler(metinler=METINLER):
+    tablo = KelimeOfsetleri()
+    for metin in metinler:
+        tablo.ekle(metin)
+    return tablo
+
+
+def kelimeler(tablo, metin_id):
+    bas, son = tablo.ptr[metin_id], tablo.ptr[metin_id + 1]
+    return [(tablo.baslangiclar[i], tablo.baslangiclar[i] + tablo.uzunluklar[i]) for i in range(bas, son)]
+
+
+def test_ofsetler_metindeki_kelimeleri_gosterir():
+    tablo = ofsetler()
+    assert len(tablo) == 3
+    for metin_id, metin in enumerate(METINLER):
+        parcalar = [metin[bas:son] for bas, son in kelimeler(tablo, metin_id)]
+        assert parcalar[:3] == {0: ["İşçinin", "ücreti", "İş"], 1: ["Kira", "sözleşmesi", "yazılı"],
+                                2: ["Vergi", "ziyaı", "cezası"]}[metin_id]
+    # Terim ASCII'ye katlanmış ilk 5 karakterdir ("İşçinin" -> "iscin")
+    assert tablo._terim_ids[ascii_katla("işçinin")[:5]] == tablo.terimler[0]
+    # "sözleşme" terimi iki metinde geçer
+    assert tablo.terim_df[tablo._terim_ids["sozle"]] == 2
+
+
+def test_pencere_eslesmeleri_ortalar_ve_vurgular():
+    metin = " ".join(f"kelime{i}" for i in range(100)) + " tazminat hakkı " + " ".join(["dolgu"] * 50)
+    tablo = ofsetler([metin])
+    bas, son, vurgular = tablo.pencere(0, tablo.sorgu_agirliklari("tazminatın hakkının"), 20)
+    assert 0 < bas < son < len(metin)
+    assert len(metin[bas:son].split()) == 20
+    assert [metin[v_bas:v_son] for v_bas, v_son in vurgular] == ["tazminat", "hakkı"]
+    assert all(bas <= v_bas < v_son <= son for v_bas, v_son in vurgular)
+
+
+def test_eslesme_yoksa_pencere_metnin_basidir():
+    tablo = ofsetler()
+    assert tablo.sorgu_agirliklari("bambaşka sorgu") is None
+    bas, son, vurgular = tablo.pencere(0, None, 5)
+    assert (bas, vurgular) == (0, [])
+    assert METINLER[0][bas:son] == "İşçinin ücreti, İş Kanunu uyarınca"
+    # Kısa metinde pencere metnin sonuna kadar uzanır
+    assert tablo.pencere(2, None, 40)[:2] == (0, -1)
+
+
+def test_suz_secilen_metinlerden_yeniden_kurulumla_ayni():
+    tablo = ofsetler()
+    suzulen = tablo.suz(np.array([2, 0]))
+    taze = ofsetler([METINLER[2], METINLER[0]])
+    for ad in ('ptr', 'baslangiclar', 'uzunluklar'):
+        assert getattr(suzulen, ad) == getattr(taze, ad)
+    terimler = {terim_id: terim for terim, terim_id in tablo._terim_ids.items()}
+    taze_terimler = {terim_id: terim for terim, terim_id in taze._terim_ids.items()}
+    assert [terimler[t] for t in suzulen.terimler] == [taze_terimler[t] for t in taze.terimler]
+    assert suzulen.terim_df[suzulen._terim_ids["sozle"]] == 1
+
+
+def test_kopya_asil_tabloyu_degistirmez():
+    tablo = ofsetler()
+    kopya = tablo.kopya()
+    kopya.ekle("Yeni metin eklendi.")
+    assert (len(tablo), len(kopya)) == (3, 4)
+    assert "yeni" not in tablo._terim_ids
+
+
+@pytest.fixture(scope='module')
+def index():
+    return index_kur(kanunlari_oku(5))
+
+
+def test_madde_snippet_ofsetleri_tam_metinle_tutarli(index):
+    sorgu = "vergi cezası"
+    agirliklar = index.kelime_ofsetleri.sorgu_agirliklari(sorgu)
+    vurgulu = 0
+    for row in range(index.madde_sayisi):
+        snippet = index.snippet(row, agirliklar)
+        # Tekilleştirilen maddelerde ofsetler metni paylaşan ilk satırın metnine aittir
+        metin = index.get_madde_icerik(index.vektor_ilk_satir[index.madde_vektor_ids[row]])
+        assert snippet['madde_uzunlugu'] == len(metin)
+        assert snippet['text'] == metin[snippet['baslangic']:snippet['bitis']]
+        for vurgu_bas, vurgu_son in snippet['vurgular']:
+            kelime = snippet['text'][vurgu_bas:vurgu_son]
+            assert ascii_katla(kelime)[:5] in ("vergi", "cezas")
+            vurgulu += 1
+    assert vurgulu > 0
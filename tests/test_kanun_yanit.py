@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Kodlama seçimini, kodlama ekli ETag eşleşmesini ve ETag/sıkıştırma middleware'lerini test eder"""
+
+import pytest
+
+from yardimci import sunucu_yukle
+import kanun_yanit
+from kanun_yanit import eslesen_etag, kodlama_sec
+
+
+@pytest.mark.parametrize('brotli_var', [True, False])
+@pytest.mark.parametrize('accept_encoding, beklenen_br, beklenen', [
+    ('gzip', 'gzip', 'gzip'),
+    ('br, gzip', 'br', 'gzip'),
+    ('gzip, deflate, br;q=0', 'gzip', 'gzip'),
+    ('*', 'br', 'gzip'),
+    ('*;q=0, gzip;q=0.5', 'gzip', 'gzip'),
+    ('gzip;q=0', None, None),
+    ('gzip;q=abc', None, None),
+    ('identity', None, None),
+    ('', None, None),
+])
+def test_kodlama_sec(monkeypatch, brotli_var, accept_encoding, beklenen_br, beklenen):
+    monkeypatch.setattr(kanun_yanit, 'brotli', object() if brotli_var else None)
+    assert kodlama_sec(accept_encoding) == (beklenen_br if brotli_var else beklenen)
+
+
+@pytest.mark.parametrize('if_none_match, beklenen', [
+    ('"abc"', '"abc"'),
+    ('"abc-gzip"', '"abc-gzip"'),
+    ('W/"abc-br"', 'W/"abc-br"'),
+    ('"eski", "abc-gzip"', '"abc-gzip"'),
+    ('*', '"abc"'),
+    ('"abcd"', None),
+    ('"abc-deflate"', None),
+    # Yalnızca bir kodlama eki çıkarılır
+    ('"abc-gzip-gzip"', None),
+])
+def test_eslesen_etag(if_none_match, beklenen):
+    assert eslesen_etag(if_none_match, 'abc') == beklenen
+
+
+@pytest.fixture(scope='module', params=['n8n_api_server', 'repocloud_api_server'])
+def istemci(request):
+    return sunucu_yukle(request.param)[1]
+
+
+def test_sikistirilmis_yanit_ayni_govdeyi_ve_ekli_etag_doner(istemci):
+    duz = istemci.get('/kanunlar', headers={'Accept-Encoding': 'identity'})
+    sikistirilmis = istemci.get('/kanunlar', headers={'Accept-Encoding': 'gzip'})
+    assert 'content-encoding' not in duz.headers
+    assert sikistirilmis.headers['content-encoding'] == 'gzip'
+    assert sikistirilmis.headers['vary'] == 'Accept-Encoding'
+    assert sikistirilmis.json() == duz.json()
+    assert sikistirilmis.headers['etag'] == duz.headers['etag'][:-1] + '-gzip"'
+
+
+@pytest.mark.parametrize('accept_encoding', ['identity', 'gzip'])
+def test_eslesen_etag_304_ve_ayni_etiketi_doner(istemci, accept_encoding):
+    ilk = istemci.get('/kanunlar', headers={'Accept-Encoding': accept_encoding})
+    etag = ilk.headers['etag']
+    tekrar = istemci.get('/kanunlar', headers={'Accept-Encoding': accept_encoding, 'If-None-Match': etag})
+    assert tekrar.status_code == 304
+    assert tekrar.headers['etag'] == etag
+    assert tekrar.content == b''
+
+    # Başka bir URL'nin ETag'i eşleşmez
+    diger = istemci.get('/kanunlar?limit=2', headers={'Accept-Encoding': accept_encoding, 'If-None-Match': etag})
+    assert diger.status_code == 200
+
+
+def test_etag_yalnizca_indeks_yanitlarina_eklenir(istemci):
+    assert 'etag' not in istemci.post('/ask', json={'question': 'vergi'}).headers
+    assert 'etag' not in istemci.get('/kanunlar/99990000/toc').headers
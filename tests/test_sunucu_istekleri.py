@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""/ask isteklerinin doğrulanmasını, filtrelerini ve varsayılanlarını iki sunucu için test eder"""
+
+import pytest
+
+from yardimci import sunucu_yukle
+from kanun_baslangic import isinma_sorgulari
+from kanun_sayfalama import decode_cursor, encode_cursor
+
+SUNUCULAR = ['n8n_api_server', 'repocloud_api_server']
+
+
+@pytest.fixture(scope='module', params=SUNUCULAR)
+def istemci(request):
+    return sunucu_yukle(request.param)[1]
+
+
+def test_max_results_null_varsayilan_sayfa_boyutunu_kullanir(istemci):
+    yanit = istemci.post('/ask', json={'question': 'vergi', 'max_results': None})
+    assert yanit.status_code == 200
+    assert len(yanit.json()['answers']) == 5
+    assert yanit.json()['next_cursor']
+
+
+@pytest.mark.parametrize('filtre, hata', [
+    ({'yayim_tarihi_baslangic': '31.02.2000'}, 'Geçersiz tarih: 31.02.2000'),
+    ({'yayim_tarihi_bitis': '2000/01/01'}, 'Geçersiz tarih: 2000/01/01'),
+    ({'madde_turu': ['normal', 'yok']}, 'Geçersiz madde türü: yok'),
+])
+def test_gecersiz_filtre_400_doner(istemci, filtre, hata):
+    yanit = istemci.post('/ask', json={'question': 'vergi', **filtre})
+    assert yanit.status_code == 400
+    assert yanit.json()['detail'].startswith(hata)
+
+
+def test_madde_turu_ve_kanun_no_filtreleri(istemci):
+    yanit = istemci.post('/ask', json={'question': 'vergi', 'max_results': 20, 'madde_turu': ['gecici']})
+    cevaplar = yanit.json()['answers']
+    assert cevaplar and all(cevap['madde_turu'] == 'gecici' for cevap in cevaplar)
+
+    yanit = istemci.post('/ask', json={'question': 'vergi', 'max_results': 20, 'kanun_no': ['01950000']})
+    cevaplar = yanit.json()['answers']
+    assert cevaplar and all(cevap['kanun_no'] == '01950000' for cevap in cevaplar)
+
+
+@pytest.mark.parametrize('baslangic, bitis', [('01.01.1961', '31.12.1961'), ('1961-01-01', '1961-12-31')])
+def test_yayim_tarihi_araligi(istemci, baslangic, bitis):
+    yanit = istemci.post('/ask', json={'question': 'vergi', 'max_results': 20,
+                                       'yayim_tarihi_baslangic': baslangic, 'yayim_tarihi_bitis': bitis})
+    assert yanit.status_code == 200
+    cevaplar = yanit.json()['answers']
+    assert cevaplar and all(cevap['yayim_tarihi'].endswith('.1961') for cevap in cevaplar)
+
+
+@pytest.mark.parametrize('modul_adi', SUNUCULAR)
+def test_304_yanitlari_route_sablonuyla_sayilir(modul_adi):
+    sunucu, istemci = sunucu_yukle(modul_adi)
+    route = '/kanunlar/{kanun_no}/toc'
+    onceki = sunucu.metrics.http_istekleri.value('GET', route, '304')
+
+    etag = istemci.get('/kanunlar/01950000/toc').headers['etag']
+    yanit = istemci.get('/kanunlar/01950000/toc', headers={'If-None-Match': etag})
+    assert yanit.status_code == 304
+    assert sunucu.metrics.http_istekleri.value('GET', route, '304') == onceki + 1
+
+
+def cevap_anahtarlari(yanit):
+    return [(cevap['kanun_no'], cevap['madde_turu'], cevap['madde_no']) for cevap in yanit.json()['answers']]
+
+
+def test_cursor_sonraki_sayfayi_tek_istekle_ayni_dondurur(istemci):
+    filtre = {'madde_turu': ['normal', 'gecici']}
+    ilk = istemci.post('/ask', json={'question': 'vergi ceza', 'max_results': 3, **filtre})
+    ikinci = istemci.post('/ask', json={'question': 'vergi ceza', 'cursor': ilk.json()['next_cursor']})
+    assert ikinci.status_code == 200
+    assert ikinci.json()['question'] == 'vergi ceza'
+    tek = istemci.post('/ask', json={'question': 'vergi ceza', 'max_results': 6, **filtre})
+    assert cevap_anahtarlari(ilk) + cevap_anahtarlari(ikinci) == cevap_anahtarlari(tek)
+
+
+@pytest.mark.parametrize('degisiklik', [
+    {'o': -3},
+    {'n': 'beş'},
+    {'s': -1},
+    {'f': {'bilinmeyen': 1}},
+    {'f': {'madde_turu': ['yok']}},
+    {'f': {'yayim_tarihi_baslangic': '31.02.2000'}},
+])
+def test_degistirilmis_cursor_400_doner(istemci, degisiklik):
+    ilk = istemci.post('/ask', json={'question': 'vergi', 'max_results': 2})
+    sayfa = decode_cursor(ilk.json()['next_cursor'])
+    for alan, deger in degisiklik.items():
+        if alan == 'f':
+            sayfa['f'] = {**sayfa['f'], **deger}
+        else:
+            sayfa[alan] = deger
+    yanit = istemci.post('/ask', json={'question': 'vergi', 'cursor': encode_cursor(sayfa)})
+    assert yanit.status_code == 400
+
+
+def test_bozuk_cursor_400_doner(istemci):
+    yanit = istemci.post('/ask', json={'question': 'vergi', 'cursor': 'bozuk!'})
+    assert yanit.status_code == 400
+
+
+def test_kanunlar_keyset_sayfalama(istemci):
+    tumu = [kanun['kanun_no'] for kanun in istemci.get('/kanunlar').json()['kanunlar']]
+    gezilen, after = [], None
+    while True:
+        params = {'limit': 3} if after is None else {'limit': 3, 'after': after}
+        sayfa = istemci.get('/kanunlar', params=params).json()
+        gezilen += [kanun['kanun_no'] for kanun in sayfa['kanunlar']]
+        after = sayfa['next_after']
+        if after is None:
+            break
+    assert gezilen == sorted(tumu)
+
+
+def test_cursor_ile_question_opsiyonel_ve_uyusmali(istemci):
+    ilk = istemci.post('/ask', json={'question': 'vergi', 'max_results': 2})
+    cursor = ilk.json()['next_cursor']
+    sadece_cursor = istemci.post('/ask', json={'cursor': cursor})
+    assert sadece_cursor.status_code == 200
+    assert sadece_cursor.json()['question'] == 'vergi'
+    ayni = istemci.post('/ask', json={'question': 'vergi', 'cursor': cursor})
+    assert cevap_anahtarlari(ayni) == cevap_anahtarlari(sadece_cursor)
+
+    farkli = istemci.post('/ask', json={'question': 'ceza', 'cursor': cursor})
+    assert farkli.status_code == 400
+    assert 'uyuşmuyor' in farkli.json()['detail']
+    assert istemci.post('/ask', json={'max_results': 2}).status_code == 400
+
+
+def test_snippet_ve_alan_secimi(istemci):
+    yanit = istemci.post('/ask', json={'question': 'vergi cezası', 'fields': ['baslik'], 'snippet': True})
+    for cevap in yanit.json()['answers']:
+        assert set(cevap) == {'kanun_no', 'madde_no', 'madde_turu', 'baslik', 'snippet'}
+        snippet = cevap['snippet']
+        assert 0 <= snippet['baslangic'] <= snippet['bitis'] <= snippet['madde_uzunlugu']
+        for bas, son in snippet['vurgular']:
+            assert 0 <= bas < son <= len(snippet['text'])
+
+    yanit = istemci.post('/ask', json={'question': 'vergi', 'fields': ['bilinmeyen']})
+    assert yanit.status_code == 400
+
+
+@pytest.mark.parametrize('modul_adi', SUNUCULAR)
+def test_ilk_sayfa_sorulari_isinma_icin_sorgu_kaydina_yazilir(modul_adi):
+    sunucu, istemci = sunucu_yukle(modul_adi)
+    assert sunucu.isinma_sorgu_kaydi == sunucu.profiler.sorgu_log_path
+    soru = f'sorgu kaydı {modul_adi}'
+    ilk = istemci.post('/ask', json={'question': soru, 'max_results': 2})
+    istemci.post('/ask', json={'question': soru, 'cursor': ilk.json()['next_cursor']})
+    sorgular = [s for s in isinma_sorgulari(sunucu.profiler.sorgu_log_path, 1000) if s['question'] == soru]
+    # Sonraki sayfa istekleri aynı önbellek kaydını kullandığından yazılmaz
+    assert len(sorgular) == 1
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Testlerin ortak yardımcıları: sahte encoder ve repodaki kanun dosyalarından indeks kurulumu"""
+
+import asyncio
+import glob
+import importlib
+import os
+import sys
+import tempfile
+import zlib
+
+import httpx
+
+import numpy as np
+
+KOK = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, KOK)
+
+# Sunucuların sorgu kaydı repo köküne değil geçici dizine yazılır
+SORGU_KAYDI = os.environ.setdefault("QUERY_LOG", os.path.join(tempfile.mkdtemp(prefix="kanun_test_"), "queries.log"))
+
+from kanun_index import KanunIndex
+from kanun_processor import KanunProcessor
+
+
+class SahteModel:
+    """Kelimeleri hash'leyen deterministik encoder; hatali=True ise encode hata verir"""
+
+    def __init__(self):
+        self.hatali = False
+
+    def encode(self, texts, **kwargs):
+        if self.hatali:
+            raise RuntimeError("encoder hatası")
+        vektorler = np.zeros((len(texts), 32), dtype=np.float32)
+        for i, metin in enumerate(texts):
+            for kelime in metin.lower().split():
+                vektorler[i, zlib.crc32(kelime.encode('utf-8')) % 32] += 1
+        return vektorler
+
+
+def kanunlari_oku(sayi):
+    processor = KanunProcessor()
+    kanunlar = []
+    for dosya in sorted(glob.glob(os.path.join(KOK, '[0-9]*.txt')))[:sayi]:
+        with open(dosya, 'r', encoding='utf-8') as f:
+            kanunlar.append(processor.parse_kanun_content(f.read(), os.path.basename(dosya)[:-4]))
+    return kanunlar
+
+
+def index_kur(kanunlar, **secenekler):
+    index = KanunIndex(**secenekler)
+    for kanun in kanunlar:
+        index.add_kanun(kanun)
+    index.build(SahteModel())
+    return index
+
+
+class AsgiIstemci:
+    """Uygulamaya httpx.ASGITransport üzerinden senkron istek atan istemci (startup çalıştırılmaz)"""
+
+    def __init__(self, app):
+        self.loop = asyncio.new_event_loop()
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://test')
+
+    def request(self, method, url, **kwargs):
+        return self.loop.run_until_complete(self.client.request(method, url, **kwargs))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+def sunucu_yukle(modul_adi, sayi=10):
+    """Sunucu modülünü import eder ve global indeksini ilk sayi kanunla sahte modelle kurar (bir kez)"""
+    sunucu = importlib.import_module(modul_adi)
+    if sunucu.kanun_index.kanun_sayisi == 0:
+        for kanun in kanunlari_oku(sayi):
+            sunucu.kanun_index.add_kanun(kanun)
+        sunucu.model = SahteModel()
+        sunucu.kanun_index.build(sunucu.model)
+    return sunucu, AsgiIstemci(sunucu.app)
@@ -7,19 +7,39 @@ Bu script kanunları vector database'e yükler ve arama için hazırlar.
 
 import json
 import os
+import re
 from typing import List, Dict, Any
 import numpy as np
 from sentence_transformers import SentenceTransformer
 import pinecone
 from pinecone import Pinecone, ServerlessSpec
+from kanun_index import metin_hash
+
+def chunk_icerik(chunk: Dict[str, Any]) -> str:
+    """Chunk metninden "Kanun: ...\nMadde N:" önekini atarak madde içeriğini döndürür"""
+    if chunk.get('icerik'):
+        return chunk['icerik']
+    return re.sub(r'^Kanun: [^\n]*\n(?:Geçici )?Madde [^:\n]*:\s*', '', chunk['text'], count=1)
+
+def chunk_embedding_metni(chunk: Dict[str, Any]) -> str:
+    """Embedding'i alınan metin: kanun başlığı ve madde içeriği
+
+    Pinecone sorgusunda başlık benzerliği ayrıca karıştırılmadığı için "Kanun: başlık" öneki korunur;
+    yalnızca madde numarası atılır. Böylece aynı kanundaki (veya aynı başlıklı kanunlardaki) tekrar
+    eden maddeler tek vektörü paylaşır.
+    """
+    return f"Kanun: {chunk['baslik']}\n{chunk_icerik(chunk)}"
 
 class KanunVectorDB:
-    def __init__(self, pinecone_api_key: str = None, index_name: str = "kanunlar"):
+    def __init__(self, pinecone_api_key: str = None, index_name: str = "kanunlar",
+                 dedup_map_file: str = "kanun_dedup_map.json"):
         self.index_name = index_name
         self.model_name = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
         self.model = None
         self.pc = None
         self.index = None
+        self.dedup_map_file = dedup_map_file
+        self.dedup_map = None
         
         if pinecone_api_key:
             self.setup_pinecone(pinecone_api_key)
@@ -75,26 +95,57 @@ class KanunVectorDB:
         
         print(f"{len(chunks)} chunk yükleniyor...")
         
+        # Aynı başlık ve içeriğe sahip chunk'ları normalize metin hash'ine göre grupla
+        gruplar: Dict[str, List[Dict[str, Any]]] = {}
+        for chunk in chunks:
+            vektor_id = f"metin_{metin_hash(chunk_embedding_metni(chunk)).hex()}"
+            gruplar.setdefault(vektor_id, []).append(chunk)
+        
+        atlanan = len(chunks) - len(gruplar)
+        print(f"{len(gruplar)} benzersiz metin: {atlanan} embedding atlandı, "
+              f"vektör belleği {atlanan * 384 * 4 / 1e6:.1f} MB azaldı")
+        
+        # Vektör -> tüm (kanun, madde) konumları eşlemesini kaydet
+        self.dedup_map = {
+            vektor_id: [
+                {
+                    'id': chunk['id'],
+                    'kanun_no': chunk['kanun_no'],
+                    'baslik': chunk['baslik'],
+                    'madde_no': chunk['madde_no'],
+                    'yayim_tarihi': chunk['yayim_tarihi']
+                }
+                for chunk in grup
+            ]
+            for vektor_id, grup in gruplar.items()
+        }
+        with open(self.dedup_map_file, 'w', encoding='utf-8') as f:
+            json.dump(self.dedup_map, f, ensure_ascii=False)
+        print(f"Konum eşlemesi {self.dedup_map_file} dosyasına kaydedildi.")
+        
         # Batch'ler halinde yükle (Pinecone limiti: 100)
+        items = list(gruplar.items())
         batch_size = 100
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i + batch_size]
+        for i in range(0, len(items), batch_size):
+            batch = items[i:i + batch_size]
             
-            # Embedding'leri oluştur
-            texts = [chunk['text'] for chunk in batch]
+            # Her benzersiz metin için bir embedding oluştur
+            texts = [chunk_embedding_metni(grup[0]) for _, grup in batch]
             embeddings = self.create_embeddings(texts)
             
-            # Pinecone formatına dönüştür
+            # Pinecone formatına dönüştür (metadata ilk konumdan alınır)
             vectors = []
-            for j, chunk in enumerate(batch):
+            for j, (vektor_id, grup) in enumerate(batch):
+                chunk = grup[0]
                 vectors.append({
-                    'id': chunk['id'],
+                    'id': vektor_id,
                     'values': embeddings[j],
                     'metadata': {
                         'kanun_no': chunk['kanun_no'],
                         'baslik': chunk['baslik'],
                         'madde_no': chunk['madde_no'],
                         'yayim_tarihi': chunk['yayim_tarihi'],
+                        'tekrar_sayisi': len(grup),
                         'text': chunk['text'][:1000]  # Metadata için kısaltılmış
                     }
                 })
@@ -123,10 +174,15 @@ class KanunVectorDB:
             include_metadata=True
         )
         
+        # Tekilleştirilmiş vektörleri konumlarına açmak için eşlemeyi yükle
+        if self.dedup_map is None and os.path.exists(self.dedup_map_file):
+            with open(self.dedup_map_file, 'r', encoding='utf-8') as f:
+                self.dedup_map = json.load(f)
+        
         # Sonuçları formatla
         formatted_results = []
         for match in results['matches']:
-            formatted_results.append({
+            result = {
                 'id': match['id'],
                 'score': match['score'],
                 'kanun_no': match['metadata']['kanun_no'],
@@ -134,7 +190,14 @@ class KanunVectorDB:
                 'madde_no': match['metadata']['madde_no'],
                 'yayim_tarihi': match['metadata']['yayim_tarihi'],
                 'text': match['metadata']['text']
-            })
+            }
+            
+            konumlar = (self.dedup_map or {}).get(match['id'], [])
+            if len(konumlar) > 1:
+                result['tekrar_sayisi'] = len(konumlar)
+                result['diger_konumlar'] = konumlar[1:]
+            
+            formatted_results.append(result)
         
         return formatted_results
 